@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Phase 0: Build Corpus Search Index
+Builds a suffix array over every transcript in the manifest so phrases can be
+looked up across the whole corpus with search-transcripts.py.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/build-corpus-index.py
+
+Exit codes:
+    0 — PASS
+    1 — FAIL (missing manifest or unreadable transcripts)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.corpus_index import INDEX_DIR, build_index  # noqa: E402
+from pipeline.manifest import open_manifest  # noqa: E402
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
+
+
+def main():
+    if not MANIFEST_PATH.exists():
+        print(f"FAIL  Manifest not found: {MANIFEST_PATH.relative_to(ROOT)}")
+        print("      Run prepare.py first.")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    transcripts = list(open_manifest(MANIFEST_PATH).transcripts())
+
+    started = time.perf_counter()
+    try:
+        meta = build_index(transcripts)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"FAIL  Could not build corpus index: {e}")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    corpus_size = (INDEX_DIR / "corpus.bin").stat().st_size
+
+    print("\nPhase 0: Build Corpus Search Index")
+    print(f"{'─' * 50}")
+    print(f"  Manifest     : {MANIFEST_PATH.relative_to(ROOT)}")
+    print(f"  Transcripts  : {len(meta['transcripts'])}")
+    print(f"  Corpus bytes : {corpus_size:,}")
+    print(f"  Suffixes     : {meta['suffix_count']:,}")
+    print(f"  Build time   : {elapsed:.2f}s")
+    print(f"  Index        : {INDEX_DIR.relative_to(ROOT)}")
+    print("\nStatus: PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Phase 0: Build Transcript Store
+Normalises every transcript in the manifest once and writes the normalised
+text, lowercased text and line-offset table to a binary store that later
+phases open with mmap instead of re-parsing the source files.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/build-transcript-store.py
+
+Exit codes:
+    0 — PASS
+    1 — FAIL (missing manifest or unreadable transcripts)
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.manifest import open_manifest  # noqa: E402
+from pipeline.transcripts import STORE_DATA_NAME, STORE_DIR, STORE_INDEX_NAME, build_store  # noqa: E402
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
+
+
+def main():
+    if not MANIFEST_PATH.exists():
+        print(f"FAIL  Manifest not found: {MANIFEST_PATH.relative_to(ROOT)}")
+        print("      Run prepare.py first.")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    transcripts = list(open_manifest(MANIFEST_PATH).transcripts())
+
+    missing = [t["path"] for t in transcripts if not (ROOT / t["path"]).exists()]
+    if missing:
+        print(f"FAIL  {len(missing)} transcript file(s) listed in manifest not found: {missing[:20]}")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    try:
+        entries = build_store(transcripts)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"FAIL  Could not build transcript store: {e}")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    data_size = (STORE_DIR / STORE_DATA_NAME).stat().st_size
+
+    print("\nPhase 0: Build Transcript Store")
+    print(f"{'─' * 50}")
+    print(f"  Manifest     : {MANIFEST_PATH.relative_to(ROOT)}")
+    print(f"  Transcripts  : {len(entries)}")
+    print(f"  Store data   : {(STORE_DIR / STORE_DATA_NAME).relative_to(ROOT)} ({data_size:,} bytes)")
+    print(f"  Store index  : {(STORE_DIR / STORE_INDEX_NAME).relative_to(ROOT)}")
+    print("\nStatus: PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Phase 1: Detect Near-Duplicate Quotes
+Finds overlapping or lightly trimmed copies of the same quote in quotes.csv —
+typically left by extractor retries — which merge-quotes.py's exact dedup
+misses and which inflate tag counts in Phase 4.
+
+Quotes are compared on word 3-gram shingles with MinHash/LSH (see
+pipeline/minhash.py): each quote gets a signature, quotes sharing an LSH band
+become candidates, and candidates at or above the Jaccard threshold are
+reported. This runs in roughly linear time, within and across participants.
+Quotes shorter than --min-words (stock answers such as "3 - Moderate trust")
+are skipped.
+
+--collapse rewrites quotes.csv keeping one quote per group of near-duplicates
+with the same participant, question_ref and tag — the longest, or the first
+if tied — and lists the dropped rows in near-duplicate-collapsed.csv. Pairs
+under different questions or tags (the same answer cited twice) and pairs
+across participants are only reported. Re-running merge-quotes.py restores
+the dropped rows, so collapse again after any re-merge.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/detect-near-duplicate-quotes.py
+    python3 02-workflows/build-dynamic-personas/detect-near-duplicate-quotes.py --threshold 0.8
+    python3 02-workflows/build-dynamic-personas/detect-near-duplicate-quotes.py --collapse
+
+Writes (in p1-quote-extraction/):
+    near-duplicate-quotes.csv   — one row per near-duplicate pair, with its
+                                  scope: within, cross-question or across
+    near-duplicate-collapsed.csv — with --collapse, the dropped rows
+
+Exit codes:
+    0 — PASS (or PASS with warnings when near-duplicates are found)
+    1 — FAIL (quotes.csv missing or unreadable)
+"""
+
+import argparse
+import csv
+import os
+import sys
+from pathlib import Path
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.minhash import candidate_pairs, containment, jaccard, shingles, signature  # noqa: E402
+from pipeline.quote_table import read_quotes, write_quote_table  # noqa: E402
+
+PHASE1_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction"
+QUOTES_PATH = PHASE1_DIR / "quotes.csv"
+REPORT_PATH = PHASE1_DIR / "near-duplicate-quotes.csv"
+COLLAPSED_PATH = PHASE1_DIR / "near-duplicate-collapsed.csv"
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_MIN_WORDS = 6
+MAX_PAIRS_SHOWN = 20
+
+QUOTE_FIELDS = ["participant_id", "question_ref", "tag", "quote"]
+REPORT_COLUMNS = (
+    ["scope", "jaccard", "containment"]
+    + [f"{f}_a" for f in ["row"] + QUOTE_FIELDS]
+    + [f"{f}_b" for f in ["row"] + QUOTE_FIELDS]
+)
+
+
+def find_pairs(rows: list[dict], threshold: float, min_words: int) -> list[tuple[float, float, int, int]]:
+    """Return (jaccard, containment, i, j) for near-duplicate row pairs, most similar first."""
+    shingle_sets = [
+        shingles(row["quote"]) if len(row["quote"].split()) >= min_words else frozenset() for row in rows
+    ]
+    signatures = [signature(s) for s in shingle_sets]
+    pairs = []
+    for i, j in candidate_pairs(signatures):
+        similarity = jaccard(shingle_sets[i], shingle_sets[j])
+        if similarity >= threshold:
+            pairs.append((similarity, containment(shingle_sets[i], shingle_sets[j]), i, j))
+    pairs.sort(key=lambda p: (-p[0], p[2], p[3]))
+    return pairs
+
+
+def pair_scope(a: dict, b: dict) -> str:
+    """
+    "within" for the same participant, question_ref and tag (collapsible),
+    "cross-question" for the same participant under a different question_ref
+    or tag, "across" for different participants.
+    """
+    if a["participant_id"] != b["participant_id"]:
+        return "across"
+    if a["question_ref"] != b["question_ref"] or a["tag"] != b["tag"]:
+        return "cross-question"
+    return "within"
+
+
+def collapse_groups(rows: list[dict], pairs: list[tuple[float, float, int, int]]) -> dict[int, int]:
+    """
+    Group "within" pairs (union-find) and return {dropped row index: kept row
+    index}, keeping the longest quote in each group.
+    """
+    parent = list(range(len(rows)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for _, _, i, j in pairs:
+        if pair_scope(rows[i], rows[j]) == "within":
+            parent[find(i)] = find(j)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(rows)):
+        groups.setdefault(find(i), []).append(i)
+
+    dropped = {}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        keep = min(members, key=lambda i: (-len(rows[i]["quote"].split()), i))
+        for i in members:
+            if i != keep:
+                dropped[i] = keep
+    return dropped
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum shingle Jaccard similarity to report (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--min-words",
+        type=int,
+        default=DEFAULT_MIN_WORDS,
+        help=f"Skip quotes shorter than this many words (default: {DEFAULT_MIN_WORDS})",
+    )
+    parser.add_argument(
+        "--collapse",
+        action="store_true",
+        help="Rewrite quotes.csv keeping one quote per near-duplicate group with the same participant, question_ref and tag",
+    )
+    args = parser.parse_args()
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+
+    warnings = []
+
+    # ── Load quotes ─────────────────────────────────────────────────────────────
+
+    if not QUOTES_PATH.exists():
+        print(f"FAIL  Quotes file not found: {QUOTES_PATH.relative_to(ROOT)} — run merge-quotes.py first")
+        sys.exit(1)
+    try:
+        fieldnames, quote_rows = read_quotes(QUOTES_PATH)
+        rows = list(quote_rows)
+    except (OSError, csv.Error) as e:
+        print(f"FAIL  Could not read {QUOTES_PATH.relative_to(ROOT)}: {e}")
+        sys.exit(1)
+    missing = [c for c in QUOTE_FIELDS if c not in fieldnames]
+    if missing:
+        print(f"FAIL  {QUOTES_PATH.name} is missing columns: {missing}")
+        sys.exit(1)
+
+    # ── Detect ──────────────────────────────────────────────────────────────────
+
+    pairs = find_pairs(rows, args.threshold, args.min_words)
+    scopes = [pair_scope(rows[i], rows[j]) for _, _, i, j in pairs]
+    within = [p for p, scope in zip(pairs, scopes) if scope == "within"]
+    cross_question = scopes.count("cross-question")
+    across = scopes.count("across")
+
+    with open(REPORT_PATH, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+        for (similarity, contained, i, j), scope in zip(pairs, scopes):
+            writer.writerow(
+                [scope, f"{similarity:.3f}", f"{contained:.3f}"]
+                + [i + 1] + [rows[i][c] for c in QUOTE_FIELDS]
+                + [j + 1] + [rows[j][c] for c in QUOTE_FIELDS]
+            )
+
+    # ── Collapse ────────────────────────────────────────────────────────────────
+
+    dropped: dict[int, int] = {}
+    if args.collapse:
+        dropped = collapse_groups(rows, within)
+    if dropped:
+        # Only rewrite when something was dropped: a rewrite changes quotes.csv's
+        # mtime, which would invalidate the merge-quotes.py --incremental ledger.
+        kept = [row for i, row in enumerate(rows) if i not in dropped]
+        tmp_path = QUOTES_PATH.with_name(QUOTES_PATH.name + ".tmp")
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(kept)
+        os.replace(tmp_path, QUOTES_PATH)
+        write_quote_table(QUOTES_PATH, fieldnames, kept)
+        with open(COLLAPSED_PATH, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["row", "kept_row"] + fieldnames)
+            writer.writeheader()
+            for i in sorted(dropped):
+                writer.writerow({"row": i + 1, "kept_row": dropped[i] + 1, **rows[i]})
+
+    if within and not args.collapse:
+        warnings.append(f"{len(within)} near-duplicate pair(s) within participants — review, or re-run with --collapse")
+    if cross_question:
+        warnings.append(f"{cross_question} near-duplicate pair(s) within participants under different questions or tags — not collapsed; check question_ref and tag attribution")
+    if across:
+        warnings.append(f"{across} near-duplicate pair(s) across participants — check for duplicated transcripts or misattributed quotes")
+
+    # ── Report ──────────────────────────────────────────────────────────────────
+
+    print(f"\nPhase 1: Detect Near-Duplicate Quotes")
+    print(f"{'─' * 50}")
+    print(f"  Quotes          : {len(rows)}")
+    print(f"  Threshold       : Jaccard ≥ {args.threshold} on {args.min_words}+ word quotes")
+    print(f"  Pairs           : {len(pairs)} ({len(within)} within, {cross_question} cross-question, {across} across participants)")
+    for similarity, contained, i, j in pairs[:MAX_PAIRS_SHOWN]:
+        a, b = rows[i], rows[j]
+        print(
+            f"    {similarity:.2f}  row {i + 1} [{a['participant_id']} {a['question_ref']}] "
+            f"~ row {j + 1} [{b['participant_id']} {b['question_ref']}]  {a['quote'][:50]!r}"
+        )
+    if len(pairs) > MAX_PAIRS_SHOWN:
+        print(f"    ... {len(pairs) - MAX_PAIRS_SHOWN} more in the report")
+    print(f"  Report          : {REPORT_PATH.relative_to(ROOT)}")
+    if dropped:
+        print(f"  Collapsed       : {len(dropped)} row(s) dropped; quotes.csv now has {len(rows) - len(dropped)} rows")
+        print(f"  Dropped rows    : {COLLAPSED_PATH.relative_to(ROOT)}")
+    elif args.collapse:
+        print("  Collapsed       : nothing to drop; quotes.csv left unchanged")
+
+    if warnings:
+        print(f"\nWARNINGS ({len(warnings)}):")
+        for w in warnings:
+            print(f"  WARN  {w}")
+
+    print(f"\nStatus: {'PASS' if not warnings else 'PASS (with warnings)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Phase 4: Edit Tag Mapping
+Interactive editor for tag-mapping.json with instant constraint feedback.
+Loads quotes.csv and the mapping once, then applies renames, merges and
+splits of consolidated tags and after each edit prints which of the
+run-tag-consolidation.py limits pass or fail. Counters are updated per moved
+tag (see pipeline/tag_constraints.py), so nothing is recomputed from the
+quote rows between edits.
+
+Commands (tag names may contain spaces; separate them with " + " and " => "):
+    status                                   show every constraint
+    top [N]                                  largest consolidated tags (default 10)
+    show <consolidated tag>                  its original tags and quote counts
+    find <text>                              consolidated and original tags containing text
+    rename <old> => <new>                    rename a consolidated tag
+    merge <a> + <b> [+ ...] => <new>         merge consolidated tags into <new>
+    move <original> [+ ...] => <consolidated>
+                                             move original tags (split a tag off into a new one)
+    undo                                     revert the last edit
+    save [path]                              write the mapping (default: --output)
+    quit
+
+Commands are read from stdin, so an edit script can be piped in.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/edit-tag-mapping.py
+    python3 02-workflows/build-dynamic-personas/edit-tag-mapping.py --mapping 04-process/build-dynamic-personas/p4-consolidate-tags/tag-mapping-proposal.json
+
+Exit codes:
+    0 — editor closed
+    1 — FAIL (quotes or mapping missing/unreadable, or mapping does not cover every tag)
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.quote_table import count_quote_values  # noqa: E402
+from pipeline.tag_constraints import MappingState  # noqa: E402
+
+QUOTES_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quotes.csv"
+PHASE4_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p4-consolidate-tags"
+MAPPING_PATH = PHASE4_DIR / "tag-mapping.json"
+PROPOSAL_PATH = PHASE4_DIR / "tag-mapping-proposal.json"
+
+ARROW = " => "
+PLUS = " + "
+DEFAULT_TOP = 10
+
+
+def shown(path: Path) -> Path:
+    try:
+        return path.relative_to(ROOT)
+    except ValueError:
+        return path
+
+
+def load_mapping(path: Path) -> dict[str, str]:
+    """Read a {"mappings": [...]} or shorthand {original: consolidated} file."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(payload, dict) and isinstance(payload.get("mappings"), list):
+        return {
+            str(e["original_tag"]).strip(): str(e["consolidated_tag"]).strip()
+            for e in payload["mappings"]
+            if isinstance(e, dict) and "original_tag" in e and "consolidated_tag" in e
+        }
+    if isinstance(payload, dict):
+        return {str(k).strip(): str(v).strip() for k, v in payload.items() if isinstance(v, str)}
+    raise ValueError("mapping JSON must be an object with a 'mappings' list")
+
+
+def save_mapping(state: MappingState, path: Path) -> None:
+    payload = {
+        "mappings": [
+            {"original_tag": original, "consolidated_tag": state.mapping[original]}
+            for original in sorted(state.mapping)
+        ]
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def print_checks(state: MappingState, before: dict[str, bool] | None = None) -> None:
+    """Print every constraint; with `before`, mark the ones whose result changed."""
+    for name, passed, detail in state.checks():
+        changed = before is not None and before.get(name) != passed
+        print(f"  {'PASS' if passed else 'FAIL'}  {name}: {detail}{'  (changed)' if changed else ''}")
+
+
+def split_args(text: str) -> tuple[list[str], str]:
+    """'a + b => c' → (['a', 'b'], 'c')."""
+    if ARROW not in text:
+        raise ValueError(f"expected '<tags>{ARROW}<tag>'")
+    left, right = text.split(ARROW, 1)
+    sources = [s.strip() for s in left.split(PLUS) if s.strip()]
+    target = right.strip()
+    if not sources or not target:
+        raise ValueError(f"expected '<tags>{ARROW}<tag>'")
+    return sources, target
+
+
+def run_editor(state: MappingState, output_path: Path) -> None:
+    history: list[list[tuple[str, str]]] = []
+    dirty = False
+    interactive = sys.stdin.isatty()
+
+    print_checks(state)
+    while True:
+        try:
+            line = input("tags> " if interactive else "")
+        except EOFError:
+            break
+        command, _, rest = line.strip().partition(" ")
+        rest = rest.strip()
+        if not command or command.startswith("#"):
+            continue
+        if not interactive:
+            print(f"> {line.strip()}")
+        before = {name: passed for name, passed, _ in state.checks()}
+        try:
+            if command in ("quit", "exit"):
+                break
+            elif command == "help":
+                print(__doc__.split("Commands", 1)[1].split("Usage:", 1)[0].rstrip())
+            elif command == "status":
+                print_checks(state)
+            elif command == "top":
+                n = int(rest) if rest else DEFAULT_TOP
+                for name, rows in sorted(state.rows.items(), key=lambda kv: (-kv[1], kv[0]))[:n]:
+                    print(f"  {rows:>6}  {name}  ({len(state.members[name])} tags)")
+            elif command == "show":
+                if rest not in state.members:
+                    raise KeyError(f"Unknown consolidated tag: {rest}")
+                for original in sorted(state.members[rest], key=lambda t: (-state.tag_counts[t], t)):
+                    print(f"  {state.tag_counts[original]:>6}  {original}")
+            elif command == "find":
+                needle = rest.lower()
+                for name in sorted(n for n in state.members if needle in n.lower()):
+                    print(f"  consolidated  {name}")
+                for original in sorted(t for t in state.mapping if needle in t.lower()):
+                    print(f"  original      {original} → {state.mapping[original]}")
+            elif command in ("rename", "merge", "move"):
+                sources, target = split_args(rest)
+                if command == "rename" and len(sources) != 1:
+                    raise ValueError("rename takes one tag; use merge for several")
+                repeated = sorted({s for s in sources if sources.count(s) > 1})
+                if repeated:
+                    raise ValueError(f"Tag(s) given more than once: {', '.join(repeated)}")
+                known = state.mapping if command == "move" else state.members
+                unknown = [s for s in sources if s not in known]
+                if unknown:
+                    kind = "original" if command == "move" else "consolidated"
+                    raise KeyError(f"Unknown {kind} tag(s): {', '.join(unknown)}")
+                moves: list[tuple[str, str]] = []
+                try:
+                    for source in sources:
+                        if command == "move":
+                            moves.append((source, state.move(source, target)))
+                        else:
+                            moves.extend(state.rename(source, target))
+                finally:
+                    # Keep whatever was applied undoable, even if an edit failed partway.
+                    if moves:
+                        history.append(moves)
+                        dirty = True
+                print(f"  {len(moves)} original tag(s) now under '{target}' ({state.rows[target]} rows)")
+                print_checks(state, before)
+            elif command == "undo":
+                if not history:
+                    print("  Nothing to undo")
+                    continue
+                for original, previous in reversed(history.pop()):
+                    state.move(original, previous)
+                dirty = True
+                print_checks(state, before)
+            elif command == "save":
+                path = Path(rest) if rest else output_path
+                save_mapping(state, path)
+                dirty = False
+                failures = state.failures()
+                print(f"  Saved {len(state.mapping)} mappings to {shown(path)}")
+                print(f"  Constraints: {'all pass' if not failures else f'{len(failures)} failing'}")
+            else:
+                print(f"  Unknown command '{command}' — type help")
+        except (KeyError, ValueError) as e:
+            message = e.args[0] if e.args else e
+            print(f"  ERROR  {message}")
+
+    if dirty:
+        print(f"  WARN  Unsaved edits discarded (use save to write {shown(output_path)})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mapping", type=Path, help="Mapping to start from (default: tag-mapping.json, else the proposal)")
+    parser.add_argument("--output", type=Path, help="Where save writes (default: tag-mapping.json)")
+    args = parser.parse_args()
+
+    mapping_path = args.mapping or (MAPPING_PATH if MAPPING_PATH.exists() else PROPOSAL_PATH)
+    output_path = args.output or MAPPING_PATH
+
+    # ── Load inputs ─────────────────────────────────────────────────────────────
+
+    if not QUOTES_PATH.exists():
+        print(f"FAIL  quotes.csv not found: {QUOTES_PATH.relative_to(ROOT)}")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+    if not mapping_path.exists():
+        print(f"FAIL  Mapping not found: {shown(mapping_path)} — run propose-tag-mapping.py or tag-consolidator first")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    tag_counts = count_quote_values(QUOTES_PATH, "tag")
+    try:
+        state = MappingState(tag_counts, load_mapping(mapping_path))
+    except (OSError, ValueError, KeyError) as e:
+        message = e.args[0] if isinstance(e, KeyError) and e.args else e
+        print(f"FAIL  Could not load {shown(mapping_path)}: {message}")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    print("\nPhase 4: Edit Tag Mapping")
+    print(f"{'─' * 50}")
+    print(f"  Mapping               : {shown(mapping_path)}")
+    print(f"  Save to               : {shown(output_path)}")
+    print(f"  Quote rows            : {state.total_rows}")
+    print(f"  Original tags         : {len(state.mapping)}")
+    print(f"  Consolidated tags     : {len(state.rows)}")
+    print("  Type help for commands.\n")
+
+    run_editor(state, output_path)
+
+
+if __name__ == "__main__":
+    main()
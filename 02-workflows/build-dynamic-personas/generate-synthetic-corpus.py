@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Benchmarks: Generate Synthetic Corpus
+Writes synthetic interview transcripts and matching quote-part CSVs into a
+project tree laid out like this repository, for benchmarking Phases 0–2 at
+scales beyond the real corpus.
+
+Transcripts use the real format (*Qn* headers, MODERATOR: / PARTICIPANT:
+turns) and the file names prepare.py accepts. Participants 1–9999 are named
+en_participant_NNNN.txt; beyond that the 4-digit sequence overflows into
+en_translated_from_xx_participant_NNNN.txt names, one source language per
+further 9999 participants.
+
+Each participant gets a quote-parts/<participant_id>.csv with a controllable
+mix of verbatim quotes, ellipsis quotes (segments from one answer joined with
+' ... ') and paraphrased quotes (a few words swapped — these FAIL validation).
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/generate-synthetic-corpus.py --out /tmp/bench --participants 530
+    python3 02-workflows/build-dynamic-personas/generate-synthetic-corpus.py --out /tmp/bench --participants 5300 \\
+        --ellipsis-share 0.1 --paraphrase-share 0.05 --seed 7
+
+Writes (under --out):
+    03-inputs/interview-transcripts/*.txt
+    04-process/build-dynamic-personas/p1-quote-extraction/quote-parts/*.csv
+
+Exit codes:
+    0 — PASS
+    1 — FAIL (invalid arguments or output directory not empty)
+"""
+
+import argparse
+import csv
+import random
+import sys
+from pathlib import Path
+
+# ── Layout ──────────────────────────────────────────────────────────────────────
+
+TRANSCRIPTS_SUBDIR = Path("03-inputs") / "interview-transcripts"
+PARTS_SUBDIR = Path("04-process") / "build-dynamic-personas" / "p1-quote-extraction" / "quote-parts"
+
+# Same columns as merge-quotes.py EXPECTED_COLUMNS.
+PART_COLUMNS = [
+    "participant_id",
+    "transcript_id",
+    "question_ref",
+    "tag",
+    "severity",
+    "sentiment",
+    "quote",
+    "source_line_start",
+    "source_line_end",
+]
+
+MAX_SEQUENCE = 9999
+# Source languages used once en_participant_NNNN names run out.
+OVERFLOW_LANGUAGES = ["de", "es", "fr", "pl", "it", "nl", "pt", "sv", "da", "fi", "cs", "hu"]
+
+# ── Vocabulary ──────────────────────────────────────────────────────────────────
+
+WORDS = (
+    "i we you they it AI tool tools assistant ChatGPT Copilot Gemini Claude email emails "
+    "calendar recipe recipes budget travel holiday research product products data privacy "
+    "trust answer answers question questions task tasks work home family kids school "
+    "summary summaries draft drafts idea ideas plan plans list lists search results source "
+    "sources time week day morning evening mostly usually sometimes often rarely really "
+    "quite very just also still maybe probably actually basically definitely honestly "
+    "use used using ask asked asking check checked write wrote help helped helps find found "
+    "think thought feel felt want wanted need needed try tried trust trusted save saved "
+    "compare compared verify verified rely relied share shared worry worried like liked "
+    "the a an and but or so because if when then than that this those these my our your "
+    "for with about into from on in at of to by as more less much many few some any every "
+    "good bad better worse useful helpful accurate wrong right quick slow easy hard clear "
+    "personal private specific general simple complex new old whole first last next"
+).split()
+CONTRACTIONS = ["I’m", "don’t", "it’s", "that’s", "I’ve", "can’t", "didn’t", "wouldn’t"]
+FILLERS = ["Yeah,", "So,", "Well,", "Honestly,", "I mean,", "Um,", "Right,"]
+SUBSTITUTES = ["perhaps", "generally", "certainly", "frequently", "barely", "tool", "thing"]
+
+QUESTIONS = [
+    "Which AI tools have you used for personal tasks in the past 3 months?",
+    "How often do you use AI tools for personal use?",
+    "What are the most common types of personal tasks you use AI for? Walk me through some examples.",
+    "Tell me about a time you wanted to use AI for something but couldn't.",
+    "How much do you trust the results or suggestions you get from AI tools?",
+    "What would make you trust AI tools more?",
+    "How do you check whether an AI answer is correct?",
+    "What worries you most about using AI in your personal life?",
+    "If you could change one thing about the AI tools you use, what would it be?",
+    "Is there anything else you'd like to share about your experience with AI?",
+]
+FOLLOW_UPS = [
+    "Could you tell me more about that?",
+    "Can you give me a specific example?",
+    "Why do you think that is?",
+    "How did that make you feel?",
+]
+TAGS = [
+    "Email Summarization Use",
+    "Privacy Concern",
+    "Moderate Trust Level",
+    "Verification Habit",
+    "Travel Planning Use",
+    "Budgeting Use",
+    "Accuracy Frustration",
+    "Time Saving Benefit",
+    "Product Research Use",
+    "Human Verification Preference",
+]
+SEVERITIES = ["High", "Medium", "Low"]
+SENTIMENTS = ["positive", "negative", "neutral", "mixed"]
+
+
+# ── Naming ──────────────────────────────────────────────────────────────────────
+
+def participant_name(n: int) -> tuple[str, str]:
+    """Return (participant_id, transcript_id) for the n-th (1-based) synthetic participant."""
+    if n <= MAX_SEQUENCE:
+        return str(n), f"en_participant_{n:04d}"
+    block, offset = divmod(n - MAX_SEQUENCE - 1, MAX_SEQUENCE)
+    if block >= len(OVERFLOW_LANGUAGES):
+        raise ValueError(f"At most {MAX_SEQUENCE * (len(OVERFLOW_LANGUAGES) + 1)} participants supported")
+    lang = OVERFLOW_LANGUAGES[block]
+    seq = offset + 1
+    return f"{lang.upper()}{seq}", f"en_translated_from_{lang}_participant_{seq:04d}"
+
+
+# ── Text generation ─────────────────────────────────────────────────────────────
+
+def make_sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(6, 18))
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), rng.choice(CONTRACTIONS))
+    if rng.random() < 0.2:
+        words.insert(0, rng.choice(FILLERS))
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + rng.choice(".....?!")
+
+
+def make_answer(rng: random.Random) -> list[str]:
+    return [make_sentence(rng) for _ in range(rng.randint(1, 6))]
+
+
+def write_transcript(path: Path, rng: random.Random, questions: int) -> list[tuple[str, int, list[str]]]:
+    """
+    Write one transcript; return its participant answers as
+    (question_ref, line_number, sentences) for quote generation.
+    """
+    lines: list[str] = []
+    answers: list[tuple[str, int, list[str]]] = []
+    for q in range(1, questions + 1):
+        ref = f"Q{q}"
+        if lines:
+            lines.append("")
+        lines.append(f"*{ref}*")
+        lines.append(f"MODERATOR: {QUESTIONS[(q - 1) % len(QUESTIONS)]}")
+        for turn in range(rng.randint(1, 3)):
+            if turn:
+                lines.append("")
+                lines.append(f"MODERATOR: {rng.choice(FOLLOW_UPS)}")
+            lines.append("")
+            sentences = make_answer(rng)
+            lines.append(f"PARTICIPANT: {' '.join(sentences)}")
+            answers.append((ref, len(lines), sentences))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return answers
+
+
+def straighten(text: str) -> str:
+    # Extractors often type straight apostrophes; validation normalises both.
+    return text.replace("’", "'")
+
+
+def paraphrase(rng: random.Random, text: str) -> str:
+    words = text.split()
+    for _ in range(max(1, len(words) // 8)):
+        words[rng.randrange(len(words))] = rng.choice(SUBSTITUTES)
+    return " ".join(words)
+
+
+def make_quote(rng: random.Random, sentences: list[str], kind: str) -> str:
+    if kind == "ellipsis" and len(sentences) >= 3:
+        first = rng.randrange(len(sentences) - 2)
+        second = rng.randrange(first + 2, len(sentences))
+        return f"{sentences[first]} ... {sentences[second]}"
+    start = rng.randrange(len(sentences))
+    end = min(len(sentences), start + rng.randint(1, 2))
+    quote = " ".join(sentences[start:end])
+    if kind == "paraphrase":
+        quote = paraphrase(rng, quote)
+    return quote
+
+
+def write_parts(
+    path: Path,
+    rng: random.Random,
+    participant_id: str,
+    transcript_id: str,
+    answers: list[tuple[str, int, list[str]]],
+    quotes: int,
+    shares: tuple[float, float],
+) -> dict[str, int]:
+    ellipsis_share, paraphrase_share = shares
+    counts = {"verbatim": 0, "ellipsis": 0, "paraphrase": 0}
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=PART_COLUMNS)
+        writer.writeheader()
+        for question_ref, line, sentences in sorted(rng.sample(answers, min(quotes, len(answers))), key=lambda a: a[1]):
+            roll = rng.random()
+            if roll < paraphrase_share:
+                kind = "paraphrase"
+            elif roll < paraphrase_share + ellipsis_share and len(sentences) >= 3:
+                kind = "ellipsis"
+            else:
+                kind = "verbatim"
+            counts[kind] += 1
+            quote = make_quote(rng, sentences, kind)
+            writer.writerow(
+                {
+                    "participant_id": participant_id,
+                    "transcript_id": transcript_id,
+                    "question_ref": question_ref,
+                    "tag": rng.choice(TAGS),
+                    "severity": rng.choice(SEVERITIES),
+                    "sentiment": rng.choice(SENTIMENTS),
+                    "quote": straighten(quote) if rng.random() < 0.5 else quote,
+                    "source_line_start": line,
+                    "source_line_end": line,
+                }
+            )
+    return counts
+
+
+# ── Main ────────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", type=Path, required=True, help="Project root to write the synthetic tree into")
+    parser.add_argument("--participants", type=int, default=53, help="Number of transcripts (default: 53, the real corpus)")
+    parser.add_argument("--questions", type=int, default=10, help="Questions per transcript (default: 10)")
+    parser.add_argument("--quotes-per-participant", type=int, default=17, help="Quotes per participant (default: 17)")
+    parser.add_argument("--ellipsis-share", type=float, default=0.05, help="Share of ellipsis quotes (default: 0.05)")
+    parser.add_argument("--paraphrase-share", type=float, default=0.0, help="Share of paraphrased quotes (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    limit = MAX_SEQUENCE * (len(OVERFLOW_LANGUAGES) + 1)
+    if not 1 <= args.participants <= limit:
+        parser.error(f"--participants must be between 1 and {limit}")
+    if args.questions < 1 or args.quotes_per_participant < 0:
+        parser.error("--questions must be positive and --quotes-per-participant non-negative")
+    if not (0 <= args.ellipsis_share and 0 <= args.paraphrase_share and args.ellipsis_share + args.paraphrase_share <= 1):
+        parser.error("--ellipsis-share and --paraphrase-share must be non-negative and sum to at most 1")
+
+    transcripts_dir = args.out / TRANSCRIPTS_SUBDIR
+    parts_dir = args.out / PARTS_SUBDIR
+    for d in (transcripts_dir, parts_dir):
+        if d.exists() and any(d.iterdir()):
+            print(f"FAIL  Output directory not empty: {d}")
+            print("\nStatus: FAIL")
+            sys.exit(1)
+        d.mkdir(parents=True, exist_ok=True)
+
+    rng = random.Random(args.seed)
+    totals = {"verbatim": 0, "ellipsis": 0, "paraphrase": 0}
+    transcript_bytes = 0
+    for n in range(1, args.participants + 1):
+        participant_id, transcript_id = participant_name(n)
+        transcript_path = transcripts_dir / f"{transcript_id}.txt"
+        answers = write_transcript(transcript_path, rng, args.questions)
+        transcript_bytes += transcript_path.stat().st_size
+        counts = write_parts(
+            parts_dir / f"{participant_id}.csv",
+            rng,
+            participant_id,
+            transcript_id,
+            answers,
+            args.quotes_per_participant,
+            (args.ellipsis_share, args.paraphrase_share),
+        )
+        for kind, count in counts.items():
+            totals[kind] += count
+
+    print(f"\nBenchmarks: Generate Synthetic Corpus")
+    print(f"{'─' * 50}")
+    print(f"  Output      : {args.out}")
+    print(f"  Transcripts : {args.participants} ({transcript_bytes / 1e6:.1f} MB)")
+    print(f"  Quotes      : {sum(totals.values())}")
+    print(f"    verbatim  : {totals['verbatim']}")
+    print(f"    ellipsis  : {totals['ellipsis']}")
+    print(f"    paraphrase: {totals['paraphrase']} (expected to FAIL validation)")
+    print(f"\nStatus: PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,59 +3,48 @@
 Phase 3: Merge Contradictions
 Merges per-participant contradiction CSVs from contradiction-parts/ into a single contradictions.csv.
 
+--verify also applies every verify-contradictions-completion.py row check
+(required fields, allowed types and severities, the Rationalisation quote_b
+rule) while each part is read, so Phase 3 reads the manifest and every part
+once instead of twice. contradictions.csv is only written when every part
+passes.
+
 Usage:
     python3 02-workflows/build-dynamic-personas/merge-contradictions.py
+    python3 02-workflows/build-dynamic-personas/merge-contradictions.py --verify
 
 Exit codes:
     0 — PASS (or PASS with warnings)
-    1 — FAIL (missing inputs or schema errors)
+    1 — FAIL (missing inputs, schema errors, or with --verify invalid row values)
 """
 
+import argparse
 import csv
-import json
+import os
 import sys
 from pathlib import Path
 
 # ── Paths ───────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.contradictions import CONTRADICTION_COLUMNS, read_part  # noqa: E402
+from pipeline.manifest import open_manifest  # noqa: E402
+
 PARTS_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p3-check-contradictions" / "contradiction-parts"
 OUTPUT_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p3-check-contradictions" / "contradictions.csv"
 MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
 
-EXPECTED_COLUMNS = [
-    "participant_id",
-    "transcript_id",
-    "contradiction_type",
-    "severity",
-    "quote_a_tag",
-    "quote_a",
-    "quote_b_tag",
-    "quote_b",
-    "explanation",
-]
-
-
-def load_part(path: Path) -> tuple[list[dict], list[str]]:
-    """Load and validate a single part CSV. Returns (rows, errors)."""
-    errors = []
-    rows = []
-    try:
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            if list(reader.fieldnames or []) != EXPECTED_COLUMNS:
-                errors.append(
-                    f"{path.name}: unexpected columns {reader.fieldnames} "
-                    f"(expected {EXPECTED_COLUMNS})"
-                )
-                return rows, errors
-            rows = list(reader)
-    except Exception as e:
-        errors.append(f"{path.name}: could not read — {e}")
-    return rows, errors
-
-
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Also check every row against the contradiction contract (replaces verify-contradictions-completion.py)",
+    )
+    args = parser.parse_args()
+
     warnings = []
     errors = []
 
@@ -65,10 +54,9 @@ def main():
         print(f"FAIL  Manifest not found: {MANIFEST_PATH.relative_to(ROOT)}")
         sys.exit(1)
 
-    with open(MANIFEST_PATH, encoding="utf-8") as f:
-        manifest = json.load(f)
+    manifest = open_manifest(MANIFEST_PATH)
 
-    expected_participants = {t["participant_id"] for t in manifest["transcripts"]}
+    expected_participants = set(manifest.participant_ids())
 
     # ── Check parts directory ───────────────────────────────────────────────────
 
@@ -100,7 +88,7 @@ def main():
     all_rows = []
     empty_parts = []
     for part in part_files:
-        rows, errs = load_part(part)
+        rows, errs = read_part(part, args.verify, part.stem)
         if errs:
             errors.extend(errs)
         else:
@@ -137,10 +125,12 @@ def main():
     # ── Write output ────────────────────────────────────────────────────────────
 
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=EXPECTED_COLUMNS)
+    tmp_path = OUTPUT_PATH.with_name(OUTPUT_PATH.name + ".tmp")
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CONTRADICTION_COLUMNS)
         writer.writeheader()
         writer.writerows(all_rows)
+    os.replace(tmp_path, OUTPUT_PATH)
 
     # ── Report ──────────────────────────────────────────────────────────────────
 
@@ -151,6 +141,7 @@ def main():
     print(f"  Manifest participants : {len(expected_participants)}")
     print(f"  Parts dir             : {PARTS_DIR.relative_to(ROOT)}")
     print(f"  Part files            : {len(part_files)}")
+    print(f"  Row checks            : {'all rows passed' if args.verify else 'skipped (run with --verify)'}")
     print(f"  Total contradictions  : {len(all_rows)}")
     print(f"  Participants with any : {participants_with}")
     print(f"  Output                : {OUTPUT_PATH.relative_to(ROOT)}")
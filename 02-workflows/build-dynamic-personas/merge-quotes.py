@@ -5,21 +5,68 @@ Merges per-participant quote CSVs from quote-parts/ into a single quotes.csv.
 
 Usage:
     python3 02-workflows/build-dynamic-personas/merge-quotes.py
+    python3 02-workflows/build-dynamic-personas/merge-quotes.py --streaming
+    python3 02-workflows/build-dynamic-personas/merge-quotes.py --incremental
+
+--streaming never holds more than one part (or one participant's rows) in
+memory. Each part is validated and sorted on its own — parts already in
+output order are re-read as they are, others are spilled sorted to a temp
+file — and the sorted parts are combined with a heap-based k-way merge
+(heapq.merge), in passes of at most MAX_OPEN_RUNS files. Duplicates are
+dropped as each participant's rows come off the merge, using 16-byte hashes
+of dedup_key(). The output is identical to the default in-memory merge.
+
+Every merge also writes quotes-ledger.json next to quotes.csv: a fingerprint
+(content hash, size, mtime, participant_ids) per part file, and the byte
+range, row count and dropped-duplicate count of each participant's block in
+quotes.csv. --incremental uses it to re-merge only the participants whose
+parts were added, removed or changed, copying every other block of the
+existing quotes.csv unchanged. Parts whose size and mtime match the ledger
+are not read at all. If the ledger is missing or quotes.csv was changed
+since it was written, a full merge runs instead.
+
+Every merge also writes quotes.sqlite, the typed sidecar later phases read
+when they need only some of quotes.csv's columns (see
+pipeline/quote_table.py). Full merges fill it from the merged rows as
+quotes.csv is written; incremental merges splice the re-merged
+participants' rows into it, and leave quotes.csv and the sidecar untouched
+when no part changed.
 
 Exit codes:
     0 — PASS (or PASS with warnings)
     1 — FAIL (missing inputs or schema errors)
 """
 
+import argparse
 import csv
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import os
 import sys
+import tempfile
 from pathlib import Path
+from collections import Counter
+from typing import Iterable, Iterator
 
 # ── Paths ───────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.quote_table import (  # noqa: E402
+    QuoteTableWriter,
+    open_quote_table,
+    splice_quote_table,
+    write_quote_table,
+)
+from pipeline.transcripts import content_hash  # noqa: E402
+
 PARTS_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quote-parts"
 OUTPUT_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quotes.csv"
+LEDGER_PATH = OUTPUT_PATH.parent / "quotes-ledger.json"
 
 EXPECTED_COLUMNS = [
     "participant_id",
@@ -33,6 +80,16 @@ EXPECTED_COLUMNS = [
     "source_line_end",
 ]
 
+# Most sorted runs merged at once; more parts are merged in several passes so
+# the number of open files stays bounded.
+MAX_OPEN_RUNS = 256
+# Spilled runs carry each row's original position so ties and duplicates
+# resolve exactly as in the in-memory merge.
+RUN_COLUMNS = ["part_index", "row_index"] + EXPECTED_COLUMNS
+
+# Bump when the ledger layout or the merged output format changes.
+LEDGER_VERSION = 1
+
 
 def load_part(path: Path) -> tuple[list[dict], list[str]]:
     """Load and validate a single part CSV. Returns (rows, errors)."""
@@ -57,76 +114,452 @@ def dedup_key(row: dict) -> tuple:
     return (row["participant_id"], row["question_ref"], row["quote"])
 
 
-def main():
-    warnings = []
-    errors = []
+def dedup_hash(row: dict) -> bytes:
+    return hashlib.blake2b("\0".join(v or "" for v in dedup_key(row)).encode("utf-8"), digest_size=16).digest()
 
-    # ── Check parts directory ───────────────────────────────────────────────────
 
-    if not PARTS_DIR.exists():
-        print(f"FAIL  Parts directory not found: {PARTS_DIR.relative_to(ROOT)}")
-        sys.exit(1)
+def sort_key(row: dict) -> tuple:
+    try:
+        line = int(row["source_line_start"])
+    except (ValueError, KeyError, TypeError):
+        line = 0
+    return (row["participant_id"], line, row["question_ref"])
+
+
+def report_errors(part_files: list[Path], errors: list[str]) -> None:
+    print(f"\nPhase 1: Merge Quotes")
+    print(f"{'─' * 50}")
+    print(f"  Parts dir : {PARTS_DIR.relative_to(ROOT)}")
+    print(f"  Part files: {len(part_files)}")
+    print(f"\nERRORS ({len(errors)}):")
+    for e in errors:
+        print(f"  FAIL  {e}")
+    print(f"\nStatus: FAIL — quotes.csv not written")
+    sys.exit(1)
+
+
+# ── Output and ledger ───────────────────────────────────────────────────────────
+# quotes.csv is written one participant block at a time. A Chunk is
+# (participant_id, encoded CSV rows, row count, duplicates dropped, rows);
+# rows is None for a block copied from the previous quotes.csv as bytes.
+
+Chunk = tuple[str, bytes, int, int, "list[dict] | None"]
 
-    part_files = sorted(PARTS_DIR.glob("*.csv"))
-    if not part_files:
-        print(f"FAIL  No CSV files found in {PARTS_DIR.relative_to(ROOT)}")
-        sys.exit(1)
+
+def encode_rows(rows: list[dict]) -> bytes:
+    buf = io.StringIO(newline="")
+    csv.DictWriter(buf, fieldnames=EXPECTED_COLUMNS).writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def encode_header() -> bytes:
+    buf = io.StringIO(newline="")
+    csv.DictWriter(buf, fieldnames=EXPECTED_COLUMNS).writeheader()
+    return buf.getvalue().encode("utf-8")
+
+
+def write_output(chunks: Iterable[Chunk], table: QuoteTableWriter | None = None) -> dict[str, dict]:
+    """
+    Write quotes.csv from participant blocks (via a temp file), adding each
+    block's rows to `table` and committing it once quotes.csv is in place.
+    Returns the ledger's participants section.
+    """
+    participants = {}
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_output = OUTPUT_PATH.with_name(OUTPUT_PATH.name + ".tmp")
+    try:
+        with open(tmp_output, "wb") as f:
+            f.write(encode_header())
+            for pid, data, n_rows, dropped, rows in chunks:
+                participants[pid] = {"offset": f.tell(), "length": len(data), "rows": n_rows, "dropped": dropped}
+                f.write(data)
+                if table is not None:
+                    table.add_rows(rows)
+        os.replace(tmp_output, OUTPUT_PATH)
+    except BaseException:
+        if table is not None:
+            table.discard()
+        raise
+    if table is not None:
+        table.commit()
+    return participants
+
+
+def part_entry(path: Path, rows: list[dict], data: bytes | None = None) -> dict:
+    """Ledger fingerprint of one part file."""
+    st = path.stat()
+    return {
+        "content_hash": content_hash(path.read_bytes() if data is None else data),
+        "size_bytes": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "rows": len(rows),
+        "participant_ids": sorted({row["participant_id"] for row in rows}),
+    }
+
+
+def load_ledger() -> dict | None:
+    """Return the ledger if it matches the current quotes.csv, else None."""
+    try:
+        ledger = json.loads(LEDGER_PATH.read_text(encoding="utf-8"))
+        st = OUTPUT_PATH.stat()
+    except (OSError, ValueError):
+        return None
+    if ledger.get("version") != LEDGER_VERSION:
+        return None
+    output = ledger.get("output", {})
+    if output.get("size_bytes") != st.st_size or output.get("mtime_ns") != st.st_mtime_ns:
+        return None
+    return ledger
+
+
+def write_ledger(parts: dict[str, dict], participants: dict[str, dict]) -> None:
+    st = OUTPUT_PATH.stat()
+    ledger = {
+        "version": LEDGER_VERSION,
+        "output": {"size_bytes": st.st_size, "mtime_ns": st.st_mtime_ns},
+        "parts": parts,
+        "participants": participants,
+    }
+    tmp_path = LEDGER_PATH.with_name(LEDGER_PATH.name + ".tmp")
+    tmp_path.write_text(json.dumps(ledger, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, LEDGER_PATH)
+
+
+# ── In-memory merge ─────────────────────────────────────────────────────────────
+
+def merge_in_memory(part_files: list[Path]) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Load every part, dedup and sort in memory. Returns the ledger's (parts, participants)."""
+    errors = []
 
     # ── Load all parts ──────────────────────────────────────────────────────────
 
     all_rows = []
+    parts = {}
     for part in part_files:
         rows, errs = load_part(part)
         if errs:
             errors.extend(errs)
         else:
             all_rows.extend(rows)
+            parts[part.name] = part_entry(part, rows)
 
     if errors:
-        print(f"\nPhase 1: Merge Quotes")
-        print(f"{'─' * 50}")
-        print(f"  Parts dir : {PARTS_DIR.relative_to(ROOT)}")
-        print(f"  Part files: {len(part_files)}")
-        print(f"\nERRORS ({len(errors)}):")
-        for e in errors:
-            print(f"  FAIL  {e}")
-        print(f"\nStatus: FAIL — quotes.csv not written")
-        sys.exit(1)
+        report_errors(part_files, errors)
 
     # ── Deduplicate ─────────────────────────────────────────────────────────────
 
     seen = set()
     deduped = []
-    dropped = 0
+    dropped = Counter()
     for row in all_rows:
         key = dedup_key(row)
         if key in seen:
-            dropped += 1
+            dropped[row["participant_id"]] += 1
         else:
             seen.add(key)
             deduped.append(row)
 
-    if dropped:
-        warnings.append(f"Dropped {dropped} exact duplicate row(s)")
-
     # ── Sort ────────────────────────────────────────────────────────────────────
 
-    def sort_key(row):
-        try:
-            line = int(row["source_line_start"])
-        except (ValueError, KeyError):
-            line = 0
-        return (row["participant_id"], line, row["question_ref"])
-
     deduped.sort(key=sort_key)
 
     # ── Write output ────────────────────────────────────────────────────────────
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=EXPECTED_COLUMNS)
-        writer.writeheader()
-        writer.writerows(deduped)
+    def chunks() -> Iterator[Chunk]:
+        for pid, group in itertools.groupby(deduped, key=lambda r: r["participant_id"]):
+            rows = list(group)
+            yield pid, encode_rows(rows), len(rows), dropped[pid], rows
+
+    return parts, write_output(chunks(), QuoteTableWriter(OUTPUT_PATH, EXPECTED_COLUMNS))
+
+
+# ── Streaming merge ─────────────────────────────────────────────────────────────
+# Records are (sort_key, part_index, row_index, row). part_index and row_index
+# give the row's position in the in-memory merge's concatenation of parts, so
+# ordering records as tuples reproduces its stable sort.
+
+Record = tuple[tuple, int, int, dict]
+
+
+def read_part(path: Path, part_index: int) -> Iterator[Record]:
+    with open(path, newline="", encoding="utf-8") as f:
+        for row_index, row in enumerate(csv.DictReader(f)):
+            yield (sort_key(row), part_index, row_index, row)
+
+
+def read_run(path: Path) -> Iterator[Record]:
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            part_index = int(row.pop("part_index"))
+            row_index = int(row.pop("row_index"))
+            yield (sort_key(row), part_index, row_index, row)
+
+
+def write_run(path: Path, records: Iterable[Record]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(RUN_COLUMNS)
+        for _, part_index, row_index, row in records:
+            writer.writerow([part_index, row_index, *(row[c] for c in EXPECTED_COLUMNS)])
+
+
+def prepare_part(path: Path, part_index: int, spill_dir: Path) -> tuple[Path | None, dict | None, list[str]]:
+    """
+    Validate one part and make it available as a sorted run.
+
+    Returns (spill, ledger entry, errors): spill is None when the part is
+    already in output order and can be re-read in place, otherwise the path
+    of a sorted copy in `spill_dir`.
+    """
+    rows, errors = load_part(path)
+    if errors:
+        return None, None, errors
+    entry = part_entry(path, rows)
+    records = [(sort_key(row), part_index, row_index, row) for row_index, row in enumerate(rows)]
+    if all(records[i][0] <= records[i + 1][0] for i in range(len(records) - 1)):
+        return None, entry, []
+    records.sort()
+    spill = spill_dir / f"part-{part_index:06d}.csv"
+    write_run(spill, records)
+    return spill, entry, []
+
+
+def merge_passes(sources: list[Iterator[Record] | Path], spill_dir: Path) -> Iterator[Record]:
+    """
+    k-way merge of sorted `sources` (record iterators, or spilled run paths).
+    While there are more than MAX_OPEN_RUNS, groups of them are merged into
+    intermediate runs first.
+    """
+    level = 0
+    while len(sources) > MAX_OPEN_RUNS:
+        merged = []
+        for n, first in enumerate(range(0, len(sources), MAX_OPEN_RUNS)):
+            group = [read_run(s) if isinstance(s, Path) else s for s in sources[first : first + MAX_OPEN_RUNS]]
+            run = spill_dir / f"merge-{level}-{n:06d}.csv"
+            write_run(run, heapq.merge(*group))
+            merged.append(run)
+        sources = merged
+        level += 1
+    return heapq.merge(*(read_run(s) if isinstance(s, Path) else s for s in sources))
+
+
+def dedup_group(group: list[Record]) -> tuple[list[dict], int]:
+    """
+    Drop duplicate rows from one participant's sorted records, keeping the
+    one that comes first in part order (as the in-memory merge does).
+    Returns (rows kept, in sorted order; number dropped).
+    """
+    first: dict[bytes, tuple[int, int]] = {}
+    hashes = []
+    for _, part_index, row_index, row in group:
+        h = dedup_hash(row)
+        hashes.append(h)
+        if h not in first or (part_index, row_index) < first[h]:
+            first[h] = (part_index, row_index)
+    kept = [row for (_, part_index, row_index, row), h in zip(group, hashes) if first[h] == (part_index, row_index)]
+    return kept, len(group) - len(kept)
+
+
+def dedup_merged(records: Iterator[Record]) -> Iterator[Chunk]:
+    """
+    Deduplicate the merged stream one participant block at a time.
+    dedup_key() starts with participant_id, so duplicates only occur within
+    one participant's rows, and only those are held at a time.
+    """
+    for pid, group in itertools.groupby(records, key=lambda r: r[0][0]):
+        rows, dropped = dedup_group(list(group))
+        yield pid, encode_rows(rows), len(rows), dropped, rows
+
+
+def merge_streaming(part_files: list[Path]) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Stream-merge `part_files` into OUTPUT_PATH. Returns the ledger's (parts, participants)."""
+    errors = []
+    parts = {}
+    with tempfile.TemporaryDirectory(prefix="merge-quotes-") as tmp:
+        spill_dir = Path(tmp)
+        spills: list[Path | None] = []
+        for part_index, part in enumerate(part_files):
+            spill, entry, errs = prepare_part(part, part_index, spill_dir)
+            errors.extend(errs)
+            spills.append(spill)
+            if entry is not None:
+                parts[part.name] = entry
+        if errors:
+            report_errors(part_files, errors)
+
+        sources = [
+            spill if spill is not None else read_part(part, part_index)
+            for part_index, (part, spill) in enumerate(zip(part_files, spills))
+        ]
+        table = QuoteTableWriter(OUTPUT_PATH, EXPECTED_COLUMNS)
+        participants = write_output(dedup_merged(merge_passes(sources, spill_dir)), table)
+    return parts, participants
+
+
+# ── Incremental merge ───────────────────────────────────────────────────────────
+
+def merge_incremental(part_files: list[Path], ledger: dict) -> tuple[dict[str, dict], dict[str, dict], list[str], set[str]]:
+    """
+    Re-merge only the participants whose parts changed since `ledger` was
+    written, splicing their blocks into the existing quotes.csv and its
+    sidecar. With nothing changed, neither file is rewritten.
+
+    A participant's block depends only on its own rows, taken from the parts
+    that contain it in part order, so rebuilding it from just those parts
+    gives the same block a full merge would. Returns the ledger's (parts,
+    participants) plus the changed part names and re-merged participant_ids.
+    """
+    errors = []
+    old_parts: dict[str, dict] = ledger["parts"]
+    old_participants: dict[str, dict] = ledger["participants"]
+    parts: dict[str, dict] = {}
+    loaded: dict[str, list[dict]] = {}
+    changed: list[str] = []
+    affected: set[str] = set()
+
+    # ── Find changed parts ──────────────────────────────────────────────────────
+
+    names = {part.name for part in part_files}
+    for name, old in old_parts.items():
+        if name not in names:
+            changed.append(name)
+            affected.update(old["participant_ids"])
+
+    for part in part_files:
+        old = old_parts.get(part.name)
+        st = part.stat()
+        if old is not None and old["size_bytes"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            parts[part.name] = old
+            continue
+        data = part.read_bytes()
+        if old is not None and old["content_hash"] == content_hash(data):
+            parts[part.name] = {**old, "mtime_ns": st.st_mtime_ns}
+            continue
+        rows, errs = load_part(part)
+        if errs:
+            errors.extend(errs)
+            continue
+        changed.append(part.name)
+        loaded[part.name] = rows
+        parts[part.name] = part_entry(part, rows, data)
+        affected.update(parts[part.name]["participant_ids"])
+        if old is not None:
+            affected.update(old["participant_ids"])
+
+    if errors:
+        report_errors(part_files, errors)
+
+    if not affected:
+        if open_quote_table(OUTPUT_PATH) is None:
+            write_quote_table(OUTPUT_PATH, EXPECTED_COLUMNS)
+        return parts, old_participants, changed, affected
+
+    # ── Rebuild affected participant blocks ─────────────────────────────────────
+
+    records: dict[str, list[Record]] = {}
+    for part_index, part in enumerate(part_files):
+        if part.name not in loaded:
+            if affected.isdisjoint(parts[part.name]["participant_ids"]):
+                continue
+            loaded[part.name], errs = load_part(part)
+            errors.extend(errs)
+        for row_index, row in enumerate(loaded[part.name]):
+            if row["participant_id"] in affected:
+                records.setdefault(row["participant_id"], []).append((sort_key(row), part_index, row_index, row))
+
+    if errors:
+        report_errors(part_files, errors)
+
+    rebuilt: dict[str, Chunk] = {}
+    for pid, group in records.items():
+        group.sort()
+        rows, dropped = dedup_group(group)
+        rebuilt[pid] = (pid, encode_rows(rows), len(rows), dropped, rows)
+
+    # ── Splice ──────────────────────────────────────────────────────────────────
+
+    # Sidecar row numbers of the old blocks, which are in quotes.csv order.
+    old_rows: dict[str, range] = {}
+    start = 0
+    for pid, block in sorted(old_participants.items(), key=lambda item: item[1]["offset"]):
+        old_rows[pid] = range(start, start + block["rows"])
+        start += block["rows"]
+    table = open_quote_table(OUTPUT_PATH)
+    splice = table is not None and table.columns == EXPECTED_COLUMNS and len(table) == start
+    if table is not None:
+        table.close()
+
+    kept = (pid for pid in old_participants if pid not in affected)
+    order = sorted({*kept, *rebuilt})
+
+    def chunks(old_output) -> Iterator[Chunk]:
+        for pid in order:
+            if pid in rebuilt:
+                yield rebuilt[pid]
+            else:
+                block = old_participants[pid]
+                old_output.seek(block["offset"])
+                yield pid, old_output.read(block["length"]), block["rows"], block["dropped"], None
+
+    with open(OUTPUT_PATH, "rb") as old_output:
+        participants = write_output(chunks(old_output))
+    if splice:
+        blocks = (rebuilt[pid][4] if pid in rebuilt else old_rows[pid] for pid in order)
+        splice_quote_table(OUTPUT_PATH, EXPECTED_COLUMNS, blocks)
+    else:
+        write_quote_table(OUTPUT_PATH, EXPECTED_COLUMNS)
+    return parts, participants, changed, affected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="k-way merge sorted parts with bounded memory instead of loading every row",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-merge only participants whose parts changed since the last merge (see quotes-ledger.json)",
+    )
+    args = parser.parse_args()
+
+    warnings = []
+
+    # ── Check parts directory ───────────────────────────────────────────────────
+
+    if not PARTS_DIR.exists():
+        print(f"FAIL  Parts directory not found: {PARTS_DIR.relative_to(ROOT)}")
+        sys.exit(1)
+
+    part_files = sorted(PARTS_DIR.glob("*.csv"), key=lambda p: p.name)
+    if not part_files:
+        print(f"FAIL  No CSV files found in {PARTS_DIR.relative_to(ROOT)}")
+        sys.exit(1)
+
+    # ── Merge ───────────────────────────────────────────────────────────────────
+
+    ledger = load_ledger() if args.incremental else None
+    if args.incremental and ledger is None:
+        warnings.append(f"No usable {LEDGER_PATH.name} for the current quotes.csv; ran a full merge")
+
+    if ledger is not None:
+        parts, participants, changed, affected = merge_incremental(part_files, ledger)
+        mode = f"incremental ({len(changed)} changed part(s), {len(affected)} participant(s) re-merged)"
+    elif args.streaming:
+        parts, participants = merge_streaming(part_files)
+        mode = "streaming k-way merge"
+    else:
+        parts, participants = merge_in_memory(part_files)
+        mode = "in memory"
+    write_ledger(parts, participants)
+
+    total = sum(entry["rows"] for entry in parts.values())
+    written = sum(block["rows"] for block in participants.values())
+    dropped = sum(block["dropped"] for block in participants.values())
+    if dropped:
+        warnings.append(f"Dropped {dropped} exact duplicate row(s)")
 
     # ── Report ──────────────────────────────────────────────────────────────────
 
@@ -134,8 +567,9 @@ def main():
     print(f"{'─' * 50}")
     print(f"  Parts dir  : {PARTS_DIR.relative_to(ROOT)}")
     print(f"  Part files : {len(part_files)}")
-    print(f"  Total rows : {len(all_rows)}")
-    print(f"  After dedup: {len(deduped)}")
+    print(f"  Mode       : {mode}")
+    print(f"  Total rows : {total}")
+    print(f"  After dedup: {written}")
     print(f"  Output     : {OUTPUT_PATH.relative_to(ROOT)}")
 
     if warnings:
@@ -0,0 +1 @@
+# Shared pipeline helpers package
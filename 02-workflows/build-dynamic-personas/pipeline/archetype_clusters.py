@@ -0,0 +1,267 @@
+"""
+Local clustering of participants into candidate archetypes for Phase 5.
+
+Each participant becomes a sparse vector over the consolidated tags, with two
+features per tag:
+  salience — how much they said about the tag: the severity-weighted quote
+             count (High 3, Medium 2, Low 1), log-damped and scaled by the
+             tag's inverse participant frequency, so tags everyone raises
+             count for less than distinctive ones
+  stance   — which way they lean on it: the severity-weighted mean sentiment
+             (positive +1, negative -1, mixed and neutral 0) times the
+             salience, scaled by STANCE_WEIGHT
+Vectors are unit-normalised, so a talkative participant is not "more" of an
+archetype than a brief one.
+
+kmeans() is spherical k-means (cosine similarity, k-means++ seeding, several
+seeded restarts, best total fit kept), which only ever multiplies the
+non-zero features of each participant. A participant whose fit to their
+cluster centre falls well below the rest of that cluster is an outlier.
+Everything is stdlib and deterministic for a given seed; thousands of
+participants cluster in seconds.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import Counter
+from operator import itemgetter, mul
+from typing import Callable, Iterable
+
+SEVERITY_WEIGHTS = {"high": 3.0, "medium": 2.0, "low": 1.0}
+SENTIMENT_SIGNS = {"positive": 1.0, "negative": -1.0, "mixed": 0.0, "neutral": 0.0}
+STANCE_WEIGHT = 0.5
+MAX_ITERATIONS = 100
+RESTARTS = 10
+OUTLIER_SD = 2.0
+MIN_CLUSTER_FOR_OUTLIERS = 5
+
+Feature = tuple[str, str]
+Vector = dict[Feature, float]
+
+
+# ── Features ─────────────────────────────────────────────────────────────────────
+
+def participant_vectors(rows: Iterable[dict]) -> tuple[dict[str, Vector], Counter]:
+    """
+    Unit vectors per participant from quote rows with participant_id,
+    consolidated_tag, severity and sentiment. Also returns each participant's
+    quote count.
+    """
+    weight: dict[str, Counter] = {}
+    lean: dict[str, Counter] = {}
+    quotes: Counter = Counter()
+    for row in rows:
+        pid = row["participant_id"]
+        tag = (row["consolidated_tag"] or "").strip()
+        if not tag:
+            continue
+        w = SEVERITY_WEIGHTS.get((row["severity"] or "").strip().lower(), 1.0)
+        weight.setdefault(pid, Counter())[tag] += w
+        lean.setdefault(pid, Counter())[tag] += w * SENTIMENT_SIGNS.get((row["sentiment"] or "").strip().lower(), 0.0)
+        quotes[pid] += 1
+
+    n = len(weight)
+    df = Counter(tag for tags in weight.values() for tag in tags)
+    idf = {tag: math.log((1 + n) / (1 + d)) + 1.0 for tag, d in df.items()}
+
+    vectors = {}
+    for pid, tags in weight.items():
+        vec: Vector = {}
+        for tag, w in tags.items():
+            salience = math.log1p(w) * idf[tag]
+            vec[(tag, "salience")] = salience
+            stance = lean[pid][tag] / w
+            if stance:
+                vec[(tag, "stance")] = STANCE_WEIGHT * stance * salience
+        norm = math.sqrt(sum(v * v for v in vec.values()))
+        vectors[pid] = {f: v / norm for f, v in vec.items()}
+    return vectors, quotes
+
+
+# ── Clustering ───────────────────────────────────────────────────────────────────
+
+# Inside kmeans() vectors are (feature indexes, values, getter) rows and
+# centres are dense lists; the getter is itemgetter(*indexes), so a cosine is
+# one C-level gather and multiply over the vector's non-zeros.
+Row = tuple[tuple[int, ...], tuple[float, ...], Callable]
+
+
+def _row(idx: tuple[int, ...], vals: tuple[float, ...]) -> Row:
+    if len(idx) == 1:
+        # itemgetter of one index returns a bare value; pad with a zero weight.
+        idx, vals = idx + idx, vals + (0.0,)
+    return idx, vals, itemgetter(*idx)
+
+
+def _dot(row: Row, centre: list[float]) -> float:
+    _, vals, get = row
+    return sum(map(mul, vals, get(centre)))
+
+
+def _centre(members: list[Row], n_features: int) -> list[float]:
+    total = [0.0] * n_features
+    for idx, vals, _ in members:
+        for j, v in zip(idx, vals):
+            total[j] += v
+    norm = math.sqrt(sum(v * v for v in total))
+    return [v / norm for v in total] if norm else total
+
+
+def _seed_centres(rows: list[Row], k: int, n_features: int, rng: random.Random) -> list[list[float]]:
+    """k-means++: each next centre is drawn with probability ∝ squared distance."""
+    centres = [_centre([rows[rng.randrange(len(rows))]], n_features)]
+    distance = [1.0 - _dot(r, centres[0]) for r in rows]
+    while len(centres) < k:
+        weights = [max(d, 0.0) ** 2 for d in distance]
+        if not any(weights):
+            pick = rng.randrange(len(rows))
+        else:
+            pick = rng.choices(range(len(rows)), weights=weights)[0]
+        centres.append(_centre([rows[pick]], n_features))
+        distance = [min(d, 1.0 - _dot(r, centres[-1])) for d, r in zip(distance, rows)]
+    return centres
+
+
+def _run(rows: list[Row], k: int, n_features: int, rng: random.Random) -> tuple[list[int], list[list[float]], list[float]]:
+    centres = _seed_centres(rows, k, n_features, rng)
+    labels = [-1] * len(rows)
+    # Running member sums per cluster: a move updates two sums, and only the
+    # clusters that gained or lost members get a new centre.
+    sums = [[0.0] * n_features for _ in range(k)]
+    size = [0] * k
+    # Hamerly-style bounds: a lower bound on each row's cosine to its own
+    # centre and an upper bound on its cosine to any other. A centre moving by
+    # d changes a unit row's cosine to it by at most d, so rows whose bounds
+    # still separate cannot change cluster and are skipped.
+    lower = [-math.inf] * len(rows)
+    upper = [math.inf] * len(rows)
+
+    def assign(i: int, c: int) -> None:
+        idx, vals, _ = rows[i]
+        old = labels[i]
+        if old >= 0:
+            total = sums[old]
+            for j, v in zip(idx, vals):
+                total[j] -= v
+            size[old] -= 1
+        total = sums[c]
+        for j, v in zip(idx, vals):
+            total[j] += v
+        size[c] += 1
+        labels[i] = c
+
+    for _ in range(MAX_ITERATIONS):
+        moved = set()
+        for i, (_, vals, get) in enumerate(rows):
+            if lower[i] >= upper[i]:
+                continue
+            sims = [sum(map(mul, vals, get(c))) for c in centres]
+            best = sims.index(max(sims))
+            lower[i] = sims[best]
+            sims[best] = -math.inf
+            upper[i] = max(sims)
+            if best != labels[i]:
+                moved.update((labels[i], best))
+                assign(i, best)
+        if not moved:
+            break
+        for c in range(k):
+            if not size[c]:
+                # Re-seed an empty cluster with the worst-fitting participant.
+                worst = min(range(len(rows)), key=lower.__getitem__)
+                moved.update((labels[worst], c))
+                assign(worst, c)
+                lower[worst] = -math.inf
+        shift = [0.0] * k
+        for c in moved - {-1}:
+            norm = math.sqrt(sum(v * v for v in sums[c]))
+            centre = [v / norm for v in sums[c]] if norm else list(sums[c])
+            shift[c] = math.sqrt(sum((a - b) ** 2 for a, b in zip(centre, centres[c])))
+            centres[c] = centre
+        largest = max(shift)
+        if largest:
+            for i, label in enumerate(labels):
+                lower[i] -= shift[label]
+                upper[i] += largest
+    fits = [_dot(row, centres[label]) for row, label in zip(rows, labels)]
+    return labels, centres, fits
+
+
+def kmeans(vectors: list[Vector], k: int, seed: int = 0, restarts: int = RESTARTS) -> tuple[list[int], list[Vector], list[float]]:
+    """
+    Spherical k-means of unit `vectors` into k clusters. Returns (labels,
+    centres, fits), fits being each vector's cosine to its centre; of
+    `restarts` seeded runs, the one with the highest total fit wins.
+    """
+    if len(vectors) < k:
+        raise ValueError(f"need at least {k} participants to form {k} clusters; got {len(vectors)}")
+    features = sorted({f for vec in vectors for f in vec})
+    index = {f: j for j, f in enumerate(features)}
+    rows = [_row(tuple(index[f] for f in vec), tuple(vec.values())) for vec in vectors]
+    best = None
+    for r in range(restarts):
+        labels, centres, fits = _run(rows, k, len(features), random.Random(seed * 1000 + r))
+        if len(set(labels)) < k:
+            continue
+        score = sum(fits)
+        if best is None or score > best[0] + 1e-12:
+            best = (score, labels, centres, fits)
+    if best is None:
+        raise ValueError(f"no run produced {k} non-empty clusters")
+    centres = [{f: v for f, v in zip(features, centre) if v} for centre in best[2]]
+    return best[1], centres, best[3]
+
+
+def weak_fits(labels: list[int], fits: list[float]) -> dict[int, str]:
+    """
+    Members fitting their cluster more than OUTLIER_SD standard deviations
+    below its mean fit, as {index: reason}. Clusters under
+    MIN_CLUSTER_FOR_OUTLIERS members are left alone, as is each cluster's
+    best-fitting member.
+    """
+    reasons = {}
+    for c in sorted(set(labels)):
+        members = [i for i, label in enumerate(labels) if label == c]
+        if len(members) < MIN_CLUSTER_FOR_OUTLIERS:
+            continue
+        mean = sum(fits[i] for i in members) / len(members)
+        sd = math.sqrt(sum((fits[i] - mean) ** 2 for i in members) / len(members))
+        keep = max(members, key=fits.__getitem__)
+        for i in members:
+            if i != keep and fits[i] < mean - OUTLIER_SD * sd:
+                reasons[i] = f"weak fit to cluster (similarity {fits[i]:.2f}; cluster mean {mean:.2f})"
+    return reasons
+
+
+# ── Profiles ─────────────────────────────────────────────────────────────────────
+
+def cluster_profile(members: list[Vector], everyone: list[Vector], n: int) -> list[dict]:
+    """
+    The n tags whose salience most exceeds the all-participant average in this
+    cluster, with the cluster's average stance on each (-1 negative … +1
+    positive).
+    """
+    def mean(vectors: list[Vector]) -> dict[Feature, float]:
+        total: dict[Feature, float] = {}
+        for vec in vectors:
+            for f, v in vec.items():
+                total[f] = total.get(f, 0.0) + v
+        return {f: v / len(vectors) for f, v in total.items()}
+
+    inside, overall = mean(members), mean(everyone)
+    lift = {
+        tag: v - overall.get((tag, kind), 0.0)
+        for (tag, kind), v in inside.items()
+        if kind == "salience"
+    }
+    top = sorted(lift.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+    return [
+        {
+            "consolidated_tag": tag,
+            "lift": round(gain, 3),
+            "stance": round(inside.get((tag, "stance"), 0.0) / (STANCE_WEIGHT * inside[(tag, "salience")]), 2),
+        }
+        for tag, gain in top
+    ]
@@ -0,0 +1,157 @@
+"""
+The Phase 3 contradiction part contract, shared by the completion check and
+the merge.
+
+Each participant's checker writes contradiction-parts/{participant_id}.csv
+with CONTRADICTION_COLUMNS. validate_part() reads a part once and checks every
+row as it is read: required fields, participant_id against the file name,
+contradiction_type and severity against the allowed values, and quote_b
+present for every type except Rationalisation, where it must be empty.
+
+quote_key() gives the form a contradiction quote is looked up under in a
+participant's validated quotes: normalised text, lowercased, with every
+ellipsis (..., …, spaced or not, leading or trailing) reduced to one " ... ".
+QuoteIndex maps participant_id → {quote_key: tags}, so each lookup is a
+single dict probe however many quotes a study has.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+from pathlib import Path
+
+from .transcripts import norm_text
+
+CONTRADICTION_COLUMNS = [
+    "participant_id",
+    "transcript_id",
+    "contradiction_type",
+    "severity",
+    "quote_a_tag",
+    "quote_a",
+    "quote_b_tag",
+    "quote_b",
+    "explanation",
+]
+
+ALLOWED_TYPES = {"Direct", "Loyalty gap", "Confidence erosion", "Rationalisation"}
+ALLOWED_SEVERITIES = {"High", "Medium", "Low"}
+
+_ELLIPSIS = re.compile(r"\.{3,}|…")
+
+REQUIRED_NON_EMPTY = [
+    "participant_id",
+    "transcript_id",
+    "contradiction_type",
+    "severity",
+    "quote_a_tag",
+    "quote_a",
+    "explanation",
+]
+
+
+def validate_row(row: dict, location: str, expected_participant_id: str) -> list[str]:
+    """Return the contract errors for one part row."""
+    errors = []
+
+    for field in REQUIRED_NON_EMPTY:
+        if not (row.get(field) or "").strip():
+            errors.append(f"{location}: required field '{field}' is empty")
+
+    row_participant = (row.get("participant_id") or "").strip()
+    if row_participant and row_participant != expected_participant_id:
+        errors.append(
+            f"{location}: participant_id '{row_participant}' does not match part file "
+            f"'{expected_participant_id}'"
+        )
+
+    contradiction_type = (row.get("contradiction_type") or "").strip()
+    if contradiction_type and contradiction_type not in ALLOWED_TYPES:
+        errors.append(
+            f"{location}: contradiction_type '{contradiction_type}' is invalid "
+            f"(allowed: {sorted(ALLOWED_TYPES)})"
+        )
+
+    severity = (row.get("severity") or "").strip()
+    if severity and severity not in ALLOWED_SEVERITIES:
+        errors.append(
+            f"{location}: severity '{severity}' is invalid "
+            f"(allowed: {sorted(ALLOWED_SEVERITIES)})"
+        )
+
+    quote_b_tag = (row.get("quote_b_tag") or "").strip()
+    quote_b = (row.get("quote_b") or "").strip()
+
+    if contradiction_type == "Rationalisation":
+        if quote_b_tag or quote_b:
+            errors.append(
+                f"{location}: Rationalisation rows must leave quote_b_tag and quote_b empty"
+            )
+    elif contradiction_type in ALLOWED_TYPES:
+        if not quote_b_tag:
+            errors.append(
+                f"{location}: {contradiction_type} rows require non-empty quote_b_tag"
+            )
+        if not quote_b:
+            errors.append(f"{location}: {contradiction_type} rows require non-empty quote_b")
+
+    return errors
+
+
+def read_part(path: Path, check_rows: bool, expected_participant_id: str = "") -> tuple[list[dict], list[str]]:
+    """
+    Read one part file in a single pass. Returns (rows, errors); the header is
+    always checked, and each row too when `check_rows` is set.
+    """
+    rows = []
+    errors = []
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if list(reader.fieldnames or []) != CONTRADICTION_COLUMNS:
+                errors.append(
+                    f"{path.name}: unexpected columns {reader.fieldnames} "
+                    f"(expected {CONTRADICTION_COLUMNS})"
+                )
+                return rows, errors
+            for lineno, row in enumerate(reader, start=2):
+                if check_rows:
+                    errors.extend(validate_row(row, f"{path.name}:{lineno}", expected_participant_id))
+                rows.append(row)
+    except Exception as e:
+        # A part that cannot be read to the end is reported as unreadable only.
+        return [], [f"{path.name}: could not read — {e}"]
+    return rows, errors
+
+
+def validate_part(path: Path, expected_participant_id: str) -> tuple[list[dict], list[str]]:
+    """Validate one participant part file. Returns (rows, errors)."""
+    return read_part(path, True, expected_participant_id)
+
+
+# ── Quote index ──────────────────────────────────────────────────────────────────
+
+def quote_key(quote: str) -> str:
+    """Lookup form of a quote: normalised, lowercased, ellipses made uniform."""
+    segments = (s.strip() for s in _ELLIPSIS.split(norm_text(quote)))
+    return " ... ".join(s for s in segments if s).lower()
+
+
+class QuoteIndex:
+    """Per-participant hash index of quote keys, each with the tags it was extracted under."""
+
+    def __init__(self):
+        self._by_participant: dict[str, dict[str, set[str]]] = {}
+
+    def add(self, participant_id: str, quote: str, tag: str) -> None:
+        key = quote_key(quote)
+        if key:
+            self._by_participant.setdefault(participant_id, {}).setdefault(key, set()).add(tag)
+
+    def tags(self, participant_id: str, quote: str) -> set[str] | None:
+        """Tags of `quote` for this participant, or None if it is not indexed."""
+        return self._by_participant.get(participant_id, {}).get(quote_key(quote))
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._by_participant.values())
@@ -0,0 +1,332 @@
+"""
+Corpus-wide phrase search over all manifest transcripts (suffix array).
+
+The corpus is every transcript's normalised, lowercased text as UTF-8,
+separated by newlines (which never occur in normalised text, so matches
+cannot span transcripts). The suffix array holds the byte offset of every
+word start, sorted by the suffix that begins there. A phrase query is two
+binary searches over it: O(m log n) for an m-byte phrase.
+
+On disk (under p0-prepare/corpus-index/):
+  corpus.bin    — the corpus bytes
+  suffixes.bin  — int64 suffix array
+  lines.bin     — int64 (start offset, line number) tables per transcript
+  index.json    — per-transcript metadata (including the source file's
+                  content hash, size and mtime) and offsets into the files above
+All three .bin files are opened with mmap. stale_transcripts() reports
+transcripts changed since the build, so callers can refuse stale hits; it can
+be limited to the participants a search actually hit.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Iterable
+
+from .manifest import Manifest
+from .transcripts import ROOT, content_hash, norm_text
+
+INDEX_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "corpus-index"
+INDEX_VERSION = 2
+SEPARATOR = b"\n"
+# A word and the separator byte that ends it.
+_TOKEN = re.compile(rb"[^ \n]+[ \n]?")
+
+
+def _sa_is(s: array, upper: int) -> array:
+    """
+    Suffix array of the integer sequence `s` (values 0..upper) by SA-IS
+    induced sorting, in O(len(s)) time. A suffix that is a prefix of
+    another sorts first.
+    """
+    n = len(s)
+    if n < 3:
+        return array("q", sorted(range(n), key=lambda i: s[i:]))
+    sa = array("q", [-1]) * n
+    # ls[i]: suffix i is S-type (smaller than suffix i + 1).
+    ls = bytearray(n)
+    for i in range(n - 2, -1, -1):
+        ls[i] = ls[i + 1] if s[i] == s[i + 1] else s[i] < s[i + 1]
+    # Bucket bounds: sum_s[c] is where bucket c's S-suffixes start, sum_l[c]
+    # where its L-suffixes start.
+    sum_l = array("q", bytes(8 * (upper + 1)))
+    sum_s = array("q", bytes(8 * (upper + 1)))
+    for i in range(n):
+        if not ls[i]:
+            sum_s[s[i]] += 1
+        elif s[i] < upper:
+            sum_l[s[i] + 1] += 1
+    for c in range(upper + 1):
+        sum_s[c] += sum_l[c]
+        if c < upper:
+            sum_l[c + 1] += sum_s[c]
+
+    def induce(lms: Iterable[int]) -> None:
+        sa[:] = array("q", [-1]) * n
+        buf = array("q", sum_s)
+        for d in lms:
+            if d != n:
+                sa[buf[s[d]]] = d
+                buf[s[d]] += 1
+        buf = array("q", sum_l)
+        sa[buf[s[n - 1]]] = n - 1
+        buf[s[n - 1]] += 1
+        for i in range(n):
+            v = sa[i] - 1
+            if v >= 0 and not ls[v]:
+                sa[buf[s[v]]] = v
+                buf[s[v]] += 1
+        buf = array("q", sum_l)
+        buf.append(n)
+        for i in range(n - 1, -1, -1):
+            v = sa[i] - 1
+            if v >= 0 and ls[v]:
+                buf[s[v] + 1] -= 1
+                sa[buf[s[v] + 1]] = v
+
+    lms = array("q", (i for i in range(1, n) if ls[i] and not ls[i - 1]))
+    m = len(lms)
+    lms_map = array("q", [-1]) * (n + 1)
+    for k, i in enumerate(lms):
+        lms_map[i] = k
+    induce(lms)
+    if not m:
+        return sa
+
+    # Name the LMS substrings in sorted order, then sort the reduced string.
+    sorted_lms = array("q", (v for v in sa if lms_map[v] >= 0))
+    reduced = array("q", bytes(8 * m))
+    name = 0
+    for k in range(1, m):
+        l, r = sorted_lms[k - 1], sorted_lms[k]
+        end_l = lms[lms_map[l] + 1] if lms_map[l] + 1 < m else n
+        end_r = lms[lms_map[r] + 1] if lms_map[r] + 1 < m else n
+        same = end_l - l == end_r - r and s[l:end_l] == s[r:end_r] and end_l < n and end_r < n and s[end_l] == s[end_r]
+        if not same:
+            name += 1
+        reduced[lms_map[r]] = name
+    induce(lms[i] for i in _sa_is(reduced, name))
+    return sa
+
+
+def build_suffix_array(data: bytes) -> array:
+    """
+    Return the byte offsets of every word start in `data`, sorted by the
+    suffix of `data` beginning at each one.
+
+    Each word plus the one separator byte after it is a token. Only a token's
+    last byte is a separator, so no token is a prefix of another (bar the
+    final, unterminated one, which sorts first as its suffix does), and
+    ordering suffixes by their token sequences orders them by bytes. Tokens
+    are ranked once through a vocabulary dict, and the rank sequence is
+    sorted with SA-IS: linear time however much text repeats, and a handful
+    of int64 arrays per word rather than a bytes key per suffix.
+    """
+    starts = array("q")
+    ids = array("q")
+    vocab: dict[bytes, int] = {}
+    for m in _TOKEN.finditer(data):
+        starts.append(m.start())
+        ids.append(vocab.setdefault(m.group(), len(vocab)))
+    token_rank = array("q", bytes(8 * len(vocab)))
+    for r, token in enumerate(sorted(vocab)):
+        token_rank[vocab[token]] = r
+    del vocab
+    ranks = array("q", (token_rank[t] for t in ids))
+    del ids, token_rank
+    return array("q", (starts[i] for i in _sa_is(ranks, max(ranks, default=0))))
+
+
+def build_index(transcripts: list[dict], index_dir: Path = INDEX_DIR) -> dict:
+    """Build and persist the index for manifest `transcripts` entries; returns the metadata written."""
+    corpus = bytearray()
+    line_tables = array("q")
+    docs = []
+
+    for t in transcripts:
+        source = ROOT / t["path"]
+        stat = source.stat()
+        raw = source.read_bytes()
+        if corpus:
+            corpus += SEPARATOR
+        doc_start = len(corpus)
+        lines_offset = len(line_tables) // 2
+        pos = 0
+        for lineno, line in enumerate(raw.decode("utf-8").splitlines(), start=1):
+            norm = norm_text(line).lower().encode("utf-8")
+            if not norm:
+                continue
+            if pos:
+                corpus += b" "
+            # separator space between lines maps to the next line
+            line_tables.extend((pos, lineno))
+            pos += len(norm) + (1 if pos else 0)
+            corpus += norm
+        docs.append(
+            {
+                "participant_id": t["participant_id"],
+                "id": t["id"],
+                "path": t["path"],
+                "source_hash": content_hash(raw),
+                "source_size": stat.st_size,
+                "source_mtime_ns": stat.st_mtime_ns,
+                "start": doc_start,
+                "length": len(corpus) - doc_start,
+                "lines": [lines_offset, len(line_tables) // 2 - lines_offset],
+            }
+        )
+
+    data = bytes(corpus)
+    suffixes = build_suffix_array(data)
+
+    index_dir.mkdir(parents=True, exist_ok=True)
+    meta = {"version": INDEX_VERSION, "suffix_count": len(suffixes), "transcripts": docs}
+    for name, blob in (
+        ("corpus.bin", data),
+        ("suffixes.bin", suffixes.tobytes()),
+        ("lines.bin", line_tables.tobytes()),
+    ):
+        tmp = index_dir / (name + ".tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, index_dir / name)
+    tmp = index_dir / "index.json.tmp"
+    tmp.write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, index_dir / "index.json")
+    return meta
+
+
+def _map(path: Path) -> memoryview:
+    if not path.stat().st_size:
+        return memoryview(b"")
+    with open(path, "rb") as f:
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class CorpusIndex:
+    def __init__(self, index_dir: Path = INDEX_DIR):
+        meta = json.loads((index_dir / "index.json").read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported corpus index version: {meta.get('version')}")
+        self.transcripts: list[dict] = meta["transcripts"]
+        self.corpus = _map(index_dir / "corpus.bin")
+        self.suffixes = _map(index_dir / "suffixes.bin").cast("q")
+        self.lines = _map(index_dir / "lines.bin").cast("q")
+        self._doc_starts = [d["start"] for d in self.transcripts]
+
+    def stale_transcripts(
+        self, manifest: Manifest | None = None, participant_ids: Iterable[str] | None = None
+    ) -> list[str]:
+        """
+        participant_ids whose indexed text may no longer match the transcript:
+        the source file's size or mtime changed, the manifest's content_hash
+        differs from the indexed one, or the participant was added to or
+        removed from the manifest since the build. Hits for these carry stale
+        offsets and line numbers until build-corpus-index.py is re-run.
+
+        With `participant_ids`, only those participants are checked (one stat
+        and one manifest lookup each) instead of the whole corpus.
+        """
+        stale = []
+        indexed = {d["participant_id"]: d for d in self.transcripts}
+        if participant_ids is not None:
+            for pid in set(participant_ids):
+                doc = indexed.get(pid)
+                t = manifest.get(pid) if manifest is not None else None
+                if doc is None:
+                    if t is not None:
+                        stale.append(pid)
+                elif self._source_changed(doc):
+                    stale.append(pid)
+                elif manifest is not None and (
+                    t is None
+                    or t["path"] != doc["path"]
+                    or (t.get("content_hash") and t["content_hash"] != doc["source_hash"])
+                ):
+                    stale.append(pid)
+            return sorted(stale)
+
+        for doc in self.transcripts:
+            if self._source_changed(doc):
+                stale.append(doc["participant_id"])
+        if manifest is not None:
+            listed = set()
+            for t in manifest.transcripts():
+                pid = t["participant_id"]
+                listed.add(pid)
+                doc = indexed.get(pid)
+                if doc is None or doc["path"] != t["path"]:
+                    stale.append(pid)
+                elif t.get("content_hash") and t["content_hash"] != doc["source_hash"]:
+                    stale.append(pid)
+            stale.extend(pid for pid in indexed if pid not in listed)
+        return sorted(set(stale))
+
+    @staticmethod
+    def _source_changed(doc: dict) -> bool:
+        try:
+            stat = (ROOT / doc["path"]).stat()
+        except OSError:
+            return True
+        return stat.st_size != doc["source_size"] or stat.st_mtime_ns != doc["source_mtime_ns"]
+
+    def _line_at(self, doc: dict, local: int) -> int:
+        offset, count = doc["lines"]
+        starts = self.lines[2 * offset : 2 * (offset + count) : 2]
+        linenos = self.lines[2 * offset + 1 : 2 * (offset + count) : 2]
+        return linenos[bisect_right(starts, local) - 1]
+
+    def search(self, phrase: str, limit: int | None = None) -> list[dict]:
+        """
+        Return every occurrence of `phrase` (matched case-insensitively after
+        quote/whitespace normalisation, starting at a word boundary), ordered
+        by transcript then position.
+
+        Each hit is {participant_id, transcript_id, offset, line_start, line_end},
+        where offset is the byte offset within that transcript's normalised text.
+        """
+        query = norm_text(phrase).lower().encode("utf-8")
+        if not query:
+            return []
+        corpus, m = self.corpus, len(query)
+
+        def prefix(s: int) -> bytes:
+            return corpus[s : s + m].tobytes()
+
+        lo = bisect_left(self.suffixes, query, key=prefix)
+        hi = bisect_right(self.suffixes, query, key=prefix, lo=lo)
+        positions = sorted(self.suffixes[lo:hi])
+        if limit is not None:
+            positions = positions[:limit]
+
+        hits = []
+        for pos in positions:
+            doc = self.transcripts[bisect_right(self._doc_starts, pos) - 1]
+            local = pos - doc["start"]
+            hits.append(
+                {
+                    "participant_id": doc["participant_id"],
+                    "transcript_id": doc["id"],
+                    "offset": local,
+                    "line_start": self._line_at(doc, local),
+                    "line_end": self._line_at(doc, local + m - 1),
+                }
+            )
+        return hits
+
+    def count(self, phrase: str) -> int:
+        query = norm_text(phrase).lower().encode("utf-8")
+        if not query:
+            return 0
+        corpus, m = self.corpus, len(query)
+
+        def prefix(s: int) -> bytes:
+            return corpus[s : s + m].tobytes()
+
+        lo = bisect_left(self.suffixes, query, key=prefix)
+        return bisect_right(self.suffixes, query, key=prefix, lo=lo) - lo
@@ -0,0 +1,211 @@
+"""
+Phase 0 manifest loading and writing, for both layouts prepare.py can write.
+
+json   — p0-prepare/manifest.json holds everything, including the full
+         "transcripts" list (the original layout).
+jsonl  — manifest.json is a small header with "layout": "jsonl"; transcript
+         entries are JSON Lines shards in p0-prepare/manifest/, and
+         manifest-index.tsv there has one line per transcript —
+         participant_id, transcript id, path, shard, byte offset, byte length —
+         sorted by participant_id.
+
+open_manifest() returns a Manifest for either layout. refs() and
+participant_ids() read only the index; ref() and get() binary-search the
+mmap'd index, and get() then parses a single shard line. Nothing reads the
+whole manifest unless transcripts() is iterated.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from .transcripts import ROOT
+
+MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
+SHARD_DIR_NAME = "manifest"
+INDEX_NAME = "manifest-index.tsv"
+SHARD_SIZE = 10_000
+LAYOUTS = ["json", "jsonl"]
+
+
+class ManifestRef(NamedTuple):
+    participant_id: str
+    id: str
+    path: str
+
+
+def _shard_name(n: int) -> str:
+    return f"transcripts-{n:05d}.jsonl"
+
+
+# ── Writing ──────────────────────────────────────────────────────────────────────
+
+def write_manifest(manifest: dict, layout: str = "json", manifest_path: Path = MANIFEST_PATH) -> None:
+    """
+    Write `manifest` (with its full "transcripts" list) in `layout`.
+
+    Writing one layout removes the other's leftovers, so readers never see a
+    stale mix.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown manifest layout: {layout}")
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    shard_dir = manifest_path.parent / SHARD_DIR_NAME
+
+    if layout == "json":
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+        if shard_dir.exists():
+            shutil.rmtree(shard_dir)
+        return
+
+    tmp_dir = shard_dir.with_name(shard_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir()
+
+    transcripts = manifest["transcripts"]
+    index_rows: list[tuple[str, str, str, int, int, int]] = []
+    shards: list[str] = []
+    for n, first in enumerate(range(0, len(transcripts), SHARD_SIZE)):
+        name = _shard_name(n)
+        shards.append(name)
+        offset = 0
+        with open(tmp_dir / name, "wb") as out:
+            for t in transcripts[first : first + SHARD_SIZE]:
+                line = json.dumps(t, ensure_ascii=False).encode("utf-8") + b"\n"
+                out.write(line)
+                index_rows.append((t["participant_id"], t["id"], t["path"], n, offset, len(line)))
+                offset += len(line)
+
+    # Byte order, to match the bytes comparisons in Manifest._find().
+    index_rows.sort(key=lambda row: row[0].encode("utf-8"))
+    with open(tmp_dir / INDEX_NAME, "w", encoding="utf-8", newline="\n") as out:
+        for row in index_rows:
+            out.write("\t".join(map(str, row)) + "\n")
+
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    os.replace(tmp_dir, shard_dir)
+
+    header = {k: v for k, v in manifest.items() if k != "transcripts"}
+    header["layout"] = "jsonl"
+    header["shards"] = shards
+    header["index"] = f"{SHARD_DIR_NAME}/{INDEX_NAME}"
+    manifest_path.write_text(json.dumps(header, indent=2))
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────────
+
+class Manifest:
+    """
+    Read access to a manifest in either layout.
+
+    header holds the top-level fields (transcript_count, research_brief_path,
+    warnings, ...) without the transcripts list.
+    """
+
+    def __init__(self, manifest_path: Path = MANIFEST_PATH):
+        with open(manifest_path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.layout: str = data.get("layout", "json")
+        self._entries: list[dict] | None = None
+        self._by_pid: dict[str, dict] | None = None
+        self._index: mmap.mmap | bytes | None = None
+        if self.layout == "json":
+            self._entries = data.pop("transcripts", [])
+        elif self.layout == "jsonl":
+            self.shard_dir = manifest_path.parent / SHARD_DIR_NAME
+            self.shards: list[str] = data["shards"]
+            index_path = manifest_path.parent / data["index"]
+            if index_path.stat().st_size:
+                with open(index_path, "rb") as f:
+                    self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._index = b""
+        else:
+            raise ValueError(f"Unknown manifest layout: {self.layout}")
+        self.header = data
+
+    def __len__(self) -> int:
+        return self.header.get("transcript_count", 0)
+
+    def refs(self) -> Iterator[ManifestRef]:
+        """(participant_id, id, path) per transcript: manifest order for json, participant_id order for jsonl."""
+        if self._entries is not None:
+            for t in self._entries:
+                yield ManifestRef(t["participant_id"], t["id"], t["path"])
+            return
+        for line in self._index[:].decode("utf-8").splitlines():
+            participant_id, transcript_id, path, _ = line.split("\t", 3)
+            yield ManifestRef(participant_id, transcript_id, path)
+
+    def participant_ids(self) -> Iterator[str]:
+        if self._entries is not None:
+            for t in self._entries:
+                yield t["participant_id"]
+            return
+        for line in self._index[:].decode("utf-8").splitlines():
+            yield line[: line.index("\t")]
+
+    def transcripts(self) -> Iterator[dict]:
+        """Full transcript entries in manifest order (streams the shards for jsonl)."""
+        if self._entries is not None:
+            yield from self._entries
+            return
+        for name in self.shards:
+            with open(self.shard_dir / name, encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def _find(self, participant_id: str) -> list[str] | None:
+        # Binary search over the sorted, newline-separated index without
+        # splitting it into lines: each probe reads only the line around mid.
+        index = self._index
+        key = participant_id.encode("utf-8")
+        lo, hi = 0, len(index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = index.rfind(b"\n", 0, mid) + 1
+            end = index.find(b"\n", start)
+            if end < 0:
+                end = len(index)
+            line = index[start:end]
+            line_key = line.split(b"\t", 1)[0]
+            if line_key < key:
+                lo = end + 1
+            elif line_key > key:
+                hi = start
+            else:
+                return line.decode("utf-8").split("\t")
+        return None
+
+    def ref(self, participant_id: str) -> ManifestRef | None:
+        if self._entries is not None:
+            t = self.get(participant_id)
+            return ManifestRef(t["participant_id"], t["id"], t["path"]) if t else None
+        fields = self._find(participant_id)
+        return ManifestRef(fields[0], fields[1], fields[2]) if fields else None
+
+    def get(self, participant_id: str) -> dict | None:
+        """Return one full transcript entry, or None if the participant is not in the manifest."""
+        if self._entries is not None:
+            if self._by_pid is None:
+                self._by_pid = {t["participant_id"]: t for t in self._entries}
+            return self._by_pid.get(participant_id)
+        fields = self._find(participant_id)
+        if fields is None:
+            return None
+        shard, offset, length = int(fields[3]), int(fields[4]), int(fields[5])
+        with open(self.shard_dir / self.shards[shard], "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+
+def open_manifest(manifest_path: Path = MANIFEST_PATH) -> Manifest:
+    """Open the manifest in whichever layout it was written. Raises FileNotFoundError if absent."""
+    return Manifest(manifest_path)
@@ -0,0 +1,35 @@
+"""
+Substring search for quote matching.
+
+PatternFinder runs str.find() over one lowercased transcript and remembers
+each distinct pattern's first occurrence, so a quote repeated across rows, or
+looked up first in its cited question and then in the whole transcript, is
+only searched for from the start once.
+
+An Aho-Corasick automaton over all of a transcript's quotes was tried here and
+removed: building and scanning it in Python cost more than one C-level
+str.find() per distinct pattern at every size measured, from 17 quotes over a
+7 KB transcript to 3,000 quotes over a 2 MB one.
+"""
+
+from __future__ import annotations
+
+
+class PatternFinder:
+    def __init__(self, text: str):
+        self.text = text
+        self._first: dict[str, int] = {}
+
+    def find(self, pattern: str, start: int = 0, end: int | None = None) -> int:
+        """Equivalent of text.find(pattern, start, end)."""
+        if end is None:
+            end = len(self.text)
+        first = self._first.get(pattern)
+        if first is None:
+            first = self._first[pattern] = self.text.find(pattern)
+        if first < 0:
+            return -1
+        if first >= start:
+            # Every later occurrence ends later still, so none fits before `end` either.
+            return first if first + len(pattern) <= end else -1
+        return self.text.find(pattern, start, end)
@@ -0,0 +1,123 @@
+"""
+MinHash signatures and LSH banding for near-duplicate text detection.
+
+Each text becomes a set of word shingles (SHINGLE_WORDS-word windows of its
+normalised, lowercased words), each hashed once to 64 bits. Signatures use
+one-permutation hashing: a shingle's hash picks one of NUM_PERM bins and the
+bin keeps the smallest remaining hash bits; empty bins borrow from the next
+non-empty bin with an offset (rotation densification). Two signatures agree
+at a position with probability equal to the sets' Jaccard similarity, as with
+classic MinHash, at O(shingles + NUM_PERM) per text instead of
+O(shingles × NUM_PERM).
+
+Signatures are cut into BANDS bands of ROWS values and texts that share any
+whole band become candidate pairs, so candidates are found in time linear in
+the number of texts instead of comparing all pairs. A bucket larger than
+MAX_BUCKET_PAIRING (many copies of one boilerplate text) pairs each member
+with its first member only, so one bucket cannot produce a quadratic number
+of candidates; members still link up through that representative. With the defaults a pair
+at Jaccard 0.7 becomes a candidate with probability > 0.999; pairs below ~0.4
+rarely do. Candidates are then confirmed on exact Jaccard.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from itertools import combinations, islice
+
+from .transcripts import norm_text
+
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+MAX_BUCKET_PAIRING = 32
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> frozenset[int]:
+    """
+    Return the 64-bit hashes of the k-word shingles of `text`. Punctuation is
+    ignored; texts shorter than k words are one shingle.
+    """
+    words = _WORD.findall(norm_text(text).lower())
+    if not words:
+        return frozenset()
+    grams = [" ".join(words[i : i + k]) for i in range(max(1, len(words) - k + 1))]
+    return frozenset(
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in grams
+    )
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def containment(a: frozenset, b: frozenset) -> float:
+    """Share of the smaller set that is in the other (1.0 when one text is a trimmed copy)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def signature(shingle_set: frozenset[int], num_perm: int = NUM_PERM) -> tuple[int, ...] | None:
+    """Densified one-permutation MinHash signature, or None for an empty set."""
+    if not shingle_set:
+        return None
+    bins: list[int | None] = [None] * num_perm
+    for h in shingle_set:
+        j, value = h % num_perm, h // num_perm
+        current = bins[j]
+        if current is None or value < current:
+            bins[j] = value
+    # An empty bin borrows from the next non-empty bin to its right
+    # (circularly). Bin values are below 2**64 / num_perm, so offsetting a
+    # borrowed value by distance * that bound keeps it distinct from every
+    # original value.
+    filled = [j for j, value in enumerate(bins) if value is not None]
+    if len(filled) == num_perm:
+        return tuple(bins)
+    offset = (1 << 64) // num_perm
+    sig = list(bins)
+    prev = filled[-1] - num_perm
+    for nxt in filled:
+        value = bins[nxt]
+        for j in range(prev + 1, nxt):
+            sig[j] = value + (nxt - j) * offset
+        prev = nxt
+    return tuple(sig)
+
+
+def candidate_pairs(signatures: list[tuple[int, ...] | None], bands: int = BANDS) -> set[tuple[int, int]]:
+    """
+    Return index pairs (i < j) whose signatures share at least one band.
+    None signatures (empty texts) are skipped. In buckets of more than
+    MAX_BUCKET_PAIRING members only (first member, member) pairs are returned.
+    """
+    pairs: set[tuple[int, int]] = set()
+    rows = len(next((s for s in signatures if s is not None), ())) // bands
+    if not rows:
+        return pairs
+    for band in range(bands):
+        lo, hi = band * rows, (band + 1) * rows
+        buckets: dict[tuple[int, ...], list[int]] = {}
+        for i, sig in enumerate(signatures):
+            if sig is not None:
+                key = sig[lo:hi]
+                members = buckets.get(key)
+                if members is None:
+                    buckets[key] = [i]
+                else:
+                    members.append(i)
+        for members in buckets.values():
+            if len(members) > MAX_BUCKET_PAIRING:
+                first = members[0]
+                pairs.update((first, i) for i in islice(members, 1, None))
+            elif len(members) > 1:
+                pairs.update(combinations(members, 2))
+    return pairs
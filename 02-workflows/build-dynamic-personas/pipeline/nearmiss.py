@@ -0,0 +1,148 @@
+"""
+Approximate (near-miss) search for quotes that failed exact matching.
+
+A character n-gram index over the transcript (or one question block of it)
+votes for candidate alignment diagonals; only the best few candidates are
+checked with a banded, semi-global edit distance. Only n-grams starting a
+word are indexed and looked up, which keeps the index about a fifth of the
+size of one over every position while the words a paraphrase keeps still
+vote. Cost per failure is roughly O(len(needle) * band) instead of
+O(len(needle) * len(transcript)).
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+NGRAM = 4
+# n-grams this common (e.g. "the ") carry little signal and are skipped.
+MAX_POSTINGS = 256
+TOP_CANDIDATES = 3
+# Candidates with fewer votes than this share of the best one are not aligned.
+MIN_VOTE_SHARE = 0.5
+
+_WORD_START = re.compile(r"(?<!\S)\S")
+
+
+def word_starts(text: str, start: int = 0, end: int | None = None) -> list[int]:
+    """Positions in text[start:end] where a word begins."""
+    end = len(text) if end is None else end
+    return [m.start() for m in _WORD_START.finditer(text, start, end)]
+
+
+class NgramIndex:
+    def __init__(self, text: str, start: int = 0, end: int | None = None, n: int = NGRAM):
+        self.text = text
+        self.n = n
+        self.postings: dict[str, list[int]] = {}
+        end = len(text) if end is None else end
+        postings = self.postings
+        for i in word_starts(text, start, end - n + 1):
+            gram = text[i : i + n]
+            positions = postings.get(gram)
+            if positions is None:
+                postings[gram] = [i]
+            else:
+                positions.append(i)
+
+    def candidates(self, needle: str, band: int, limit: int = TOP_CANDIDATES) -> list[int]:
+        """Return up to `limit` likely start positions for `needle`, best first."""
+        n = self.n
+        diagonals: Counter[int] = Counter()
+        for j in word_starts(needle, 0, len(needle) - n + 1):
+            positions = self.postings.get(needle[j : j + n])
+            if positions is None or len(positions) > MAX_POSTINGS:
+                continue
+            for p in positions:
+                diagonals[p - j] += 1
+        # Bucket diagonals so small indels still vote together, then centre
+        # each bucket on its most-voted diagonal rather than its midpoint.
+        votes: Counter[int] = Counter()
+        centre: dict[int, int] = {}
+        for diagonal, count in diagonals.most_common():
+            bucket = diagonal // band
+            votes[bucket] += count
+            centre.setdefault(bucket, diagonal)
+        ranked = votes.most_common(limit)
+        if not ranked:
+            return []
+        floor = ranked[0][1] * MIN_VOTE_SHARE
+        return [centre[bucket] for bucket, count in ranked if count >= floor]
+
+
+def banded_alignment(needle: str, text: str, centre: int, band: int) -> tuple[int, int, int]:
+    """
+    Semi-global edit distance of `needle` against `text` near start `centre`.
+
+    The needle must align completely; the text span is free to start within
+    `band` of `centre` and to end anywhere on the band. Only cells within
+    `band` of the diagonal are computed.
+
+    Returns (distance, span_start, span_end).
+    """
+    width = 2 * band + 1
+    n = len(text)
+    inf = len(needle) + width + 1
+
+    # Column k of row i is text position t = centre + i + k - band (chars consumed).
+    cost = [0] * width
+    start = [0] * width
+    for k in range(width):
+        t = centre + k - band
+        if 0 <= t <= n:
+            start[k] = t
+        else:
+            cost[k] = inf
+
+    for i in range(1, len(needle) + 1):
+        ch = needle[i - 1]
+        new_cost = [inf] * width
+        new_start = [0] * width
+        base = centre + i - band
+        for k in range(width):
+            t = base + k
+            if t < 0 or t > n:
+                continue
+            best = inf
+            best_start = 0
+            # Match / substitution: previous row, same column (t - 1).
+            if t >= 1 and cost[k] < inf:
+                best = cost[k] + (text[t - 1] != ch)
+                best_start = start[k]
+            # Needle character dropped: previous row, column k + 1 (same t).
+            if k + 1 < width and cost[k + 1] + 1 < best:
+                best = cost[k + 1] + 1
+                best_start = start[k + 1]
+            # Extra transcript character: same row, column k - 1 (t - 1).
+            if k and new_cost[k - 1] + 1 < best:
+                best = new_cost[k - 1] + 1
+                best_start = new_start[k - 1]
+            new_cost[k] = best
+            new_start[k] = best_start
+        cost, start = new_cost, new_start
+
+    best_k = min(range(width), key=lambda k: cost[k])
+    return cost[best_k], start[best_k], centre + len(needle) + best_k - band
+
+
+def nearest_span(index: NgramIndex, needle: str) -> tuple[int, int, float] | None:
+    """
+    Return (span_start, span_end, similarity) of the closest span to `needle`.
+
+    similarity is 1 - distance / max(len(needle), span length). Returns None if
+    the needle is too short to index or no n-gram is shared with the text.
+    """
+    if len(needle) < index.n:
+        return None
+    band = min(64, max(8, len(needle) // 8))
+    best = None
+    for centre in index.candidates(needle, band):
+        distance, span_start, span_end = banded_alignment(needle, index.text, centre, band)
+        if best is None or distance < best[0]:
+            best = (distance, span_start, span_end)
+    if best is None:
+        return None
+    distance, span_start, span_end = best
+    similarity = 1 - distance / max(len(needle), span_end - span_start, 1)
+    return span_start, span_end, max(similarity, 0.0)
@@ -0,0 +1,446 @@
+"""
+Typed SQLite sidecars for the quote CSVs (quotes.csv, consolidated-quotes.csv).
+
+The CSVs stay the human-facing export; the step that writes one also writes
+<name>.sqlite next to it, row by row as the CSV is written
+(QuoteTableWriter), so the CSV is never parsed again just to build it. In the
+sidecar:
+  quotes        — one row per CSV row, in CSV order. Repetitive columns
+                  (participant_id, tag, ...) hold integer codes;
+                  source_line_start/end hold integers.
+  dict_<column> — (code INTEGER PRIMARY KEY, value) for each coded column;
+                  readers join on it, so decoding happens inside SQLite
+  meta          — version, column order, row count, and the size and mtime
+                  of the CSV the sidecar was written for
+
+An incremental merge that rewrites only some participants' blocks of
+quotes.csv updates the sidecar in place (splice_quote_table) instead of
+writing it again.
+
+A sidecar is only used while the CSV's size and mtime still match, so a CSV
+edited by hand (or rewritten by another step) is read from the CSV instead.
+The readers hide the choice and return the same string values either way.
+
+The sidecar only pays off for readers that want some of the columns. Measured
+on 257k rows (79 MB):
+  every column, as dicts     csv.DictReader 2.9 s   sidecar 2.7 s
+  3 columns, as dicts        csv.DictReader 3.7 s   sidecar 1.1 s
+  3 columns, as tuples       csv.reader     2.1 s   sidecar 0.8 s
+  value counts of one column csv.DictReader 2.5 s   sidecar 0.3 s
+so read_quotes() parses the CSV when every column is wanted, and callers that
+only need a few columns should use read_quote_columns() (tuples) or
+count_quote_values().
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sqlite3
+from collections import Counter
+from contextlib import closing
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+TABLE_VERSION = 1
+SUFFIX = ".sqlite"
+DICTIONARY_COLUMNS = {
+    "participant_id",
+    "transcript_id",
+    "question_ref",
+    "tag",
+    "severity",
+    "sentiment",
+    "consolidated_tag",
+}
+INTEGER_COLUMNS = {"source_line_start", "source_line_end"}
+INSERT_BATCH = 10_000
+
+
+def table_path(csv_path: Path) -> Path:
+    return csv_path.with_suffix(SUFFIX)
+
+
+def _quote_name(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _dict_table(column: str) -> str:
+    return _quote_name(f"dict_{column}")
+
+
+def _store_int(value: str):
+    # Only canonical integers become INTEGER, so str() gives back the CSV text.
+    if value.isdigit() and value.isascii() and (value[0] != "0" or value == "0"):
+        return int(value)
+    return value
+
+
+# ── Writing ──────────────────────────────────────────────────────────────────────
+
+class _RowEncoder:
+    """Turns CSV row dicts into quotes-table rows, coding new values as they appear."""
+
+    def __init__(self, columns: list[str], codes: dict[str, dict[str, int]]):
+        self.columns = columns
+        self.codes = codes
+        # Positions in the inserted row, which starts with the row number.
+        self._coded = [(i + 1, codes[c]) for i, c in enumerate(columns) if c in codes]
+        self._integers = [i + 1 for i, c in enumerate(columns) if c in INTEGER_COLUMNS]
+        self._get = itemgetter(*columns) if len(columns) > 1 else lambda row: (row[columns[0]],)
+        self.insert = (
+            f"INSERT INTO quotes (row, {', '.join(map(_quote_name, columns))}) "
+            f"VALUES (?, {', '.join('?' for _ in columns)})"
+        )
+
+    def encode(self, row_number: int, row: dict) -> list:
+        try:
+            values = [row_number, *self._get(row)]
+        except KeyError:
+            values = [row_number, *(row.get(c) for c in self.columns)]
+        if None in values:
+            values = ["" if v is None else v for v in values]
+        for i, table in self._coded:
+            values[i] = table.setdefault(values[i], len(table))
+        for i in self._integers:
+            values[i] = _store_int(values[i])
+        return values
+
+
+class QuoteTableWriter:
+    """
+    Builds the sidecar for `csv_path` row by row, alongside the CSV. Call
+    commit() once the CSV is in place (its size and mtime are recorded then),
+    or discard() if the CSV is abandoned.
+    """
+
+    def __init__(self, csv_path: Path, columns: list[str]):
+        self.csv_path = csv_path
+        self.columns = list(columns)
+        self.path = table_path(csv_path)
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._tmp_path.unlink(missing_ok=True)
+        self._codes: dict[str, dict[str, int]] = {c: {} for c in self.columns if c in DICTIONARY_COLUMNS}
+        self._encoder = _RowEncoder(self.columns, self._codes)
+        self._insert = self._encoder.insert
+        self._batch: list[list] = []
+        self.count = 0
+
+        self._con = sqlite3.connect(self._tmp_path)
+        self._con.execute("PRAGMA journal_mode = OFF")
+        self._con.execute("PRAGMA synchronous = OFF")
+        self._con.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        for c in self._codes:
+            self._con.execute(f"CREATE TABLE {_dict_table(c)} (code INTEGER PRIMARY KEY, value TEXT NOT NULL)")
+        # Integer columns are declared without a type so SQLite keeps
+        # non-canonical text ("007", "") exactly as given.
+        definitions = ", ".join(
+            _quote_name(c) + (" INTEGER" if c in self._codes else "" if c in INTEGER_COLUMNS else " TEXT")
+            for c in self.columns
+        )
+        self._con.execute(f"CREATE TABLE quotes (row INTEGER PRIMARY KEY, {definitions})")
+
+    def add(self, row: dict) -> None:
+        self._batch.append(self._encoder.encode(self.count, row))
+        self.count += 1
+        if len(self._batch) >= INSERT_BATCH:
+            self._con.executemany(self._insert, self._batch)
+            self._batch = []
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def commit(self) -> Path:
+        try:
+            self._con.executemany(self._insert, self._batch)
+            self._batch = []
+            for c, table in self._codes.items():
+                self._con.executemany(
+                    f"INSERT INTO {_dict_table(c)} VALUES (?, ?)",
+                    ((code, value) for value, code in table.items()),
+                )
+            self._con.executemany("INSERT INTO meta VALUES (?, ?)", _meta_items(self.csv_path, self.columns, self.count))
+            self._con.commit()
+        except BaseException:
+            self.discard()
+            raise
+        self._con.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def discard(self) -> None:
+        self._con.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def _meta_items(csv_path: Path, columns: list[str], count: int) -> list[tuple[str, str]]:
+    st = csv_path.stat()
+    return [
+        ("version", str(TABLE_VERSION)),
+        ("columns", json.dumps(columns)),
+        ("row_count", str(count)),
+        ("source_size_bytes", str(st.st_size)),
+        ("source_mtime_ns", str(st.st_mtime_ns)),
+    ]
+
+
+def write_quote_table(csv_path: Path, columns: list[str], rows: Iterable[dict] | None = None) -> Path:
+    """
+    Write the sidecar for `csv_path`, which must already be written. `rows`
+    are the rows just written to it; if None they are streamed from the CSV.
+    """
+    if rows is None:
+        return _write_from_csv(csv_path, columns)
+    writer = QuoteTableWriter(csv_path, columns)
+    try:
+        writer.add_rows(rows)
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.commit()
+
+
+def _write_from_csv(csv_path: Path, columns: list[str]) -> Path:
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        return write_quote_table(csv_path, columns, csv.DictReader(f))
+
+
+def splice_quote_table(csv_path: Path, columns: list[str], blocks: Iterable[range | list[dict]]) -> Path:
+    """
+    Update the sidecar in place after `csv_path` was rewritten as `blocks`,
+    in order: a range is a run of the sidecar's current row numbers whose
+    rows were copied unchanged, a list holds new rows. The sidecar must have
+    been fresh for the CSV before it was rewritten (see open_quote_table()).
+
+    Runs in one transaction, so a failure leaves the old sidecar, which the
+    readers then see as stale.
+    """
+    sidecar = table_path(csv_path)
+    with closing(sqlite3.connect(sidecar)) as con, con:
+        old_count = int(con.execute("SELECT value FROM meta WHERE key = 'row_count'").fetchone()[0])
+        codes = {
+            c: dict(con.execute(f"SELECT value, code FROM {_dict_table(c)}"))
+            for c in columns
+            if c in DICTIONARY_COLUMNS
+        }
+        known = {c: len(table) for c, table in codes.items()}
+        encoder = _RowEncoder(list(columns), codes)
+
+        # (first, last, shift) for each run of kept rows, in row order.
+        kept: list[tuple[int, int, int]] = []
+        new_rows = []
+        count = 0
+        for block in blocks:
+            if isinstance(block, range):
+                if block:
+                    shift = count - block.start
+                    if kept and kept[-1][1] + 1 == block.start and kept[-1][2] == shift:
+                        kept[-1] = (kept[-1][0], block.stop - 1, shift)
+                    else:
+                        kept.append((block.start, block.stop - 1, shift))
+                count += len(block)
+            else:
+                for row in block:
+                    new_rows.append(encoder.encode(count, row))
+                    count += 1
+
+        # Drop the rows between kept runs, then move each run through negative
+        # row numbers so that no two rows ever share one.
+        start = 0
+        for first, last, _ in [*kept, (old_count, old_count, 0)]:
+            if start < first:
+                con.execute("DELETE FROM quotes WHERE row BETWEEN ? AND ?", (start, first - 1))
+            start = last + 1
+        for first, last, shift in kept:
+            if shift:
+                con.execute("UPDATE quotes SET row = -1 - (row + ?) WHERE row BETWEEN ? AND ?", (shift, first, last))
+        con.execute("UPDATE quotes SET row = -1 - row WHERE row < 0")
+
+        for i in range(0, len(new_rows), INSERT_BATCH):
+            con.executemany(encoder.insert, new_rows[i : i + INSERT_BATCH])
+        for c, table in codes.items():
+            con.executemany(
+                f"INSERT INTO {_dict_table(c)} VALUES (?, ?)",
+                ((code, value) for value, code in table.items() if code >= known[c]),
+            )
+        con.executemany(
+            "UPDATE meta SET value = ? WHERE key = ?",
+            ((value, key) for key, value in _meta_items(csv_path, list(columns), count)),
+        )
+    return sidecar
+
+
+def remove_quote_table(csv_path: Path) -> None:
+    """Delete the sidecar, e.g. when the CSV is rewritten without one."""
+    table_path(csv_path).unlink(missing_ok=True)
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────────
+
+class QuoteTable:
+    """Read access to one sidecar. Use open_quote_table() to get one only if fresh."""
+
+    def __init__(self, sidecar: Path):
+        self.path = sidecar
+        self._con = sqlite3.connect(f"file:{sidecar}?mode=ro", uri=True)
+        try:
+            meta = dict(self._con.execute("SELECT key, value FROM meta"))
+            if int(meta.get("version", 0)) != TABLE_VERSION:
+                raise ValueError(f"Unsupported quote table version: {meta.get('version')}")
+            self.meta = meta
+            self.columns: list[str] = json.loads(meta["columns"])
+        except Exception:
+            self._con.close()
+            raise
+
+    def __len__(self) -> int:
+        return int(self.meta["row_count"])
+
+    def close(self) -> None:
+        self._con.close()
+
+    def is_fresh(self, csv_path: Path) -> bool:
+        """True if `csv_path` is still the file this sidecar was written for."""
+        try:
+            st = csv_path.stat()
+        except OSError:
+            return False
+        return (
+            self.meta.get("source_size_bytes") == str(st.st_size)
+            and self.meta.get("source_mtime_ns") == str(st.st_mtime_ns)
+        )
+
+    def _select(self, columns: list[str], as_text: bool) -> Iterator[tuple]:
+        """Run a SELECT of `columns` in CSV order, with coded columns decoded by join."""
+        unknown = [c for c in columns if c not in self.columns]
+        if unknown:
+            raise KeyError(f"Columns not in quote table: {unknown}")
+        fields, joins = [], []
+        for n, c in enumerate(columns):
+            if c in DICTIONARY_COLUMNS:
+                joins.append(f"JOIN {_dict_table(c)} AS d{n} ON d{n}.code = q.{_quote_name(c)}")
+                fields.append(f"d{n}.value")
+            elif c in INTEGER_COLUMNS and as_text:
+                fields.append(f"CAST(q.{_quote_name(c)} AS TEXT)")
+            else:
+                fields.append(f"q.{_quote_name(c)}")
+        return self._con.execute(f"SELECT {', '.join(fields)} FROM quotes AS q {' '.join(joins)} ORDER BY q.row")
+
+    def tuples(self, columns: Sequence[str]) -> Iterator[tuple]:
+        """
+        Rows as tuples of CSV strings for `columns`, in CSV order. Columns the
+        table does not have are None.
+        """
+        present = [c for c in columns if c in self.columns]
+        if len(present) == len(columns):
+            return self._select(present, as_text=True)
+        where = [present.index(c) if c in self.columns else None for c in columns]
+        return (tuple(None if i is None else values[i] for i in where) for values in self._select(present, as_text=True))
+
+    def rows(self, columns: list[str] | None = None) -> Iterator[dict]:
+        """
+        Rows as {column: CSV string} dicts, in CSV order. Requested columns
+        the table does not have are None, as with csv.DictReader and .get().
+        """
+        columns = list(self.columns if columns is None else columns)
+        present = [c for c in columns if c in self.columns]
+        absent = dict.fromkeys(c for c in columns if c not in self.columns)
+        for values in self._select(present, as_text=True):
+            yield {**dict(zip(present, values)), **absent} if absent else dict(zip(present, values))
+
+    def column(self, column: str) -> list:
+        """
+        One column in CSV order: strings, except integer columns, which hold
+        ints (or the original text where it was not a plain integer).
+        """
+        return [v for (v,) in self._select([column], as_text=False)]
+
+    def value_counts(self, column: str) -> Counter:
+        """Row count per value of a coded column, counted in SQLite."""
+        if column not in DICTIONARY_COLUMNS or column not in self.columns:
+            raise KeyError(f"{column} is not a dictionary-encoded column of this table")
+        return Counter(
+            dict(
+                self._con.execute(
+                    f"SELECT d.value, COUNT(*) FROM quotes AS q "
+                    f"JOIN {_dict_table(column)} AS d ON d.code = q.{_quote_name(column)} GROUP BY d.code"
+                )
+            )
+        )
+
+
+def open_quote_table(csv_path: Path) -> QuoteTable | None:
+    """Return the sidecar for `csv_path` if it exists and is fresh, else None."""
+    sidecar = table_path(csv_path)
+    if not sidecar.exists():
+        return None
+    try:
+        table = QuoteTable(sidecar)
+    except (sqlite3.Error, ValueError, KeyError):
+        return None
+    if not table.is_fresh(csv_path):
+        table.close()
+        return None
+    return table
+
+
+def read_quotes(csv_path: Path, columns: list[str] | None = None) -> tuple[list[str], Iterator[dict]]:
+    """
+    Return (fieldnames, rows) for a quote CSV. Rows hold every column, parsed
+    from the CSV, or only `columns`, from the sidecar when it is fresh. Rows
+    are produced lazily, so callers can stream them.
+    """
+    table = open_quote_table(csv_path) if columns is not None else None
+    if table is not None:
+
+        def table_rows() -> Iterator[dict]:
+            # The connection closes once the rows are exhausted (or the generator is closed).
+            with closing(table):
+                yield from table.rows(columns)
+
+        return list(table.columns), table_rows()
+
+    f = open(csv_path, newline="", encoding="utf-8")
+    reader = csv.DictReader(f)
+    fieldnames = list(reader.fieldnames or [])
+
+    def rows() -> Iterator[dict]:
+        with f:
+            for row in reader:
+                yield row if columns is None else {c: row.get(c) for c in columns}
+
+    return fieldnames, rows()
+
+
+def read_quote_columns(csv_path: Path, columns: Sequence[str]) -> Iterator[tuple]:
+    """
+    Rows of a quote CSV as tuples of `columns` (None where the CSV has no such
+    column): from the sidecar when fresh, otherwise by parsing the CSV.
+    """
+    table = open_quote_table(csv_path)
+    if table is not None:
+        with closing(table):
+            yield from table.tuples(columns)
+        return
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        where = [header.index(c) if c in header else None for c in columns]
+        width = len(header)
+        for values in reader:
+            if len(values) < width:
+                values += [None] * (width - len(values))
+            yield tuple(None if i is None else values[i] for i in where)
+
+
+def count_quote_values(csv_path: Path, column: str) -> Counter:
+    """Row count per value of `column`: counted in SQLite when the sidecar is fresh."""
+    table = open_quote_table(csv_path)
+    if table is not None:
+        with closing(table):
+            if column in DICTIONARY_COLUMNS and column in table.columns:
+                return table.value_counts(column)
+    return Counter(value for (value,) in read_quote_columns(csv_path, [column]))
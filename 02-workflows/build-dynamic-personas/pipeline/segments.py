@@ -0,0 +1,159 @@
+"""
+Question and speaker-turn segmentation of interview transcripts.
+
+Transcripts open each question with a `*Qn*` line and each turn with a
+`MODERATOR:` or `PARTICIPANT:` prefix; unlabelled lines continue the current
+turn. segment_transcript() walks the lines once and records the span of every
+question block and every participant turn, in the same character coordinates
+as normalise_transcript() and with original line numbers.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import NamedTuple
+
+from .transcripts import norm_text
+
+QUESTION_HEADER = re.compile(r"^\*(Q\d+)\*$")
+SPEAKER_LABEL = re.compile(r"^(MODERATOR|PARTICIPANT):\s*")
+# The same markers on raw bytes, for counting without decoding or normalising.
+# Anchored on the preceding newline rather than ^ with re.MULTILINE, which
+# makes the regex engine try every position and is several times slower.
+QUESTION_HEADER_BYTES = re.compile(rb"\n[ \t]*\*Q\d+\*[ \t]*\r?(?=\n|\Z)")
+PARTICIPANT_LABEL_BYTES = re.compile(rb"\n[ \t]*PARTICIPANT:")
+# Quotes may cite follow-ups (Q9b); transcripts only head the base question (Q9).
+QUESTION_REF = re.compile(r"^(Q\d+)[a-z]?$", re.IGNORECASE)
+
+
+class Span(NamedTuple):
+    question_ref: str  # "" for text before the first question header
+    start: int         # character offsets into the normalised text, end exclusive
+    end: int
+    line_start: int
+    line_end: int
+
+
+def base_question_ref(question_ref: str) -> str:
+    """Map a cited question_ref to the transcript header it belongs to ('q9b' → 'Q9')."""
+    m = QUESTION_REF.match(question_ref.strip())
+    return m.group(1).upper() if m else question_ref.strip()
+
+
+class Segments:
+    """Question blocks and participant turns of one transcript."""
+
+    def __init__(self, questions: list[Span], turns: list[Span]):
+        self.questions = questions
+        self.turns = turns
+        self._by_ref: dict[str, Span] = {}
+        for q in questions:
+            self._by_ref.setdefault(q.question_ref, q)
+        self._turns_by_ref: dict[str, list[Span]] = {}
+        for t in turns:
+            self._turns_by_ref.setdefault(t.question_ref, []).append(t)
+        self._turn_starts = [t.start for t in turns]
+
+    def question(self, question_ref: str) -> Span | None:
+        """Return the block for a cited question_ref (first one if the header repeats)."""
+        return self._by_ref.get(base_question_ref(question_ref))
+
+    def question_turns(self, question_ref: str) -> list[Span]:
+        """Return the participant turns under a cited question_ref's header(s), in order."""
+        return self._turns_by_ref.get(base_question_ref(question_ref), [])
+
+    def turn_at(self, start: int, end: int) -> Span | None:
+        """Return the participant turn containing [start, end), or None."""
+        i = bisect_right(self._turn_starts, start) - 1
+        if i >= 0 and end <= self.turns[i].end:
+            return self.turns[i]
+        return None
+
+    def check_question_ref(self, question_ref: str, spans: list[tuple[int, int]]) -> str:
+        """
+        Classify where a matched quote sits relative to its cited question.
+
+        `spans` are the (start, end) of the matched quote or of each ellipsis
+        segment. Returns:
+          'ok'                — every span is in a participant turn of the cited question
+          'moderator_text'    — some span lies outside participant turns
+          'unknown_question'  — the cited question has no block in this transcript
+          'other_question:Qn' — participant turns of other question(s), comma-separated
+          ''                  — no spans, or the transcript has no question headers
+        """
+        if not spans or not self.questions:
+            return ""
+        turns = [self.turn_at(start, end) for start, end in spans]
+        if any(t is None for t in turns):
+            return "moderator_text"
+        if self.question(question_ref) is None:
+            return "unknown_question"
+        cited = base_question_ref(question_ref)
+        others = sorted({t.question_ref for t in turns if t.question_ref != cited})
+        if others:
+            return "other_question:" + ",".join(others)
+        return "ok"
+
+    def to_json(self) -> dict[str, list[list]]:
+        return {"questions": [list(q) for q in self.questions], "turns": [list(t) for t in self.turns]}
+
+    @classmethod
+    def from_json(cls, data: dict[str, list[list]]) -> "Segments":
+        return cls([Span(*q) for q in data["questions"]], [Span(*t) for t in data["turns"]])
+
+
+def count_segments(data: bytes) -> tuple[int, int]:
+    """Return (question headers, participant turns) in raw transcript bytes."""
+    data = b"\n" + data
+    return len(QUESTION_HEADER_BYTES.findall(data)), len(PARTICIPANT_LABEL_BYTES.findall(data))
+
+
+def segment_transcript(text: str) -> Segments:
+    """
+    Segment raw transcript text in one pass over its lines.
+
+    Question blocks run from their `*Qn*` header to the line before the next
+    header. Participant turns start after the `PARTICIPANT:` label and run to
+    the line before the next label or header.
+    """
+    questions: list[Span] = []
+    turns: list[Span] = []
+    question: list | None = None
+    turn: list | None = None
+    pos = 0
+    first = True
+
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        norm = norm_text(line)
+        if not norm:
+            continue
+        # Mirror normalise_transcript(): lines are joined with single spaces.
+        start = pos if first else pos + 1
+        end = start + len(norm)
+        pos = end
+        first = False
+
+        header = QUESTION_HEADER.match(norm)
+        speaker = SPEAKER_LABEL.match(norm)
+        if header or speaker:
+            if turn is not None:
+                turns.append(Span(*turn))
+                turn = None
+        if header:
+            if question is not None:
+                questions.append(Span(*question))
+            question = [header.group(1), start, end, lineno, lineno]
+            continue
+        if speaker and speaker.group(1) == "PARTICIPANT":
+            turn = [question[0] if question else "", start + speaker.end(), end, lineno, lineno]
+        elif turn is not None:
+            turn[2], turn[4] = end, lineno
+        if question is not None:
+            question[2], question[4] = end, lineno
+
+    if turn is not None:
+        turns.append(Span(*turn))
+    if question is not None:
+        questions.append(Span(*question))
+    return Segments(questions, turns)
@@ -0,0 +1,188 @@
+"""
+Offline clustering of quote tags for the Phase 4 mapping proposal.
+
+Each distinct tag gets three sparse TF-IDF vectors, each unit-normalised:
+  name          — character 3-5-grams of the tag itself, so "Trust In AI"
+                  and "AI Trust Level" land close together
+  participants  — which participants used the tag (tags that the same people
+                  use tend to describe the same attitude)
+  quotes        — the words of the quotes filed under the tag
+Tag similarity is a weighted sum of the three cosines. Each block's cosines
+come from an inverted index (feature → tags), so only tags that share a
+feature are ever multiplied; features used by more than MAX_DF of the tags
+are dropped, which removes stop words and the ubiquitous " ai" n-gram and
+keeps the index cheap.
+
+cluster() is average-linkage agglomerative clustering with a row cap: it keeps
+each cluster's best allowed neighbour and repeatedly merges the most similar
+pair whose combined quote rows stay within the cap, updating similarities
+with the Lance-Williams rule, until the target number of clusters remains.
+member_similarity() then gives each member's mean similarity to the rest of
+its cluster, so loosely attached members stand out for review.
+Everything is stdlib; ~900 tags cluster in about a second.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Iterable
+
+NAME_NGRAMS = (3, 4, 5)
+MAX_DF = 0.5
+MAX_QUOTE_TERMS = 50
+BLOCK_WEIGHTS = {"name": 0.5, "participants": 0.2, "quotes": 0.3}
+
+_WORD = re.compile(r"[a-z][a-z']{2,}")
+
+Vector = dict[str, float]
+
+
+# ── Features ─────────────────────────────────────────────────────────────────────
+
+def name_terms(tag: str) -> Counter:
+    text = f" {' '.join(tag.lower().split())} "
+    return Counter(text[i : i + n] for n in NAME_NGRAMS for i in range(len(text) - n + 1))
+
+
+def quote_terms(quotes: Iterable[str]) -> Counter:
+    return Counter(w for q in quotes for w in _WORD.findall(q.lower()))
+
+
+def tfidf(docs: list[Counter], max_terms: int | None = None) -> list[Vector]:
+    """
+    Sublinear TF-IDF, unit-normalised. Terms in more than MAX_DF of the docs
+    are dropped (unless there are too few docs for that to mean anything);
+    `max_terms` keeps only each doc's heaviest terms.
+    """
+    n = len(docs)
+    df = Counter(term for doc in docs for term in doc)
+    limit = MAX_DF * n if n >= 10 else n
+    idf = {term: math.log(n / d) + 1.0 for term, d in df.items() if d <= limit}
+    vectors = []
+    for doc in docs:
+        vec = {t: (1.0 + math.log(c)) * idf[t] for t, c in doc.items() if t in idf}
+        if max_terms is not None and len(vec) > max_terms:
+            vec = dict(sorted(vec.items(), key=lambda kv: (-kv[1], kv[0]))[:max_terms])
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        vectors.append({t: w / norm for t, w in vec.items()} if norm else {})
+    return vectors
+
+
+def tag_similarity(
+    tags: list[str],
+    participants: list[Counter],
+    quotes: list[list[str]],
+    weights: dict[str, float] = BLOCK_WEIGHTS,
+) -> list[list[float]]:
+    """Dense tag × tag similarity matrix from the three feature blocks."""
+    n = len(tags)
+    sim = [[0.0] * n for _ in range(n)]
+    blocks = [
+        ("name", [name_terms(t) for t in tags], None),
+        ("participants", participants, None),
+        ("quotes", [quote_terms(q) for q in quotes], MAX_QUOTE_TERMS),
+    ]
+    for block, docs, max_terms in blocks:
+        # Accumulate each block into the upper triangle, then mirror once.
+        postings: dict[str, list[tuple[int, float]]] = {}
+        for i, vec in enumerate(tfidf(docs, max_terms)):
+            for term, w in vec.items():
+                postings.setdefault(term, []).append((i, w))
+        weight = weights[block]
+        for entries in postings.values():
+            for a in range(len(entries)):
+                i, wi = entries[a]
+                row = sim[i]
+                wi *= weight
+                for j, wj in entries[a + 1 :]:
+                    row[j] += wi * wj
+    for i in range(n):
+        row = sim[i]
+        for j in range(i + 1, n):
+            sim[j][i] = row[j]
+    return sim
+
+
+# ── Clustering ───────────────────────────────────────────────────────────────────
+
+def cluster(sim: list[list[float]], rows: list[int], target: int, max_rows: int) -> list[list[int]]:
+    """
+    Average-linkage agglomeration of items 0..n-1 down to `target` clusters,
+    never merging two clusters whose `rows` sum above `max_rows`. Returns the
+    clusters as sorted member lists, largest first; fewer merges happen if no
+    allowed pair is left.
+    """
+    sim = [row[:] for row in sim]
+    n = len(sim)
+    for i in range(n):
+        sim[i][i] = -math.inf
+    active = list(range(n))
+    members = {i: [i] for i in range(n)}
+    size = [1] * n
+    load = list(rows)
+    best_sim = [0.0] * n
+    best_to = [-1] * n
+    heaviest = max(load, default=0)
+
+    def nearest(i: int) -> None:
+        row = sim[i]
+        if load[i] + heaviest <= max_rows:
+            j = max(active, key=row.__getitem__)
+        else:
+            allowed = [k for k in active if load[i] + load[k] <= max_rows and k != i]
+            j = max(allowed, key=row.__getitem__) if allowed else -1
+        if j < 0 or j == i:
+            best_sim[i], best_to[i] = -math.inf, -1
+        else:
+            best_sim[i], best_to[i] = row[j], j
+
+    for i in active:
+        nearest(i)
+
+    while len(active) > target:
+        i = max(active, key=best_sim.__getitem__)
+        j = best_to[i]
+        if j < 0:
+            break
+        # Merge j into i (Lance-Williams update for average linkage).
+        ni, nj = size[i], size[j]
+        ri = [(ni * a + nj * b) / (ni + nj) for a, b in zip(sim[i], sim[j])]
+        ri[i] = -math.inf
+        sim[i] = ri
+        active.remove(j)
+        for k in active:
+            sim[k][i] = ri[k]
+        members[i].extend(members.pop(j))
+        size[i] += nj
+        load[i] += load[j]
+        heaviest = max(heaviest, load[i])
+        nearest(i)
+        for k in active:
+            if k == i:
+                continue
+            if best_to[k] in (i, j):
+                nearest(k)
+            elif ri[k] > best_sim[k] and load[k] + load[i] <= max_rows:
+                best_sim[k], best_to[k] = ri[k], i
+
+    return sorted((sorted(m) for m in members.values()), key=lambda m: (-len(m), m[0]))
+
+
+def by_centrality(group: list[int], sim: list[list[float]], weights: list[int]) -> list[int]:
+    """Members of `group`, most central first: weighted similarity to the rest."""
+    def centrality(i: int) -> float:
+        return sum(sim[i][j] * weights[j] for j in group if j != i) + weights[i] * 1e-9
+
+    return sorted(group, key=lambda i: (-centrality(i), i))
+
+
+def member_similarity(group: list[int], sim: list[list[float]]) -> dict[int, float]:
+    """
+    Each member's mean similarity to the other members of `group`; empty for a
+    single-tag group. Their average is the group's mean internal similarity.
+    """
+    if len(group) < 2:
+        return {}
+    return {i: sum(sim[i][j] for j in group if j != i) / (len(group) - 1) for i in group}
@@ -0,0 +1,153 @@
+"""
+Phase 4 tag-mapping limits, and a mapping state that keeps them current
+under edits.
+
+The limits are the ones run-tag-consolidation.py and
+verify-tag-consolidation.py enforce: 35-45 consolidated tags, at most 35% of
+original tags passed through unchanged, no consolidated tag over 20% of quote
+rows, and catch-all style tags ("general", "misc", ...) under 15% of rows.
+
+MappingState loads the per-tag quote counts once and keeps live counters for
+each limit: rows per consolidated tag, the originals behind each, the
+unchanged-tag count and the catch-all row count, plus a lazy max-heap for the
+dominant tag. Moving one original tag costs O(log n); renaming or merging
+consolidated tags costs O(originals moved), so checks() stays instant however
+many edits an analyst makes.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+
+CONSOLIDATED_COUNT_MIN = 35
+CONSOLIDATED_COUNT_MAX = 45
+MAX_UNCHANGED_TAG_RATIO = 0.35
+MAX_CATCH_ALL_ROW_RATIO = 0.15
+MAX_DOMINANT_CONSOLIDATED_ROW_RATIO = 0.20
+# Keep this conservative to avoid false positives on legitimate tags.
+CATCH_ALL_MARKERS = ("general", "misc", "miscellaneous", "various", "catch-all")
+
+
+def is_catch_all(consolidated_tag: str) -> bool:
+    name = consolidated_tag.strip().lower()
+    return any(marker in name for marker in CATCH_ALL_MARKERS)
+
+
+def is_unchanged(original_tag: str, consolidated_tag: str) -> bool:
+    return consolidated_tag.strip().lower() == original_tag.strip().lower()
+
+
+class MappingState:
+    """An original → consolidated tag mapping with live constraint counters."""
+
+    def __init__(self, tag_counts: Counter, mapping: dict[str, str]):
+        missing = sorted(t for t in tag_counts if t not in mapping)
+        if missing:
+            raise KeyError(f"{len(missing)} original tag(s) missing from mapping: " + ", ".join(missing[:20]))
+        self.tag_counts = Counter(tag_counts)
+        self.total_rows = sum(self.tag_counts.values())
+        self.mapping: dict[str, str] = {}
+        self.rows: Counter = Counter()
+        self.members: dict[str, set[str]] = {}
+        self.unchanged = 0
+        self.catch_all_rows = 0
+        self._heap: list[tuple[int, str]] = []
+        for tag in sorted(self.tag_counts):
+            self._attach(tag, mapping[tag])
+
+    # ── Edits ───────────────────────────────────────────────────────────────────
+
+    def _attach(self, original: str, consolidated: str) -> None:
+        count = self.tag_counts[original]
+        self.mapping[original] = consolidated
+        self.members.setdefault(consolidated, set()).add(original)
+        self.rows[consolidated] += count
+        heapq.heappush(self._heap, (-self.rows[consolidated], consolidated))
+        if is_unchanged(original, consolidated):
+            self.unchanged += 1
+        if is_catch_all(consolidated):
+            self.catch_all_rows += count
+
+    def _detach(self, original: str) -> str:
+        consolidated = self.mapping.pop(original)
+        count = self.tag_counts[original]
+        group = self.members[consolidated]
+        group.discard(original)
+        self.rows[consolidated] -= count
+        if group:
+            heapq.heappush(self._heap, (-self.rows[consolidated], consolidated))
+        else:
+            del self.members[consolidated]
+            del self.rows[consolidated]
+        if is_unchanged(original, consolidated):
+            self.unchanged -= 1
+        if is_catch_all(consolidated):
+            self.catch_all_rows -= count
+        return consolidated
+
+    def move(self, original: str, consolidated: str) -> str:
+        """Map one original tag to `consolidated`; returns its previous consolidated tag."""
+        if original not in self.mapping:
+            raise KeyError(f"Unknown original tag: {original}")
+        previous = self._detach(original)
+        self._attach(original, consolidated)
+        return previous
+
+    def rename(self, old: str, new: str) -> list[tuple[str, str]]:
+        """
+        Move every original under `old` to `new` (a rename, or a merge if `new`
+        exists). Returns the (original, previous) moves, for undo.
+        """
+        if old not in self.members:
+            raise KeyError(f"Unknown consolidated tag: {old}")
+        return [(original, self.move(original, new)) for original in sorted(self.members[old])]
+
+    # ── Metrics ─────────────────────────────────────────────────────────────────
+
+    def dominant(self) -> tuple[str, int]:
+        """The consolidated tag with most rows (ties: first by name)."""
+        if len(self._heap) > 4 * len(self.rows) + 64:
+            # Drop the stale entries left behind by edits.
+            self._heap = [(-rows, name) for name, rows in self.rows.items()]
+            heapq.heapify(self._heap)
+        while self._heap:
+            neg_rows, name = self._heap[0]
+            if self.rows.get(name) == -neg_rows:
+                return name, -neg_rows
+            heapq.heappop(self._heap)
+        return "", 0
+
+    def checks(self) -> list[tuple[str, bool, str]]:
+        """(constraint, passed, detail) for every limit, in enforcement order."""
+        n_originals = len(self.tag_counts)
+        unchanged_ratio = self.unchanged / n_originals if n_originals else 0.0
+        dominant_tag, dominant_rows = self.dominant()
+        dominant_ratio = dominant_rows / self.total_rows if self.total_rows else 0.0
+        catch_all_ratio = self.catch_all_rows / self.total_rows if self.total_rows else 0.0
+        unique = len(self.rows)
+        return [
+            (
+                "unchanged tags",
+                unchanged_ratio <= MAX_UNCHANGED_TAG_RATIO,
+                f"{unchanged_ratio:.1%} ({self.unchanged}/{n_originals}), limit {MAX_UNCHANGED_TAG_RATIO:.0%}",
+            ),
+            (
+                "dominant tag",
+                dominant_ratio <= MAX_DOMINANT_CONSOLIDATED_ROW_RATIO,
+                f"'{dominant_tag}' {dominant_ratio:.1%} of rows, limit {MAX_DOMINANT_CONSOLIDATED_ROW_RATIO:.0%}",
+            ),
+            (
+                "catch-all rows",
+                catch_all_ratio <= MAX_CATCH_ALL_ROW_RATIO,
+                f"{catch_all_ratio:.1%} of rows, limit {MAX_CATCH_ALL_ROW_RATIO:.0%}",
+            ),
+            (
+                "consolidated count",
+                CONSOLIDATED_COUNT_MIN <= unique <= CONSOLIDATED_COUNT_MAX,
+                f"{unique}, expected {CONSOLIDATED_COUNT_MIN}-{CONSOLIDATED_COUNT_MAX}",
+            ),
+        ]
+
+    def failures(self) -> list[str]:
+        return [f"{name}: {detail}" for name, passed, detail in self.checks() if not passed]
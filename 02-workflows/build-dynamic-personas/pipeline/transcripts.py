@@ -0,0 +1,262 @@
+"""
+Transcript normalisation and the persisted normalised-transcript store.
+
+Normalisation (curly quotes to ASCII, whitespace collapsed, blank lines
+dropped) is shared by every phase that compares quotes with transcripts.
+build-transcript-store.py writes the normalised text, its lowercased form and
+the line-offset table for every manifest entry into one binary file; readers
+mmap it and slice records out without copying. The question/turn segments
+(pipeline.segments) are kept alongside in the JSON index.
+
+The zero-copy part stops at the bytes: StoredTranscript.text and .lower decode
+a fresh str from the mmap on every access, so callers should read each once
+and keep it. What the store saves is re-reading, re-hashing and
+re-normalising the source file, not that decode.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from .segments import Segments
+
+ROOT = Path(__file__).resolve().parents[3]
+STORE_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "transcript-store"
+STORE_DATA_NAME = "transcripts.bin"
+STORE_INDEX_NAME = "index.json"
+STORE_VERSION = 2
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+# ── Text normalisation ───────────────────────────────────────────────────────────
+
+def norm_quotes(text: str) -> str:
+    """Normalise Unicode curly quotes/apostrophes to ASCII equivalents."""
+    return (
+        text
+        .replace("‘", "'")   # LEFT SINGLE QUOTATION MARK
+        .replace("’", "'")   # RIGHT SINGLE QUOTATION MARK
+        .replace("“", '"')   # LEFT DOUBLE QUOTATION MARK
+        .replace("”", '"')   # RIGHT DOUBLE QUOTATION MARK
+        .replace("′", "'")   # PRIME (sometimes used as apostrophe)
+    )
+
+
+def norm_text(text: str) -> str:
+    """Apply norm_quotes() and collapse all whitespace to single spaces."""
+    return _WHITESPACE.sub(" ", norm_quotes(text)).strip()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# ── Transcript loading ───────────────────────────────────────────────────────────
+
+class LineIndex:
+    """
+    Compact map from positions in a normalised transcript to original line numbers.
+
+    Stores one (start offset, line number) pair per non-blank source line in
+    typed arrays, so memory scales with line count rather than character count.
+    Lookups use bisect over the start offsets. The arrays may also be int64
+    memoryviews over the transcript store.
+    """
+
+    def __init__(
+        self,
+        starts: Sequence[int] | None = None,
+        linenos: Sequence[int] | None = None,
+    ) -> None:
+        self.starts = starts if starts is not None else array("q")
+        self.linenos = linenos if linenos is not None else array("q")
+
+    def add(self, start: int, lineno: int) -> None:
+        self.starts.append(start)
+        self.linenos.append(lineno)
+
+    def line_at(self, pos: int) -> int:
+        """Return the 1-based original line number for position `pos`."""
+        return self.linenos[bisect_right(self.starts, pos) - 1]
+
+
+def normalise_transcript(text: str) -> tuple[str, LineIndex]:
+    """
+    Normalise raw transcript text and return (norm_text, line_index).
+
+    norm_text   — full text with all whitespace collapsed to single spaces.
+    line_index  — LineIndex mapping each position in norm_text to its 1-based
+                  original line number.
+    """
+    lines = text.splitlines()
+    parts: list[str] = []
+    line_index = LineIndex()
+    pos = 0
+
+    for lineno, line in enumerate(lines, start=1):
+        norm = norm_text(line)
+        if not norm:
+            continue
+        # separator space between parts maps to this (next) line
+        line_index.add(pos, lineno)
+        pos += len(norm) + (1 if parts else 0)
+        parts.append(norm)
+
+    return " ".join(parts), line_index
+
+
+def load_transcript(path: Path) -> tuple[str, LineIndex]:
+    """Read a transcript file and return (norm_text, line_index)."""
+    return normalise_transcript(path.read_text(encoding="utf-8"))
+
+
+# ── Transcript store ─────────────────────────────────────────────────────────────
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def build_store(transcripts: list[dict], store_dir: Path = STORE_DIR) -> dict[str, dict]:
+    """
+    Write the store for manifest `transcripts` entries and return the index entries.
+
+    Each record holds the normalised UTF-8 text, its lowercased form and the
+    LineIndex arrays as int64, all 8-byte aligned. The index is keyed by
+    participant_id and records the source file's content hash, size and mtime
+    so readers can tell whether a record is still current, plus the
+    transcript's question/turn segments.
+    """
+    from .segments import segment_transcript  # segments imports this module
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    data_path = store_dir / STORE_DATA_NAME
+    index_path = store_dir / STORE_INDEX_NAME
+    tmp_data = data_path.with_name(data_path.name + ".tmp")
+    tmp_index = index_path.with_name(index_path.name + ".tmp")
+
+    entries: dict[str, dict] = {}
+    offset = 0
+    with open(tmp_data, "wb") as out:
+
+        def put(blob: bytes) -> list[int]:
+            nonlocal offset
+            start = offset
+            out.write(blob)
+            padding = _align(len(blob)) - len(blob)
+            out.write(b"\0" * padding)
+            offset += len(blob) + padding
+            return [start, len(blob)]
+
+        for t in transcripts:
+            source = ROOT / t["path"]
+            stat = source.stat()
+            raw = source.read_bytes()
+            decoded = raw.decode("utf-8")
+            text, line_index = normalise_transcript(decoded)
+            entries[t["participant_id"]] = {
+                "id": t["id"],
+                "path": t["path"],
+                "source_hash": content_hash(raw),
+                "source_size": stat.st_size,
+                "source_mtime_ns": stat.st_mtime_ns,
+                "text_length": len(text),
+                "text": put(text.encode("utf-8")),
+                "lower": put(text.lower().encode("utf-8")),
+                "line_starts": put(line_index.starts.tobytes()),
+                "line_numbers": put(line_index.linenos.tobytes()),
+                "segments": segment_transcript(decoded).to_json(),
+            }
+
+    tmp_index.write_text(
+        json.dumps({"version": STORE_VERSION, "transcripts": entries}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    os.replace(tmp_data, data_path)
+    os.replace(tmp_index, index_path)
+    return entries
+
+
+class StoredTranscript:
+    """One transcript record; byte fields are zero-copy views into the mmap."""
+
+    def __init__(self, participant_id: str, meta: dict, buf: memoryview):
+        self.participant_id = participant_id
+        self.meta = meta
+        self.source_hash: str = meta["source_hash"]
+
+        def view(key: str) -> memoryview:
+            start, length = meta[key]
+            return buf[start : start + length]
+
+        self.text_bytes = view("text")
+        self.lower_bytes = view("lower")
+        self.line_index = LineIndex(view("line_starts").cast("q"), view("line_numbers").cast("q"))
+
+    @property
+    def text(self) -> str:
+        # Decodes a new str on each access; see the module docstring.
+        return str(self.text_bytes, "utf-8")
+
+    @property
+    def lower(self) -> str:
+        return str(self.lower_bytes, "utf-8")
+
+    @property
+    def segments(self) -> Segments:
+        from .segments import Segments
+
+        return Segments.from_json(self.meta["segments"])
+
+    def is_current(self, path: Path | None = None) -> bool:
+        """True if the source file still has the size and mtime it had when stored."""
+        stat = (path or ROOT / self.meta["path"]).stat()
+        return stat.st_size == self.meta["source_size"] and stat.st_mtime_ns == self.meta["source_mtime_ns"]
+
+
+class TranscriptStore:
+    def __init__(self, store_dir: Path = STORE_DIR):
+        payload = json.loads((store_dir / STORE_INDEX_NAME).read_text(encoding="utf-8"))
+        if payload.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported transcript store version: {payload.get('version')}")
+        self.entries: dict[str, dict] = payload["transcripts"]
+        data_path = store_dir / STORE_DATA_NAME
+        if data_path.stat().st_size:
+            with open(data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buf = memoryview(self._mmap)
+        else:
+            self._buf = memoryview(b"")
+
+    def __contains__(self, participant_id: str) -> bool:
+        return participant_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, participant_id: str) -> StoredTranscript | None:
+        meta = self.entries.get(participant_id)
+        if meta is None:
+            return None
+        return StoredTranscript(participant_id, meta, self._buf)
+
+
+@lru_cache(maxsize=None)
+def open_store(store_dir: Path = STORE_DIR) -> TranscriptStore | None:
+    """Open (once per process) the transcript store, or return None if it has not been built."""
+    if not (store_dir / STORE_INDEX_NAME).exists() or not (store_dir / STORE_DATA_NAME).exists():
+        return None
+    try:
+        return TranscriptStore(store_dir)
+    except (OSError, ValueError, KeyError):
+        return None
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Phase 1 / Phase 3: Plan Batches
+Splits the manifest's participants into size-balanced batches, one per
+concurrent sub-agent worker, so a few long transcripts do not set the finish
+time of the whole fan-out.
+
+Each participant gets a weight — the work its sub-agent will do:
+  extraction      — the transcript's estimated_tokens from the manifest profile
+                    (falls back to size_bytes / 4 for manifests without profiles)
+  contradictions  — estimated tokens of the participant's quotes in quotes.csv
+                    (falls back to the transcript estimate if quotes.csv is absent)
+
+Batches are packed with longest-processing-time (LPT) scheduling: participants
+are taken heaviest first and each goes to the batch with the smallest total so
+far. LPT's makespan is within 4/3 of optimal. Within a batch, participants are
+listed heaviest first.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/plan-batches.py --workers 8
+    python3 02-workflows/build-dynamic-personas/plan-batches.py --phase contradictions --workers 8
+
+Writes:
+    extraction      → 04-process/build-dynamic-personas/p1-quote-extraction/batch-plan.json
+    contradictions  → 04-process/build-dynamic-personas/p3-check-contradictions/batch-plan.json
+
+Exit codes:
+    0 — PASS
+    1 — FAIL (manifest or quotes missing/unreadable)
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import math
+import sys
+from pathlib import Path
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.manifest import open_manifest  # noqa: E402
+
+PROCESS_DIR = ROOT / "04-process" / "build-dynamic-personas"
+MANIFEST_PATH = PROCESS_DIR / "p0-prepare" / "manifest.json"
+QUOTES_PATH = PROCESS_DIR / "p1-quote-extraction" / "quotes.csv"
+PLAN_PATHS = {
+    "extraction": PROCESS_DIR / "p1-quote-extraction" / "batch-plan.json",
+    "contradictions": PROCESS_DIR / "p3-check-contradictions" / "batch-plan.json",
+}
+
+# Same ratio prepare.py uses for the manifest profile.
+CHARS_PER_TOKEN = 4
+DEFAULT_WORKERS = 8
+
+
+# ── Weights ─────────────────────────────────────────────────────────────────────
+
+def transcript_tokens(t: dict) -> int:
+    profile = t.get("profile")
+    if profile and "estimated_tokens" in profile:
+        return profile["estimated_tokens"]
+    return math.ceil(t.get("size_bytes", 0) / CHARS_PER_TOKEN)
+
+
+def quote_tokens(quotes_path: Path) -> dict[str, int]:
+    """Estimated tokens of each participant's quotes in quotes.csv."""
+    chars: dict[str, int] = {}
+    with open(quotes_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            pid = row["participant_id"]
+            chars[pid] = chars.get(pid, 0) + len(row.get("quote") or "")
+    return {pid: math.ceil(n / CHARS_PER_TOKEN) for pid, n in chars.items()}
+
+
+# ── Scheduling ──────────────────────────────────────────────────────────────────
+
+def lpt_batches(items: list[dict], workers: int) -> list[list[dict]]:
+    """
+    Longest-processing-time packing of `items` (each with a "weight") into at
+    most `workers` batches. Ties are broken on manifest order, so the plan is
+    deterministic.
+    """
+    n_batches = max(1, min(workers, len(items)))
+    batches: list[list[dict]] = [[] for _ in range(n_batches)]
+    heap = [(0, b) for b in range(n_batches)]
+    order = sorted(range(len(items)), key=lambda i: (-items[i]["weight"], i))
+    for i in order:
+        load, b = heapq.heappop(heap)
+        batches[b].append(items[i])
+        heapq.heappush(heap, (load + items[i]["weight"], b))
+    return batches
+
+
+def manifest_order_makespan(items: list[dict], workers: int) -> int:
+    """Finish time when items start in manifest order, each on the next free worker."""
+    free = [0] * max(1, min(workers, len(items)))
+    for item in items:
+        heapq.heappush(free, heapq.heappop(free) + item["weight"])
+    return max(free)
+
+
+# ── Main ────────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--phase",
+        choices=sorted(PLAN_PATHS),
+        default="extraction",
+        help="Which fan-out to plan (default: extraction)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of sub-agents run concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument("--output", type=Path, help="Plan file to write (default: the phase's batch-plan.json)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be a positive integer")
+    plan_path = args.output or PLAN_PATHS[args.phase]
+
+    warnings = []
+
+    # ── Load inputs ─────────────────────────────────────────────────────────────
+
+    if not MANIFEST_PATH.exists():
+        print(f"FAIL  Manifest not found: {MANIFEST_PATH.relative_to(ROOT)} — run prepare.py first")
+        sys.exit(1)
+    try:
+        transcripts = list(open_manifest(MANIFEST_PATH).transcripts())
+    except (OSError, ValueError, KeyError) as e:
+        print(f"FAIL  Could not read manifest: {e}")
+        sys.exit(1)
+
+    missing_profiles = sum(1 for t in transcripts if "estimated_tokens" not in (t.get("profile") or {}))
+    if missing_profiles:
+        warnings.append(
+            f"{missing_profiles} manifest entries have no profile; weighted by size_bytes "
+            f"(re-run prepare.py to record token estimates)"
+        )
+
+    if args.phase == "contradictions":
+        if QUOTES_PATH.exists():
+            try:
+                by_pid = quote_tokens(QUOTES_PATH)
+            except (OSError, KeyError, csv.Error) as e:
+                print(f"FAIL  Could not read {QUOTES_PATH.relative_to(ROOT)}: {e}")
+                sys.exit(1)
+            weight_source = "quote tokens (quotes.csv)"
+            weights = [by_pid.get(t["participant_id"], 0) for t in transcripts]
+        else:
+            warnings.append(f"{QUOTES_PATH.relative_to(ROOT)} not found; weighted by transcript tokens")
+            weight_source = "transcript tokens"
+            weights = [transcript_tokens(t) for t in transcripts]
+    else:
+        weight_source = "transcript tokens"
+        weights = [transcript_tokens(t) for t in transcripts]
+
+    items = [
+        {
+            "participant_id": t["participant_id"],
+            "transcript_id": t["id"],
+            "transcript_path": t["path"],
+            "weight": w,
+        }
+        for t, w in zip(transcripts, weights)
+    ]
+
+    # ── Plan ────────────────────────────────────────────────────────────────────
+
+    batches = lpt_batches(items, args.workers)
+    loads = [sum(item["weight"] for item in batch) for batch in batches]
+    total = sum(loads)
+    makespan = max(loads, default=0)
+    lower_bound = max(math.ceil(total / len(batches)), max(weights, default=0)) if items else 0
+    baseline = manifest_order_makespan(items, args.workers) if items else 0
+
+    plan = {
+        "phase": args.phase,
+        "workers": args.workers,
+        "weight": weight_source,
+        "participant_count": len(items),
+        "total_weight": total,
+        "makespan": makespan,
+        "lower_bound": lower_bound,
+        "manifest_order_makespan": baseline,
+        "batches": [
+            {"batch": n + 1, "weight": load, "participants": batch}
+            for n, (batch, load) in enumerate(zip(batches, loads))
+        ],
+    }
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    plan_path.write_text(json.dumps(plan, indent=2) + "\n", encoding="utf-8")
+
+    # ── Report ──────────────────────────────────────────────────────────────────
+
+    def share(value: int) -> str:
+        return f"{value / lower_bound:.2f}× lower bound" if lower_bound else "n/a"
+
+    print(f"\nPlan Batches: {args.phase}")
+    print(f"{'─' * 50}")
+    print(f"  Participants    : {len(items)}")
+    print(f"  Workers         : {args.workers} ({len(batches)} batches)")
+    print(f"  Weight          : {weight_source}, {total} total")
+    print(f"  Makespan (LPT)  : {makespan} ({share(makespan)})")
+    print(f"  Manifest order  : {baseline} ({share(baseline)})")
+    if batches:
+        print(f"  Batch weights   : min {min(loads)}, max {max(loads)}")
+
+    if warnings:
+        print(f"\nWARNINGS ({len(warnings)}):")
+        for w in warnings:
+            print(f"  WARN  {w}")
+
+    try:
+        shown = plan_path.relative_to(ROOT)
+    except ValueError:
+        shown = plan_path
+    print(f"\n  Plan written: {shown}")
+    print(f"\nStatus: {'PASS' if not warnings else 'PASS (with warnings)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,6 @@ Exit codes:
     1 — FAIL
 """
 
-import csv
 import json
 import re
 import sys
@@ -20,6 +19,11 @@ from collections import defaultdict
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.manifest import open_manifest  # noqa: E402
+from pipeline.quote_table import read_quotes  # noqa: E402
+
 MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
 INPUT_QUOTES_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p4-consolidate-tags" / "consolidated-quotes.csv"
 P5_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p5-synthesize-archetypes"
@@ -57,21 +61,19 @@ def main():
         print("\nStatus: FAIL")
         sys.exit(1)
 
-    with open(MANIFEST_PATH, encoding="utf-8") as f:
-        manifest = json.load(f)
-
-    expected_participants = sorted({t["participant_id"] for t in manifest["transcripts"]})
-
-    with open(INPUT_QUOTES_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if list(reader.fieldnames or []) != EXPECTED_COLUMNS:
-            print(
-                f"FAIL  consolidated-quotes.csv columns were {reader.fieldnames}; "
-                f"expected {EXPECTED_COLUMNS}"
-            )
-            print("\nStatus: FAIL")
-            sys.exit(1)
-        rows = list(reader)
+    manifest = open_manifest(MANIFEST_PATH)
+
+    expected_participants = sorted(set(manifest.participant_ids()))
+
+    fieldnames, quote_rows = read_quotes(INPUT_QUOTES_PATH)
+    if fieldnames != EXPECTED_COLUMNS:
+        print(
+            f"FAIL  consolidated-quotes.csv columns were {fieldnames}; "
+            f"expected {EXPECTED_COLUMNS}"
+        )
+        print("\nStatus: FAIL")
+        sys.exit(1)
+    rows = list(quote_rows)
 
     by_participant = defaultdict(list)
     for row in rows:
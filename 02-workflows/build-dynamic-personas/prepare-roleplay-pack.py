@@ -20,6 +20,10 @@ import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.quote_table import read_quotes  # noqa: E402
+
 P6_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p6-create-personas"
 P6_PERSONA_INPUTS = P6_DIR / "persona-inputs"
 P7_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p7-role-play"
@@ -50,20 +54,19 @@ def load_persona_input(path: Path) -> dict:
 
 def load_quotes_index() -> dict[str, list[dict]]:
     by_participant: dict[str, list[dict]] = {}
-    with open(P4_QUOTES, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            pid = (row.get("participant_id") or "").strip()
-            if not pid:
-                continue
-            by_participant.setdefault(pid, []).append(
-                {
-                    "tag": (row.get("tag") or "").strip(),
-                    "quote": (row.get("quote") or "").strip(),
-                    "transcript_id": (row.get("transcript_id") or "").strip(),
-                    "consolidated_tag": (row.get("consolidated_tag") or "").strip(),
-                }
-            )
+    _, rows = read_quotes(P4_QUOTES, ["participant_id", "tag", "quote", "transcript_id", "consolidated_tag"])
+    for row in rows:
+        pid = (row.get("participant_id") or "").strip()
+        if not pid:
+            continue
+        by_participant.setdefault(pid, []).append(
+            {
+                "tag": (row.get("tag") or "").strip(),
+                "quote": (row.get("quote") or "").strip(),
+                "transcript_id": (row.get("transcript_id") or "").strip(),
+                "consolidated_tag": (row.get("consolidated_tag") or "").strip(),
+            }
+        )
     return by_participant
 
 
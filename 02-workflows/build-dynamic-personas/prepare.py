@@ -4,30 +4,70 @@ Phase 0: Prepare
 Scans 03-inputs/interview-transcripts/, validates files, and writes a manifest
 to 04-process/build-dynamic-personas/manifest.json.
 
+Each manifest entry records the transcript's content hash (blake2b), size
+and a profile (lines, words, estimated LLM tokens, questions and
+participant turns) for planning extraction batches and forecasting LLM cost.
+The manifest's "changes" block lists the participant_ids whose transcript was
+added, removed or modified since the previous manifest, so later phases can
+re-process just those participants.
+
 Usage:
     python 02-workflows/build-dynamic-personas/prepare.py
+    python 02-workflows/build-dynamic-personas/prepare.py --incremental
+    python 02-workflows/build-dynamic-personas/prepare.py --incremental --layout jsonl
+
+--incremental reuses the previous manifest's hash and profile for every file
+whose size and mtime are unchanged, so only new or touched files are read.
+The mtimes live in p0-prepare/prepare-cache.json, an untracked local cache,
+so the committed manifest does not change when a checkout touches files.
+Files that are read are hashed and profiled in a process pool (--workers N,
+default one per CPU).
+
+--layout jsonl writes manifest.json as a small header and the transcript
+entries as JSON Lines shards plus an offset index under p0-prepare/manifest/
+(see pipeline/manifest.py); later phases read either layout.
 
 Exit codes:
     0 — PASS
     1 — FAIL (missing inputs or critical error)
 """
 
+import argparse
 import json
+import math
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 # ── Paths ──────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.manifest import LAYOUTS, Manifest, open_manifest, write_manifest  # noqa: E402
+from pipeline.segments import count_segments  # noqa: E402
+from pipeline.transcripts import content_hash  # noqa: E402
+
 TRANSCRIPTS_DIR = ROOT / "03-inputs" / "interview-transcripts"
 RESEARCH_BRIEF = ROOT / "03-inputs" / "research-brief.md"
 PROCESS_DIR = ROOT / "04-process" / "build-dynamic-personas"
 MANIFEST_PATH = PROCESS_DIR / "p0-prepare" / "manifest.json"
+CACHE_PATH = PROCESS_DIR / "p0-prepare" / "prepare-cache.json"
+CACHE_VERSION = 1
 
 EXPECTED_COUNT = 53
+# Participant ids listed per change type in the console report.
+MAX_CHANGES_SHOWN = 20
+
+# ── Profiling ──────────────────────────────────────────────────────────────────
+# Rough LLM tokenizer ratio for English text (~4 characters per token).
+CHARS_PER_TOKEN = 4
+PROFILE_FIELDS = ["lines", "words", "estimated_tokens", "questions", "participant_turns"]
+# Below this many files to read, a process pool costs more than it saves.
+MIN_PARALLEL_FILES = 256
 
 # ── Filename patterns ──────────────────────────────────────────────────────────
 # en_participant_0001.txt
@@ -62,7 +102,190 @@ def parse_filename(filename: str) -> Optional[dict]:
     return None
 
 
+# ── Scanning and hashing ───────────────────────────────────────────────────────
+
+def load_previous_manifest() -> Optional[Manifest]:
+    """Return the existing manifest (either layout), or None if absent or unreadable."""
+    if not MANIFEST_PATH.exists():
+        return None
+    try:
+        return open_manifest(MANIFEST_PATH)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_cache() -> dict[str, dict]:
+    """Return {path: {size_bytes, mtime_ns, content_hash}} from the last run, or {}."""
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def write_cache(files: dict[str, dict]) -> None:
+    tmp_path = CACHE_PATH.with_name(CACHE_PATH.name + ".tmp")
+    tmp_path.write_text(json.dumps({"version": CACHE_VERSION, "files": files}) + "\n", encoding="utf-8")
+    os.replace(tmp_path, CACHE_PATH)
+
+
+def profile_transcript(path: str) -> tuple[str, dict]:
+    """
+    Read one transcript and return (content_hash, profile). Top-level so it
+    can run in a worker process.
+
+    The profile is computed on the raw bytes: lines, whitespace-separated
+    words, an LLM token estimate (bytes / CHARS_PER_TOKEN), `*Qn*` question
+    headers and `PARTICIPANT:` turns.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    questions, participant_turns = count_segments(data)
+    lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+    return content_hash(data), {
+        "lines": lines,
+        "words": len(data.split()),
+        "estimated_tokens": math.ceil(len(data) / CHARS_PER_TOKEN),
+        "questions": questions,
+        "participant_turns": participant_turns,
+    }
+
+
+def scan_transcripts(
+    previous: dict[str, dict],
+    incremental: bool,
+    workers: int,
+) -> tuple[list[dict], list[str], int, dict[str, dict]]:
+    """
+    List the transcripts directory once and return (transcripts, skipped,
+    read, cache), where cache holds each file's size, mtime and hash for
+    prepare-cache.json.
+
+    `previous` maps manifest paths to the previous manifest's entries. In
+    incremental mode an entry whose cached size and mtime still match, and
+    whose hash matches the cached one, supplies the content hash and profile
+    without reading the file. Every other file is hashed and profiled, in a
+    process pool when `workers` > 1.
+    """
+    transcripts = []
+    skipped = []
+    to_read: list[dict] = []
+    stats: dict[str, os.stat_result] = {}
+    cached = load_cache() if incremental else {}
+
+    with os.scandir(TRANSCRIPTS_DIR) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(".txt") and e.is_file()),
+            key=lambda e: e.name,
+        )
+
+    for entry in entries:
+        meta = parse_filename(entry.name)
+        if meta is None:
+            skipped.append(entry.name)
+            continue
+        path = str(Path(entry.path).relative_to(ROOT))
+        st = stats[path] = entry.stat()
+        meta["path"] = path
+        meta["size_bytes"] = st.st_size
+        old = previous.get(path)
+        seen = cached.get(path, {})
+        if (
+            old is not None
+            and old.get("content_hash")
+            and old.get("profile")
+            and old["content_hash"] == seen.get("content_hash")
+            and seen.get("size_bytes") == st.st_size
+            and seen.get("mtime_ns") == st.st_mtime_ns
+        ):
+            meta["content_hash"] = old["content_hash"]
+            meta["profile"] = old["profile"]
+        else:
+            to_read.append(meta)
+        transcripts.append(meta)
+
+    paths = [str(ROOT / meta["path"]) for meta in to_read]
+    if workers > 1 and len(paths) >= MIN_PARALLEL_FILES:
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(profile_transcript, paths, chunksize=chunksize)
+            for meta, (digest, profile) in zip(to_read, results):
+                meta["content_hash"], meta["profile"] = digest, profile
+    else:
+        for meta, path in zip(to_read, paths):
+            meta["content_hash"], meta["profile"] = profile_transcript(path)
+
+    cache = {
+        meta["path"]: {
+            "size_bytes": meta["size_bytes"],
+            "mtime_ns": stats[meta["path"]].st_mtime_ns,
+            "content_hash": meta["content_hash"],
+        }
+        for meta in transcripts
+    }
+    return transcripts, skipped, len(to_read), cache
+
+
+def profile_totals(transcripts: list[dict]) -> dict[str, int]:
+    totals = {key: 0 for key in PROFILE_FIELDS}
+    for t in transcripts:
+        for key in PROFILE_FIELDS:
+            totals[key] += t["profile"][key]
+    return totals
+
+
+def diff_manifests(previous: list[dict], current: list[dict]) -> dict[str, list[str]]:
+    """
+    Return {"added", "removed", "modified"} participant_id lists between two
+    manifest transcript lists, matched on path. Entries from manifests written
+    before content hashes existed are compared on size_bytes.
+    """
+    before = {t["path"]: t for t in previous}
+    after = {t["path"]: t for t in current}
+    modified = []
+    for path, t in after.items():
+        old = before.get(path)
+        if old is None:
+            continue
+        if "content_hash" in old:
+            changed = old["content_hash"] != t["content_hash"]
+        else:
+            changed = old.get("size_bytes") != t["size_bytes"]
+        if changed:
+            modified.append(t["participant_id"])
+    return {
+        "added": [t["participant_id"] for path, t in after.items() if path not in before],
+        "removed": [t["participant_id"] for path, t in before.items() if path not in after],
+        "modified": modified,
+    }
+
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-hash transcripts whose size or mtime changed since the previous manifest",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Hash and profile transcripts in N worker processes (0 = one per CPU, 1 = serial)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="json",
+        help="json: one manifest.json (default); jsonl: header plus JSON Lines shards and an index, for large intakes",
+    )
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    if workers < 0:
+        parser.error("--workers must be 0 or a positive integer")
+
     warnings = []
     errors = []
 
@@ -77,17 +300,11 @@ def main():
 
     # ── Scan transcripts ───────────────────────────────────────────────────────
 
-    transcripts = []
-    skipped = []
-
-    for path in sorted(TRANSCRIPTS_DIR.glob("*.txt")):
-        meta = parse_filename(path.name)
-        if meta is None:
-            skipped.append(path.name)
-            continue
-        meta["path"] = str(path.relative_to(ROOT))
-        meta["size_bytes"] = path.stat().st_size
-        transcripts.append(meta)
+    previous_manifest = load_previous_manifest()
+    previous_transcripts = list(previous_manifest.transcripts()) if previous_manifest else []
+    previous = {t["path"]: t for t in previous_transcripts}
+    transcripts, skipped, n_read, cache = scan_transcripts(previous, args.incremental, workers)
+    changes = diff_manifests(previous_transcripts, transcripts)
 
     # ── Count checks ───────────────────────────────────────────────────────────
 
@@ -112,14 +329,16 @@ def main():
     # ── Write manifest ─────────────────────────────────────────────────────────
 
     if not errors:
-        MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
         manifest = {
             "transcript_count": total_files,
             "transcripts": transcripts,
             "research_brief_path": str(RESEARCH_BRIEF.relative_to(ROOT)),
             "warnings": warnings,
+            "changes": changes,
+            "profile_totals": profile_totals(transcripts),
         }
-        MANIFEST_PATH.write_text(json.dumps(manifest, indent=2))
+        write_manifest(manifest, args.layout, MANIFEST_PATH)
+        write_cache(cache)
 
     # ── Report ─────────────────────────────────────────────────────────────────
 
@@ -128,6 +347,26 @@ def main():
     print(f"  Transcripts dir : {TRANSCRIPTS_DIR.relative_to(ROOT)}")
     print(f"  Transcripts found: {total_files} (expected {EXPECTED_COUNT})")
     print(f"  Research brief  : {'found' if RESEARCH_BRIEF.exists() else 'MISSING'}")
+    mode = "incremental" if args.incremental else "full"
+    print(f"  Hashing         : {mode} ({n_read} read and profiled, {total_files - n_read} reused)")
+    totals = profile_totals(transcripts)
+    print(
+        f"  Profile         : {totals['lines']} lines, {totals['words']} words, "
+        f"~{totals['estimated_tokens']} tokens"
+    )
+    print(f"                    {totals['questions']} questions, {totals['participant_turns']} participant turns")
+    if previous_manifest is None:
+        print(f"  Changes         : no previous manifest")
+    else:
+        print(
+            f"  Changes         : {len(changes['added'])} added, "
+            f"{len(changes['removed'])} removed, {len(changes['modified'])} modified"
+        )
+        for kind, pids in changes.items():
+            if pids:
+                shown = ", ".join(pids[:MAX_CHANGES_SHOWN])
+                more = f" (+{len(pids) - MAX_CHANGES_SHOWN} more)" if len(pids) > MAX_CHANGES_SHOWN else ""
+                print(f"    {kind:<9}: {shown}{more}")
 
     if warnings:
         print(f"\nWARNINGS ({len(warnings)}):")
@@ -141,7 +380,7 @@ def main():
         print(f"\nStatus: FAIL — manifest not written")
         sys.exit(1)
 
-    print(f"\n  Manifest written: {MANIFEST_PATH.relative_to(ROOT)}")
+    print(f"\n  Manifest written: {MANIFEST_PATH.relative_to(ROOT)} ({args.layout} layout)")
     print(f"\nStatus: {'PASS' if not warnings else 'PASS (with warnings)'}")
 
 
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Phase 5: Propose Archetypes
+Clusters participants locally into five candidate archetypes plus outliers,
+so the archetype-writer only has to name, describe and evidence the groups
+instead of forming them from the extract files.
+
+Each participant is a sparse vector over the consolidated tags, built from
+consolidated-quotes.csv: how much they said about each tag (weighted by
+severity) and which way they lean on it (weighted by sentiment). Participants
+are grouped by spherical k-means (see pipeline/archetype_clusters.py);
+members fitting their cluster far worse than the rest of it, participants
+with fewer than --min-quotes quotes, and expected participants with no quotes
+at all become outliers. Each cluster gets a provisional name from the tags
+that set it apart.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/propose-archetypes.py
+    python3 02-workflows/build-dynamic-personas/propose-archetypes.py --seed 3
+
+Writes:
+    04-process/build-dynamic-personas/p5-synthesize-archetypes/participant-archetype-candidates.csv
+    (same columns as participant-archetype-assignments.csv)
+    04-process/build-dynamic-personas/p5-synthesize-archetypes/archetype-candidates.json
+    (per cluster: provisional name, participants, mean fit and distinguishing tags)
+
+Exit codes:
+    0 — PASS (or PASS with warnings)
+    1 — FAIL (consolidated quotes missing, or too few participants for five clusters)
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.archetype_clusters import cluster_profile, kmeans, participant_vectors, weak_fits  # noqa: E402
+from pipeline.quote_table import read_quotes  # noqa: E402
+
+INPUT_QUOTES_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p4-consolidate-tags" / "consolidated-quotes.csv"
+P5_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p5-synthesize-archetypes"
+EXPECTED_PARTICIPANTS_PATH = P5_DIR / "expected-participants.json"
+CANDIDATES_PATH = P5_DIR / "participant-archetype-candidates.csv"
+PROFILES_PATH = P5_DIR / "archetype-candidates.json"
+
+ASSIGNMENT_COLUMNS = [
+    "participant_id",
+    "assignment_type",
+    "archetype_number",
+    "archetype_name",
+    "outlier_reason",
+]
+
+ARCHETYPE_COUNT = 5
+DEFAULT_MIN_QUOTES = 3
+PROFILE_TAGS = 8
+NAME_TAGS = 2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for k-means (default: 0)")
+    parser.add_argument(
+        "--min-quotes",
+        type=int,
+        default=DEFAULT_MIN_QUOTES,
+        help=f"Participants with fewer quotes become outliers (default: {DEFAULT_MIN_QUOTES})",
+    )
+    parser.add_argument("--output", type=Path, help="Candidate CSV to write (default: participant-archetype-candidates.csv)")
+    args = parser.parse_args()
+    output_path = args.output or CANDIDATES_PATH
+    warnings = []
+
+    # ── Load quotes ─────────────────────────────────────────────────────────────
+
+    if not INPUT_QUOTES_PATH.exists():
+        print(f"FAIL  Consolidated quotes not found: {INPUT_QUOTES_PATH.relative_to(ROOT)} — run run-tag-consolidation.py first")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    _, rows = read_quotes(INPUT_QUOTES_PATH, ["participant_id", "consolidated_tag", "severity", "sentiment"])
+    vectors, quote_counts = participant_vectors(rows)
+
+    expected = None
+    if EXPECTED_PARTICIPANTS_PATH.exists():
+        payload = json.loads(EXPECTED_PARTICIPANTS_PATH.read_text(encoding="utf-8"))
+        expected = set(payload.get("expected_participants", [])) or None
+    if expected is None:
+        warnings.append(
+            f"{EXPECTED_PARTICIPANTS_PATH.relative_to(ROOT)} not found or empty; "
+            "using every participant in consolidated-quotes.csv (run prepare-archetype-extracts.py first)"
+        )
+        expected = set(vectors)
+    unexpected = sorted(set(vectors) - expected)
+    if unexpected:
+        warnings.append(
+            f"{len(unexpected)} participant(s) with quotes are not expected and were left out: "
+            + ", ".join(unexpected[:20])
+            + ("..." if len(unexpected) > 20 else "")
+        )
+
+    outliers = {}
+    for pid in sorted(expected):
+        if pid not in vectors:
+            outliers[pid] = "no consolidated quotes"
+        elif quote_counts[pid] < args.min_quotes:
+            outliers[pid] = f"too few quotes to place ({quote_counts[pid]})"
+    pids = sorted(pid for pid in expected if pid not in outliers)
+
+    # ── Cluster ─────────────────────────────────────────────────────────────────
+
+    matrix = [vectors[pid] for pid in pids]
+    try:
+        labels, _, fits = kmeans(matrix, ARCHETYPE_COUNT, seed=args.seed)
+    except ValueError as e:
+        print(f"FAIL  Could not cluster {len(pids)} participant(s): {e}")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+    for i, reason in weak_fits(labels, fits).items():
+        outliers[pids[i]] = reason
+
+    # Number clusters largest first, from their remaining core members.
+    groups = [[i for i, label in enumerate(labels) if label == c and pids[i] not in outliers] for c in range(ARCHETYPE_COUNT)]
+    groups.sort(key=lambda members: (-len(members), pids[members[0]]))
+
+    clusters = []
+    for number, members in enumerate(groups, start=1):
+        profile = cluster_profile([matrix[i] for i in members], matrix, PROFILE_TAGS)
+        clusters.append(
+            {
+                "archetype_number": number,
+                "provisional_name": " / ".join(t["consolidated_tag"] for t in profile[:NAME_TAGS]),
+                "participants": [pids[i] for i in members],
+                "mean_fit": round(sum(fits[i] for i in members) / len(members), 3),
+                "distinguishing_tags": profile,
+            }
+        )
+
+    # ── Write candidates ────────────────────────────────────────────────────────
+
+    assignments = [
+        {
+            "participant_id": pid,
+            "assignment_type": "core",
+            "archetype_number": str(c["archetype_number"]),
+            "archetype_name": c["provisional_name"],
+            "outlier_reason": "",
+        }
+        for c in clusters
+        for pid in c["participants"]
+    ]
+    assignments += [
+        {
+            "participant_id": pid,
+            "assignment_type": "outlier",
+            "archetype_number": "",
+            "archetype_name": "",
+            "outlier_reason": reason,
+        }
+        for pid, reason in sorted(outliers.items())
+    ]
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=ASSIGNMENT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(assignments)
+
+    profiles_path = output_path.with_name(PROFILES_PATH.name) if args.output else PROFILES_PATH
+    profiles = {
+        "source": "propose-archetypes.py",
+        "seed": args.seed,
+        "clusters": clusters,
+        "outliers": [{"participant_id": pid, "outlier_reason": reason} for pid, reason in sorted(outliers.items())],
+    }
+    profiles_path.write_text(json.dumps(profiles, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    # ── Report ──────────────────────────────────────────────────────────────────
+
+    def shown(path: Path) -> Path:
+        try:
+            return path.relative_to(ROOT)
+        except ValueError:
+            return path
+
+    print("\nPhase 5: Propose Archetypes")
+    print(f"{'─' * 50}")
+    print(f"  Input quotes          : {INPUT_QUOTES_PATH.relative_to(ROOT)}")
+    print(f"  Expected participants : {len(expected)}")
+    print(f"  Clustered             : {len(pids)}")
+    print(f"  Core assignments      : {len(assignments) - len(outliers)}")
+    print(f"  Outliers              : {len(outliers)}")
+    for c in clusters:
+        print(
+            f"    Archetype {c['archetype_number']}: {len(c['participants']):>4} participants, "
+            f"fit {c['mean_fit']:.2f} — {c['provisional_name']}"
+        )
+    print(f"  Candidates CSV        : {shown(output_path)}")
+    print(f"  Cluster profiles      : {shown(profiles_path)}")
+
+    if warnings:
+        print(f"\nWARNINGS ({len(warnings)}):")
+        for w in warnings:
+            print(f"  WARN  {w}")
+
+    print(f"\nStatus: {'PASS' if not warnings else 'PASS (with warnings)'}")
+
+
+if __name__ == "__main__":
+    main()
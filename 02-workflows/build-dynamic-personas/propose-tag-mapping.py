@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Phase 4: Propose Tag Mapping
+Clusters the original quote tags locally and writes a candidate tag mapping
+that already meets run-tag-consolidation.py's limits (consolidated tag count,
+unchanged-tag, dominant-tag and catch-all ratios), so the tag-consolidator
+only has to review the groups and name them.
+
+Tags are compared on character n-grams of the tag name, the participants who
+used them and the words of their quotes (see pipeline/tag_clusters.py), then
+merged by average-linkage agglomerative clustering until --clusters remain. No
+merge may create a consolidated tag holding more than the dominant-tag share
+of quote rows. Each cluster is provisionally named after its most central
+member tag (with " And Related" appended to multi-tag clusters if that would
+otherwise leave too many tags unchanged); clusters are listed with their
+member tags, most central first, each member's mean similarity to the rest of
+its cluster and the cluster's mean internal similarity, so the consolidator
+can review the loosest clusters and their least similar members first.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/propose-tag-mapping.py
+    python3 02-workflows/build-dynamic-personas/propose-tag-mapping.py --clusters 38
+
+Writes:
+    04-process/build-dynamic-personas/p4-consolidate-tags/tag-mapping-proposal.json
+    (same "mappings" format as tag-mapping.json, plus a "clusters" list with
+    member and mean similarities)
+
+Exit codes:
+    0 — PASS
+    1 — FAIL (quotes missing, or no proposal within the limits)
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.quote_table import read_quote_columns  # noqa: E402
+from pipeline.tag_clusters import by_centrality, cluster, member_similarity, tag_similarity  # noqa: E402
+from pipeline.tag_constraints import (  # noqa: E402
+    CONSOLIDATED_COUNT_MAX,
+    CONSOLIDATED_COUNT_MIN,
+    MAX_DOMINANT_CONSOLIDATED_ROW_RATIO,
+    MappingState,
+    is_catch_all,
+)
+
+QUOTES_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quotes.csv"
+PHASE4_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p4-consolidate-tags"
+PROPOSAL_PATH = PHASE4_DIR / "tag-mapping-proposal.json"
+
+DEFAULT_CLUSTERS = 40
+RELATED_SUFFIX = " And Related"
+
+
+def cluster_names(ordered: list[list[str]], suffix_groups: bool) -> list[str]:
+    """
+    Provisional name per cluster: its most central tag without a catch-all
+    marker. With `suffix_groups`, multi-tag clusters get RELATED_SUFFIX so the
+    name is not an unchanged pass-through of one member.
+    """
+    names = []
+    for tags in ordered:
+        name = next((t for t in tags if not is_catch_all(t)), tags[0])
+        if suffix_groups and len(tags) > 1:
+            name += RELATED_SUFFIX
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--clusters",
+        type=int,
+        default=DEFAULT_CLUSTERS,
+        help=f"Number of consolidated tags to propose (default: {DEFAULT_CLUSTERS})",
+    )
+    parser.add_argument("--output", type=Path, help="Proposal file to write (default: tag-mapping-proposal.json)")
+    args = parser.parse_args()
+    if not CONSOLIDATED_COUNT_MIN <= args.clusters <= CONSOLIDATED_COUNT_MAX:
+        parser.error(f"--clusters must be between {CONSOLIDATED_COUNT_MIN} and {CONSOLIDATED_COUNT_MAX}")
+    output_path = args.output or PROPOSAL_PATH
+
+    # ── Load quotes ─────────────────────────────────────────────────────────────
+
+    if not QUOTES_PATH.exists():
+        print(f"FAIL  quotes.csv not found: {QUOTES_PATH.relative_to(ROOT)} — run merge-quotes.py first")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    tag_counts: Counter = Counter()
+    participants: dict[str, Counter] = {}
+    quotes: dict[str, list[str]] = {}
+    for participant_id, tag, quote in read_quote_columns(QUOTES_PATH, ["participant_id", "tag", "quote"]):
+        tag_counts[tag] += 1
+        participants.setdefault(tag, Counter())[participant_id] += 1
+        quotes.setdefault(tag, []).append(quote)
+
+    tags = sorted(tag_counts)
+    if len(tags) < CONSOLIDATED_COUNT_MIN:
+        print(f"FAIL  Only {len(tags)} distinct tags; at least {CONSOLIDATED_COUNT_MIN} are needed to propose a mapping")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    # ── Cluster ─────────────────────────────────────────────────────────────────
+
+    weights = [tag_counts[t] for t in tags]
+    total_rows = sum(weights)
+    sim = tag_similarity(tags, [participants[t] for t in tags], [quotes[t] for t in tags])
+    groups = cluster(sim, weights, args.clusters, math.floor(MAX_DOMINANT_CONSOLIDATED_ROW_RATIO * total_rows))
+    central = [by_centrality(group, sim, weights) for group in groups]
+    ordered = [[tags[i] for i in members] for members in central]
+
+    errors: list[str] = []
+    for suffix_groups in (False, True):
+        names = cluster_names(ordered, suffix_groups)
+        mapping = {tag: name for name, members in zip(names, ordered) for tag in members}
+        errors = MappingState(tag_counts, mapping).failures()
+        if not errors:
+            break
+
+    # ── Write proposal ──────────────────────────────────────────────────────────
+
+    cluster_rows = [sum(tag_counts[t] for t in members) for members in ordered]
+    cohesion = [member_similarity(members, sim) for members in central]
+    mean_similarity = [sum(m.values()) / len(m) if m else None for m in cohesion]
+    if not errors:
+        proposal = {
+            "source": "propose-tag-mapping.py",
+            "clusters": [
+                {
+                    "consolidated_tag": name,
+                    "rows": n_rows,
+                    "original_tags": [tags[i] for i in members],
+                    "mean_similarity": None if mean is None else round(mean, 3),
+                    "member_similarity": {tags[i]: round(m[i], 3) for i in members} if m else None,
+                }
+                for name, n_rows, members, m, mean in zip(names, cluster_rows, central, cohesion, mean_similarity)
+            ],
+            "mappings": [{"original_tag": t, "consolidated_tag": mapping[t]} for t in tags],
+        }
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(proposal, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    # ── Report ──────────────────────────────────────────────────────────────────
+
+    print("\nPhase 4: Propose Tag Mapping")
+    print(f"{'─' * 50}")
+    print(f"  Quote rows            : {total_rows}")
+    print(f"  Original tags         : {len(tags)}")
+    print(f"  Consolidated tags     : {len(ordered)}")
+    print(f"  Largest (rows)        : {max(cluster_rows)} ({max(cluster_rows) / total_rows:.1%})")
+    print(f"  Single-tag clusters   : {sum(1 for members in ordered if len(members) == 1)}")
+    grouped = [(mean, name) for mean, name in zip(mean_similarity, names) if mean is not None]
+    if grouped:
+        loosest, loosest_name = min(grouped)
+        print(f"  Loosest cluster       : {loosest_name} (mean similarity {loosest:.2f})")
+
+    if errors:
+        print(f"\nERRORS ({len(errors)}):")
+        for e in errors:
+            print(f"  FAIL  {e}")
+        print("\nStatus: FAIL — no proposal written")
+        sys.exit(1)
+
+    try:
+        shown = output_path.relative_to(ROOT)
+    except ValueError:
+        shown = output_path
+    print(f"\n  Proposal written: {shown}")
+    print("\nStatus: PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Benchmarks: Phase 0–2 Pipeline
+Times prepare.py, build-transcript-store.py, merge-quotes.py and
+validate-quotes.py on synthetic corpora at multiples of the real corpus size
+and records wall time, throughput and peak RSS for each step.
+
+For each scale a throwaway project tree is built under the work directory:
+the workflow scripts are copied in (so their ROOT resolves to the copy), the
+research brief is copied, and generate-synthetic-corpus.py writes the
+transcripts and quote parts. Each step runs as a child process; peak RSS is
+that process's ru_maxrss as reported by os.wait4 (Linux/macOS only).
+validate-quotes.py runs cold (--no-cache), then once to populate the cache
+and once more warm.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/run-benchmarks.py
+    python3 02-workflows/build-dynamic-personas/run-benchmarks.py --scales 10 100
+    python3 02-workflows/build-dynamic-personas/run-benchmarks.py --scales 1 --workers 4 --keep
+
+Writes:
+    04-process/build-dynamic-personas/benchmarks/benchmark-results.csv
+    (one row per scale and step; appended to, so runs can be compared over time)
+
+Exit codes:
+    0 — PASS (every step completed)
+    1 — FAIL (a step crashed or could not be set up)
+"""
+
+import argparse
+import csv
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+ROOT = Path(__file__).resolve().parents[2]
+WORKFLOW_DIR = ROOT / "02-workflows" / "build-dynamic-personas"
+RESEARCH_BRIEF = ROOT / "03-inputs" / "research-brief.md"
+RESULTS_PATH = ROOT / "04-process" / "build-dynamic-personas" / "benchmarks" / "benchmark-results.csv"
+
+# Size of the real corpus; scales are multiples of it.
+BASE_PARTICIPANTS = 53
+BASE_QUOTES_PER_PARTICIPANT = 17
+DEFAULT_SCALES = [10, 100, 1000]
+
+RESULT_COLUMNS = [
+    "run_at",
+    "host",
+    "python",
+    "scale",
+    "participants",
+    "step",
+    "exit_code",
+    "seconds",
+    "items",
+    "unit",
+    "items_per_second",
+    "input_mb",
+    "mb_per_second",
+    "peak_rss_mb",
+]
+
+
+def allowed_exit_codes(step: str) -> set[int]:
+    # validate-quotes.py exits 1 when quotes FAIL, which paraphrased synthetic quotes do.
+    return {0, 1} if step.startswith("validate-quotes") else {0}
+
+
+# ── Measurement ─────────────────────────────────────────────────────────────────
+
+def run_measured(cmd: list[str], log_path: Path) -> tuple[int, float, float]:
+    """Run `cmd`, sending output to `log_path`. Returns (exit_code, seconds, peak_rss_mb)."""
+    with open(log_path, "w", encoding="utf-8") as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - start
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss_bytes = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return os.waitstatus_to_exitcode(status), seconds, rss_bytes / 1e6
+
+
+def dir_megabytes(path: Path) -> float:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file()) / 1e6
+
+
+def count_csv_rows(path: Path) -> int:
+    with open(path, newline="", encoding="utf-8") as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+
+# ── Project tree ────────────────────────────────────────────────────────────────
+
+def build_tree(tree: Path, participants: int, args: argparse.Namespace) -> None:
+    """Copy the workflow scripts and research brief into `tree` and generate the corpus."""
+    shutil.copytree(
+        WORKFLOW_DIR,
+        tree / "02-workflows" / "build-dynamic-personas",
+        ignore=shutil.ignore_patterns("__pycache__", "p8_app"),
+    )
+    (tree / "03-inputs").mkdir(parents=True, exist_ok=True)
+    shutil.copy2(RESEARCH_BRIEF, tree / "03-inputs" / "research-brief.md")
+    subprocess.run(
+        [
+            sys.executable,
+            str(WORKFLOW_DIR / "generate-synthetic-corpus.py"),
+            "--out", str(tree),
+            "--participants", str(participants),
+            "--quotes-per-participant", str(BASE_QUOTES_PER_PARTICIPANT),
+            "--ellipsis-share", str(args.ellipsis_share),
+            "--paraphrase-share", str(args.paraphrase_share),
+            "--seed", str(args.seed),
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def steps_for(tree: Path, workers: int) -> list[tuple[str, list[str], str]]:
+    """Return (step name, command, throughput unit) for each benchmarked step, in run order."""
+    scripts = tree / "02-workflows" / "build-dynamic-personas"
+
+    def script(name: str, *extra: str) -> list[str]:
+        return [sys.executable, str(scripts / name), *extra]
+
+    validate_args = ("--workers", str(workers))
+    return [
+        ("prepare", script("prepare.py"), "transcripts"),
+        ("build-transcript-store", script("build-transcript-store.py"), "transcripts"),
+        ("merge-quotes", script("merge-quotes.py"), "quotes"),
+        ("validate-quotes", script("validate-quotes.py", "--no-cache", *validate_args), "quotes"),
+        # --no-cache neither reads nor writes the cache, so populate it first
+        ("validate-quotes (populate cache)", script("validate-quotes.py", *validate_args), "quotes"),
+        ("validate-quotes (cached)", script("validate-quotes.py", *validate_args), "quotes"),
+    ]
+
+
+# ── Main ────────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SCALES,
+        help=f"Corpus multiples to benchmark (default: {' '.join(map(str, DEFAULT_SCALES))})",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="--workers passed to validate-quotes.py (default: 1)")
+    parser.add_argument("--ellipsis-share", type=float, default=0.05, help="Share of ellipsis quotes (default: 0.05)")
+    parser.add_argument("--paraphrase-share", type=float, default=0.02, help="Share of paraphrased quotes (default: 0.02)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus generator seed (default: 0)")
+    parser.add_argument("--work-dir", type=Path, help="Where to build the synthetic trees (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic trees and step logs afterwards")
+    parser.add_argument("--results", type=Path, default=RESULTS_PATH, help="CSV to append results to")
+    args = parser.parse_args()
+
+    if any(s < 1 for s in args.scales):
+        parser.error("--scales must be positive integers")
+    if not hasattr(os, "wait4"):
+        print("FAIL  os.wait4 is not available on this platform; peak RSS cannot be measured")
+        sys.exit(1)
+    if not RESEARCH_BRIEF.exists():
+        print(f"FAIL  Research brief not found: {RESEARCH_BRIEF.relative_to(ROOT)}")
+        sys.exit(1)
+
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="persona-benchmarks-"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    host = platform.node()
+    python = platform.python_version()
+
+    results: list[dict] = []
+    errors: list[str] = []
+
+    for scale in args.scales:
+        participants = BASE_PARTICIPANTS * scale
+        tree = work_dir / f"scale-{scale}x"
+        print(f"  Scale {scale}x: generating {participants} transcripts ...", flush=True)
+        if tree.exists():
+            shutil.rmtree(tree)
+        try:
+            build_tree(tree, participants, args)
+        except (OSError, subprocess.CalledProcessError) as e:
+            errors.append(f"{scale}x: could not build synthetic tree — {e}")
+            continue
+
+        transcripts_dir = tree / "03-inputs" / "interview-transcripts"
+        parts_dir = tree / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quote-parts"
+        quotes_path = parts_dir.parent / "quotes.csv"
+        transcript_mb = dir_megabytes(transcripts_dir)
+        parts_mb = dir_megabytes(parts_dir)
+        n_quotes = sum(count_csv_rows(p) for p in parts_dir.glob("*.csv"))
+
+        for step, cmd, unit in steps_for(tree, args.workers):
+            log_path = tree / f"{step.replace(' ', '-')}.log"
+            exit_code, seconds, peak_rss_mb = run_measured(cmd, log_path)
+            items = participants if unit == "transcripts" else n_quotes
+            if step == "merge-quotes":
+                input_mb = parts_mb
+            elif step.startswith("validate-quotes"):
+                input_mb = transcript_mb + (quotes_path.stat().st_size / 1e6 if quotes_path.exists() else 0)
+            else:
+                input_mb = transcript_mb
+            results.append(
+                {
+                    "run_at": run_at,
+                    "host": host,
+                    "python": python,
+                    "scale": scale,
+                    "participants": participants,
+                    "step": step,
+                    "exit_code": exit_code,
+                    "seconds": f"{seconds:.3f}",
+                    "items": items,
+                    "unit": unit,
+                    "items_per_second": f"{items / seconds:.1f}" if seconds else "",
+                    "input_mb": f"{input_mb:.1f}",
+                    "mb_per_second": f"{input_mb / seconds:.2f}" if seconds else "",
+                    "peak_rss_mb": f"{peak_rss_mb:.1f}",
+                }
+            )
+            print(f"    {step:<34} {seconds:>9.2f}s  {peak_rss_mb:>8.1f} MB", flush=True)
+            if exit_code not in allowed_exit_codes(step):
+                errors.append(f"{scale}x {step}: exit code {exit_code} (see {log_path})")
+                args.keep = True
+                break
+
+        if not args.keep:
+            shutil.rmtree(tree)
+
+    if not args.keep and args.work_dir is None:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # ── Write results ───────────────────────────────────────────────────────────
+
+    if results:
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not args.results.exists()
+        with open(args.results, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(results)
+
+    # ── Report ──────────────────────────────────────────────────────────────────
+
+    print(f"\nBenchmarks: Phase 0–2 Pipeline")
+    print(f"{'─' * 90}")
+    print(f"  {'scale':>6}  {'step':<34} {'seconds':>9} {'throughput':>22} {'MB/s':>8} {'peak RSS':>10}")
+    for r in results:
+        throughput = f"{r['items_per_second']} {r['unit']}/s"
+        print(
+            f"  {str(r['scale']) + 'x':>6}  {r['step']:<34} {r['seconds']:>9} "
+            f"{throughput:>22} {r['mb_per_second']:>8} {r['peak_rss_mb'] + ' MB':>10}"
+        )
+    if results:
+        try:
+            shown = args.results.relative_to(ROOT)
+        except ValueError:
+            shown = args.results
+        print(f"\n  Results appended to: {shown}")
+    if args.keep:
+        print(f"  Synthetic trees kept in: {work_dir}")
+
+    if errors:
+        print(f"\nERRORS ({len(errors)}):")
+        for e in errors:
+            print(f"  FAIL  {e}")
+        print(f"\nStatus: FAIL")
+        sys.exit(1)
+
+    print(f"\nStatus: PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,12 @@
 Phase 4: Consolidate Quote Tags
 Reads quote rows plus a tag mapping and writes consolidated quote/tag artifacts.
 
+Quote rows are streamed: each is read once, mapped, and written straight to a
+temporary consolidated-quotes.csv while the crosswalk and report counters are
+updated, so memory depends on the number of tags rather than quotes. The
+temporary file replaces consolidated-quotes.csv only if every check passes;
+otherwise no output is changed.
+
 Usage:
     python3 02-workflows/build-dynamic-personas/run-tag-consolidation.py
 
@@ -13,13 +19,28 @@ Exit codes:
 
 import csv
 import json
+import os
 import sys
 from collections import Counter
+from itertools import chain
 from pathlib import Path
+from typing import Iterable, Iterator
 
 # ── Paths ───────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.quote_table import QuoteTableWriter, read_quotes  # noqa: E402
+from pipeline.tag_constraints import (  # noqa: E402
+    CATCH_ALL_MARKERS,
+    CONSOLIDATED_COUNT_MAX,
+    CONSOLIDATED_COUNT_MIN,
+    MAX_CATCH_ALL_ROW_RATIO,
+    MAX_DOMINANT_CONSOLIDATED_ROW_RATIO,
+    MAX_UNCHANGED_TAG_RATIO,
+)
+
 QUOTES_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quotes.csv"
 PHASE4_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p4-consolidate-tags"
 MAPPING_PATH = PHASE4_DIR / "tag-mapping.json"
@@ -40,36 +61,30 @@ QUOTE_COLUMNS = [
 ]
 
 CROSSWALK_COLUMNS = ["original_tag", "consolidated_tag", "original_count", "notes"]
-CONSOLIDATED_COUNT_MIN = 35
-CONSOLIDATED_COUNT_MAX = 45
-MAX_UNCHANGED_TAG_RATIO = 0.35
-MAX_CATCH_ALL_ROW_RATIO = 0.15
-MAX_DOMINANT_CONSOLIDATED_ROW_RATIO = 0.20
-# Keep this conservative to avoid false positives on legitimate tags.
-CATCH_ALL_MARKERS = ("general", "misc", "miscellaneous", "various", "catch-all")
 
 
-def load_quotes() -> tuple[list[dict], list[str]]:
+def load_quotes() -> tuple[Iterator[dict], list[str]]:
+    """Returns (rows, errors); rows are streamed from quotes.csv."""
     errors = []
-    rows = []
+    rows: Iterator[dict] = iter(())
 
     if not QUOTES_PATH.exists():
         errors.append(f"quotes.csv not found: {QUOTES_PATH.relative_to(ROOT)}")
         return rows, errors
 
-    with open(QUOTES_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if list(reader.fieldnames or []) != QUOTE_COLUMNS:
-            errors.append(
-                f"quotes.csv columns were {reader.fieldnames}; expected {QUOTE_COLUMNS}"
-            )
-            return rows, errors
-        rows = list(reader)
+    fieldnames, quote_rows = read_quotes(QUOTES_PATH)
+    if fieldnames != QUOTE_COLUMNS:
+        errors.append(
+            f"quotes.csv columns were {fieldnames}; expected {QUOTE_COLUMNS}"
+        )
+        return rows, errors
 
-    if not rows:
+    first = next(quote_rows, None)
+    if first is None:
         errors.append("quotes.csv contained no rows")
+        return rows, errors
 
-    return rows, errors
+    return chain([first], quote_rows), errors
 
 
 def load_mapping() -> tuple[dict[str, str], list[str], list[str]]:
@@ -129,11 +144,13 @@ def load_mapping() -> tuple[dict[str, str], list[str], list[str]]:
     return mapping, warnings, errors
 
 
-def semantic_quality_errors(quotes: list[dict], mapping: dict[str, str]) -> list[str]:
+def semantic_quality_errors(
+    original_counts: Counter, consolidated_row_counts: Counter, mapping: dict[str, str]
+) -> list[str]:
     errors = []
 
-    original_tags = {row["tag"] for row in quotes}
-    total_rows = len(quotes)
+    original_tags = set(original_counts)
+    total_rows = sum(original_counts.values())
     if not original_tags or total_rows == 0:
         return errors
 
@@ -147,7 +164,6 @@ def semantic_quality_errors(quotes: list[dict], mapping: dict[str, str]) -> list
             f"above limit {MAX_UNCHANGED_TAG_RATIO:.0%}. Mapping appears too pass-through."
         )
 
-    consolidated_row_counts = Counter(mapping[row["tag"]] for row in quotes)
     dominant_tag, dominant_count = consolidated_row_counts.most_common(1)[0]
     dominant_ratio = dominant_count / total_rows
     if dominant_ratio > MAX_DOMINANT_CONSOLIDATED_ROW_RATIO:
@@ -171,15 +187,45 @@ def semantic_quality_errors(quotes: list[dict], mapping: dict[str, str]) -> list
     return errors
 
 
-def write_outputs(quotes: list[dict], mapping: dict[str, str]) -> tuple[list[str], list[str]]:
+def write_outputs(quotes: Iterable[dict], mapping: dict[str, str]) -> tuple[list[str], list[str]]:
     warnings = []
     errors = []
 
-    original_counts = Counter(row["tag"] for row in quotes)
+    PHASE4_DIR.mkdir(parents=True, exist_ok=True)
+
+    # ── Stream rows into a temporary consolidated-quotes.csv and its sidecar ────
+
+    original_counts = Counter()
+    consolidated_counts = Counter()
+    reverse_mapping = {}
+    unmapped = set()
+    total_rows = 0
+    tmp_path = CONSOLIDATED_QUOTES_PATH.with_name(CONSOLIDATED_QUOTES_PATH.name + ".tmp")
+    table = QuoteTableWriter(CONSOLIDATED_QUOTES_PATH, [*QUOTE_COLUMNS, "consolidated_tag"])
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=[*QUOTE_COLUMNS, "consolidated_tag"])
+        writer.writeheader()
+        for row in quotes:
+            tag = row["tag"]
+            total_rows += 1
+            original_counts[tag] += 1
+            consolidated_tag = mapping.get(tag)
+            if consolidated_tag is None:
+                unmapped.add(tag)
+                continue
+            if unmapped:
+                # The output will be discarded; only the counts still matter.
+                continue
+            consolidated_counts[consolidated_tag] += 1
+            reverse_mapping.setdefault(consolidated_tag, set()).add(tag)
+            out = {**row, "consolidated_tag": consolidated_tag}
+            writer.writerow(out)
+            table.add(out)
+
     original_tags = set(original_counts)
     mapped_tags = set(mapping)
 
-    missing_mappings = sorted(original_tags - mapped_tags)
+    missing_mappings = sorted(unmapped)
     extra_mappings = sorted(mapped_tags - original_tags)
 
     if missing_mappings:
@@ -196,22 +242,9 @@ def write_outputs(quotes: list[dict], mapping: dict[str, str]) -> tuple[list[str
             + ("..." if len(extra_mappings) > 20 else "")
         )
 
-    if errors:
-        return warnings, errors
-
-    PHASE4_DIR.mkdir(parents=True, exist_ok=True)
-
-    consolidated_rows = []
-    consolidated_counts = Counter()
-    reverse_mapping = {}
-    for row in quotes:
-        consolidated_tag = mapping[row["tag"]]
-        consolidated_counts[consolidated_tag] += 1
-        reverse_mapping.setdefault(consolidated_tag, set()).add(row["tag"])
-        consolidated_rows.append({**row, "consolidated_tag": consolidated_tag})
-
-    # Enforce semantic quality first; cardinality checks run only after semantics pass.
-    errors.extend(semantic_quality_errors(quotes, mapping))
+    if not errors:
+        # Enforce semantic quality first; cardinality checks run only after semantics pass.
+        errors.extend(semantic_quality_errors(original_counts, consolidated_counts, mapping))
 
     consolidated_unique = len(consolidated_counts)
     if not errors and (
@@ -225,12 +258,12 @@ def write_outputs(quotes: list[dict], mapping: dict[str, str]) -> tuple[list[str
         )
 
     if errors:
+        tmp_path.unlink()
+        table.discard()
         return warnings, errors
 
-    with open(CONSOLIDATED_QUOTES_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[*QUOTE_COLUMNS, "consolidated_tag"])
-        writer.writeheader()
-        writer.writerows(consolidated_rows)
+    os.replace(tmp_path, CONSOLIDATED_QUOTES_PATH)
+    table.commit()
 
     crosswalk_rows = [
         {
@@ -256,7 +289,7 @@ def write_outputs(quotes: list[dict], mapping: dict[str, str]) -> tuple[list[str
         "",
         "## Summary",
         "",
-        f"- Total quote rows: {len(quotes)}",
+        f"- Total quote rows: {total_rows}",
         f"- Original unique tags: {len(original_tags)}",
         f"- Consolidated unique tags: {consolidated_unique}",
         f"- Semantic quality checks: PASS",
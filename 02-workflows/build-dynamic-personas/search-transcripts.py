@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Search Transcripts
+Looks up a phrase across the whole transcript corpus using the suffix-array
+index from build-corpus-index.py. Matching is case-insensitive, uses the same
+quote/whitespace normalisation as quote validation, and is anchored at word
+starts.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/search-transcripts.py "ecological reasons"
+    python3 02-workflows/build-dynamic-personas/search-transcripts.py "perfect assistant" --participant 28 --json
+
+The transcripts behind the reported hits (and the --participant filter) are
+checked against the manifest and their files; if any changed since
+build-corpus-index.py ran, offsets and line numbers would be wrong, so the
+search fails until the index is rebuilt. --check-stale checks every indexed
+transcript first instead, which also catches transcripts whose new text would
+now match.
+
+Exit codes:
+    0 — one or more occurrences found
+    1 — no occurrences, or index missing or out of date
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.corpus_index import INDEX_DIR, CorpusIndex  # noqa: E402
+from pipeline.manifest import open_manifest  # noqa: E402
+
+MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
+
+
+def fail_if_stale(stale: list[str]) -> None:
+    if not stale:
+        return
+    print(
+        f"FAIL  Corpus index is out of date for {len(stale)} transcript(s): "
+        + ", ".join(stale[:20])
+        + ("..." if len(stale) > 20 else "")
+    )
+    print("      Re-run build-corpus-index.py.")
+    print("\nStatus: FAIL")
+    raise SystemExit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("phrase", help="Phrase to look up")
+    parser.add_argument("--participant", help="Only report hits for this participant_id")
+    parser.add_argument("--limit", type=int, default=None, help="Report at most N hits")
+    parser.add_argument("--json", action="store_true", help="Print hits as JSON")
+    parser.add_argument(
+        "--check-stale",
+        action="store_true",
+        help="Check every indexed transcript for changes, not just the ones hit",
+    )
+    args = parser.parse_args()
+
+    if not (INDEX_DIR / "index.json").exists():
+        print(f"FAIL  Corpus index not found: {INDEX_DIR.relative_to(ROOT)}")
+        print("      Run build-corpus-index.py first.")
+        print("\nStatus: FAIL")
+        raise SystemExit(1)
+
+    try:
+        index = CorpusIndex()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"FAIL  Could not open corpus index: {e}")
+        print("      Re-run build-corpus-index.py.")
+        print("\nStatus: FAIL")
+        raise SystemExit(1)
+    manifest = open_manifest(MANIFEST_PATH) if MANIFEST_PATH.exists() else None
+    if args.check_stale:
+        fail_if_stale(index.stale_transcripts(manifest))
+
+    started = time.perf_counter()
+    hits = index.search(args.phrase)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if args.participant:
+        hits = [h for h in hits if h["participant_id"] == args.participant]
+    if args.limit is not None:
+        hits = hits[: args.limit]
+
+    if not args.check_stale:
+        checked = {h["participant_id"] for h in hits}
+        if args.participant:
+            checked.add(args.participant)
+        fail_if_stale(index.stale_transcripts(manifest, checked))
+
+    if args.json:
+        print(json.dumps(hits, indent=2))
+        raise SystemExit(0 if hits else 1)
+
+    print("\nSearch Transcripts")
+    print("─" * 50)
+    print(f"  Phrase  : {args.phrase}")
+    print(f"  Hits    : {len(hits)}")
+    print(f"  Lookup  : {elapsed_ms:.3f} ms")
+    for h in hits:
+        lines = str(h["line_start"]) if h["line_start"] == h["line_end"] else f"{h['line_start']}-{h['line_end']}"
+        print(f"  [{h['participant_id']}] {h['transcript_id']}  lines {lines}")
+
+    print(f"\nStatus: {'PASS' if hits else 'FAIL'}")
+    raise SystemExit(0 if hits else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,27 +3,72 @@
 Phase 1: Validate Quotes
 Checks that each extracted quote in quotes.csv appears verbatim in its source transcript.
 Handles ellipsis (...) as per valid-quote-rules: each segment must appear in order.
+For failures, reports the closest transcript span (nearest_match), its
+similarity and line range so reviewers do not have to search by hand.
+Matches are looked for in the participant turns of the cited question first;
+question_ref_check records whether the quote sits there. With
+--strict-question, quotes that do not are FAILed.
 
 Usage:
     python3 02-workflows/build-dynamic-personas/validate-quotes.py
+    python3 02-workflows/build-dynamic-personas/validate-quotes.py --workers 8
+    python3 02-workflows/build-dynamic-personas/validate-quotes.py --no-cache
+    python3 02-workflows/build-dynamic-personas/validate-quotes.py --strict-question
+
+Results are cached in p2-validate-quotes/validation-cache.json keyed on
+(transcript content hash, question_ref + normalised quote hash); re-runs only
+re-match new or changed quotes.
 
 Exit codes:
     0 — all quotes PASS
     1 — one or more quotes FAIL
 """
 
+import argparse
 import csv
 import json
-import re
+import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 from pathlib import Path
+from typing import Iterable, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.manifest import Manifest, open_manifest  # noqa: E402
+from pipeline.matching import PatternFinder  # noqa: E402
+from pipeline.nearmiss import NgramIndex, nearest_span  # noqa: E402
+from pipeline.quote_table import read_quotes  # noqa: E402
+from pipeline.segments import Segments, Span, segment_transcript  # noqa: E402
+from pipeline.transcripts import (  # noqa: E402
+    LineIndex,
+    content_hash,
+    norm_text,
+    normalise_transcript,
+    open_store,
+)
 
 # ── Paths ────────────────────────────────────────────────────────────────────────
 
-ROOT = Path(__file__).resolve().parents[2]
 MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
 QUOTES_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quotes.csv"
 REPORT_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p2-validate-quotes" / "quote-validation-report.csv"
+CACHE_PATH = REPORT_PATH.parent / "validation-cache.json"
+
+# Bump when matching rules or cached outcome fields change.
+CACHE_VERSION = 4
+
+# A near miss in the cited question at least this similar is reported
+# without indexing and searching the rest of the transcript.
+NEAR_MISS_ACCEPT = 0.75
+
+# Failures listed on the console; the report always has every row.
+MAX_FAILURES_SHOWN = 50
+# Runs queued per worker process ahead of the report writer.
+IN_FLIGHT_PER_WORKER = 4
 
 REPORT_COLUMNS = [
     "participant_id",
@@ -35,114 +80,452 @@ REPORT_COLUMNS = [
     "quote",
     "transcript_match",
     "transcript_lines",
+    "question_ref_check",
+    "nearest_match",
+    "nearest_similarity",
+    "nearest_lines",
 ]
 
+# (status, reason, transcript_match, transcript_lines, question_ref_check,
+#  nearest_match, nearest_similarity, nearest_lines)
+Outcome = tuple[str, str, str, str, str, str, str, str]
 
-# ── Text normalisation ───────────────────────────────────────────────────────────
 
-def norm_quotes(text: str) -> str:
-    """Normalise Unicode curly quotes/apostrophes to ASCII equivalents."""
-    return (
-        text
-        .replace("\u2018", "'")   # LEFT SINGLE QUOTATION MARK
-        .replace("\u2019", "'")   # RIGHT SINGLE QUOTATION MARK
-        .replace("\u201c", '"')   # LEFT DOUBLE QUOTATION MARK
-        .replace("\u201d", '"')   # RIGHT DOUBLE QUOTATION MARK
-        .replace("\u2032", "'")   # PRIME (sometimes used as apostrophe)
-    )
+# ── Line ranges ──────────────────────────────────────────────────────────────────
+
+def _get_lines(idx: int, length: int, line_index: LineIndex) -> str:
+    """Return the line range (e.g. '12' or '12-14') for a match at [idx, idx+length)."""
+    start = line_index.line_at(idx)
+    end = line_index.line_at(idx + length - 1)
+    return str(start) if start == end else f"{start}-{end}"
 
 
-# ── Transcript loading ───────────────────────────────────────────────────────────
+# ── Quote matching ───────────────────────────────────────────────────────────────
 
-def load_transcript(path: Path) -> tuple[str, list[int]]:
+def split_quote(quote: str) -> tuple[str, list[str] | None]:
     """
-    Read a transcript and return (norm_text, char_to_line).
+    Normalise `quote` and return (norm_quote, segments).
 
-    norm_text      — full text with all whitespace collapsed to single spaces.
-    char_to_line   — parallel list: char_to_line[i] is the 1-based original line
-                     number for position i in norm_text.
+    segments is None for a plain quote, otherwise the non-empty ellipsis
+    segments that must appear in order.
     """
-    lines = path.read_text(encoding="utf-8").splitlines()
-    parts: list[str] = []
-    char_to_line: list[int] = []
-
-    for lineno, line in enumerate(lines, start=1):
-        norm = re.sub(r"\s+", " ", norm_quotes(line)).strip()
-        if not norm:
-            continue
-        if parts:
-            # separator space between parts — map to this (next) line
-            char_to_line.append(lineno)
-        for _ in norm:
-            char_to_line.append(lineno)
-        parts.append(norm)
-
-    norm_text = " ".join(parts)
-    return norm_text, char_to_line
-
-
-def _get_lines(idx: int, length: int, char_to_line: list[int]) -> str:
-    """Return the line range (e.g. '12' or '12-14') for a match at [idx, idx+length)."""
-    start = char_to_line[idx]
-    end = char_to_line[idx + length - 1]
-    return str(start) if start == end else f"{start}-{end}"
+    norm_quote = norm_text(quote)
+    if "..." not in norm_quote:
+        return norm_quote, None
+    return norm_quote, [s.strip() for s in norm_quote.split("...") if s.strip()]
 
 
-# ── Quote matching ───────────────────────────────────────────────────────────────
-
-def match_quote(
+def resolve_quote(
     norm_transcript: str,
-    char_to_line: list[int],
-    quote: str,
-) -> tuple[str, str, str, str]:
+    line_index: LineIndex,
+    norm_quote: str,
+    segments: list[str] | None,
+    finder: PatternFinder,
+    windows: list[tuple[int, int]] | None = None,
+) -> tuple[tuple[str, str, str, str], list[tuple[int, int]]]:
     """
-    Try to find `quote` in `norm_transcript`.
+    Resolve one split quote with `finder` over the lowercased transcript.
 
-    Returns (status, reason, transcript_match, transcript_lines).
+    With `windows` — sorted, non-overlapping (start, end) spans of the
+    transcript — only a match (or ellipsis segment) lying entirely inside one
+    of them counts; segments may fall in different windows.
+
+    Returns ((status, reason, transcript_match, transcript_lines), spans).
       status            — 'PASS' or 'FAIL'
       reason            — empty on PASS; short description on FAIL
       transcript_match  — verbatim text found in the transcript (segments joined
                           with ' ... ' for ellipsis quotes); empty on FAIL
       transcript_lines  — original line number(s) where match was found; empty on FAIL
+      spans             — (start, end) of the match or of each segment; empty on FAIL
     """
-    norm_quote = re.sub(r"\s+", " ", norm_quotes(quote)).strip()
-    trans_lower = norm_transcript.lower()
-
-    if "..." not in norm_quote:
-        # Simple case: exact substring (case-insensitive)
-        q_lower = norm_quote.lower()
-        idx = trans_lower.find(q_lower)
+    if windows is None:
+        windows = [(0, len(norm_transcript))]
+
+    def find(pattern: str, search_from: int) -> int:
+        for lo, hi in windows:
+            if hi > search_from:
+                idx = finder.find(pattern, max(lo, search_from), hi)
+                if idx >= 0:
+                    return idx
+        return -1
+
+    if segments is None:
+        # Simple case: exact substring (case-insensitive), first occurrence
+        idx = find(norm_quote.lower(), 0)
         if idx < 0:
-            return "FAIL", "Quote not found in transcript", "", ""
+            return ("FAIL", "Quote not found in transcript", "", ""), []
         matched = norm_transcript[idx : idx + len(norm_quote)]
-        lines = _get_lines(idx, len(norm_quote), char_to_line)
-        return "PASS", "", matched, lines
+        lines = _get_lines(idx, len(norm_quote), line_index)
+        return ("PASS", "", matched, lines), [(idx, idx + len(norm_quote))]
 
-    # Ellipsis case: split on '...' and verify each segment appears in order
-    segments = [s.strip() for s in norm_quote.split("...") if s.strip()]
+    # Ellipsis case: verify each segment appears in order
     if not segments:
-        return "FAIL", "Quote contains only ellipses", "", ""
+        return ("FAIL", "Quote contains only ellipses", "", ""), []
 
     matched_segs: list[str] = []
     seg_lines: list[str] = []
+    spans: list[tuple[int, int]] = []
     search_from = 0
 
     for seg in segments:
-        seg_lower = seg.lower()
-        idx = trans_lower.find(seg_lower, search_from)
+        idx = find(seg.lower(), search_from)
         if idx < 0:
             short = seg[:60] + ("..." if len(seg) > 60 else "")
-            return "FAIL", f'Segment not found: "{short}"', "", ""
+            return ("FAIL", f'Segment not found: "{short}"', "", ""), []
         matched_segs.append(norm_transcript[idx : idx + len(seg)])
-        seg_lines.append(_get_lines(idx, len(seg), char_to_line))
+        seg_lines.append(_get_lines(idx, len(seg), line_index))
+        spans.append((idx, idx + len(seg)))
         search_from = idx + len(seg)
 
-    return "PASS", "", " ... ".join(matched_segs), ", ".join(seg_lines)
+    return ("PASS", "", " ... ".join(matched_segs), ", ".join(seg_lines)), spans
+
+
+def failed_needle(
+    norm_quote: str,
+    segments: list[str] | None,
+    finder: PatternFinder,
+) -> str | None:
+    """Return the text that failed exact matching: the whole quote, or the first missing ellipsis segment."""
+    if segments is None:
+        return norm_quote
+    search_from = 0
+    for seg in segments:
+        idx = finder.find(seg.lower(), search_from)
+        if idx < 0:
+            return seg
+        search_from = idx + len(seg)
+    return None
+
+
+def diagnose_near_miss(
+    norm_transcript: str,
+    line_index: LineIndex,
+    ngram_indexes: Iterable[NgramIndex],
+    needle: str,
+) -> tuple[str, str, str]:
+    """
+    Return (nearest_match, nearest_similarity, nearest_lines) for a failed
+    needle, or empty strings. `ngram_indexes` are searched in order until one
+    gives a span at least NEAR_MISS_ACCEPT similar; the best span wins.
+    """
+    needle = needle.lower()
+    found = None
+    for ngram_index in ngram_indexes:
+        span = nearest_span(ngram_index, needle)
+        if span is not None and (found is None or span[2] > found[2]):
+            found = span
+        if found is not None and found[2] >= NEAR_MISS_ACCEPT:
+            break
+    if found is None:
+        return "", "", ""
+    span_start, span_end, similarity = found
+    while span_start < span_end and norm_transcript[span_start] == " ":
+        span_start += 1
+    while span_end > span_start and norm_transcript[span_end - 1] == " ":
+        span_end -= 1
+    return (
+        norm_transcript[span_start:span_end],
+        f"{similarity:.3f}",
+        _get_lines(span_start, max(span_end - span_start, 1), line_index),
+    )
+
+
+def match_split_quotes(
+    norm_transcript: str,
+    line_index: LineIndex,
+    split: list[tuple[str, list[str] | None]],
+    lower_transcript: str | None = None,
+    segments: Segments | None = None,
+    question_refs: list[str] | None = None,
+) -> list[Outcome]:
+    """
+    Match every split_quote() result for one transcript.
+
+    Quotes and ellipsis segments are looked up with str.find() over the
+    lowercased transcript (pass `lower_transcript` if it is already
+    available), each distinct pattern's first occurrence found only once (see
+    pipeline/matching.py). Results are in `split` order.
+
+    With `segments` and per-quote `question_refs`, each quote is matched in
+    the participant turns of its cited question first, then in any
+    participant turn, and only then anywhere in the transcript, so PASS/FAIL
+    is unchanged but the reported match prefers participant text of the cited
+    question. The first of those that matches gives question_ref_check: 'ok',
+    the turns' other question(s) (see Segments.check_question_ref), or
+    'moderator_text'.
+
+    Failures then get a near-miss diagnosis: the closest transcript span to the
+    quote (or to its first missing segment), its similarity and line range.
+    The cited question's block is searched first, and the whole transcript
+    only if nothing there is NEAR_MISS_ACCEPT similar; each n-gram index is
+    built on first use, so transcripts without failures build none.
+    """
+    if lower_transcript is None:
+        lower_transcript = norm_transcript.lower()
+    finder = PatternFinder(lower_transcript)
+
+    ngram_indexes: dict[tuple[int, int], NgramIndex] = {}
+
+    def near_miss_indexes(block: Span | None) -> Iterator[NgramIndex]:
+        windows = [(block.start, block.end)] if block is not None else []
+        for window in windows + [(0, len(lower_transcript))]:
+            if window not in ngram_indexes:
+                ngram_indexes[window] = NgramIndex(lower_transcript, *window)
+            yield ngram_indexes[window]
+
+    turn_windows = [(t.start, t.end) for t in segments.turns] if segments is not None else []
+    outcomes: list[Outcome] = []
+    for i, (norm_quote, quote_segments) in enumerate(split):
+        question_ref = question_refs[i] if question_refs is not None else ""
+        block = segments.question(question_ref) if segments is not None else None
+        # (windows, question_ref_check); a check of None is worked out from the spans.
+        tiers: list[tuple[list[tuple[int, int]] | None, str | None]] = [(None, "")]
+        if segments is not None and segments.questions:
+            cited = [(t.start, t.end) for t in segments.question_turns(question_ref)] if block is not None else []
+            tiers = [(cited, "ok"), (turn_windows, None), (None, "moderator_text")]
+        for windows, check in tiers:
+            exact, spans = resolve_quote(norm_transcript, line_index, norm_quote, quote_segments, finder, windows)
+            if exact[0] == "PASS":
+                break
+        if exact[0] == "FAIL":
+            check = ""
+        elif check is None:
+            check = segments.check_question_ref(question_ref, spans)
+        near = ("", "", "")
+        if exact[0] == "FAIL":
+            needle = failed_needle(norm_quote, quote_segments, finder)
+            if needle:
+                near = diagnose_near_miss(norm_transcript, line_index, near_miss_indexes(block), needle)
+        outcomes.append(exact + (check,) + near)
+    return outcomes
+
+
+def match_quotes(
+    norm_transcript: str,
+    line_index: LineIndex,
+    quotes: list[str],
+) -> list[Outcome]:
+    """Match every quote for one transcript. Results are in `quotes` order."""
+    return match_split_quotes(norm_transcript, line_index, [split_quote(q) for q in quotes])
+
+
+def match_quote(
+    norm_transcript: str,
+    line_index: LineIndex,
+    quote: str,
+) -> Outcome:
+    """Try to find a single `quote` in `norm_transcript`. See Outcome for the result tuple."""
+    return match_quotes(norm_transcript, line_index, [quote])[0]
+
+
+# ── Question references ──────────────────────────────────────────────────────────
+
+def question_mismatch_reason(check: str, question_ref: str) -> str:
+    """Failure reason for a question_ref_check other than 'ok' (used by --strict-question)."""
+    if check == "moderator_text":
+        return "Quote matched outside participant turns"
+    if check == "unknown_question":
+        return f"Question {question_ref} not found in transcript"
+    return f"Quote found under {check.split(':', 1)[1]}, not {question_ref}"
+
+
+# ── Validation cache ─────────────────────────────────────────────────────────────
+
+def load_cache() -> dict[str, dict]:
+    """
+    Return {participant_id: entry} from the validation cache, or {} if absent/stale.
+
+    Each entry records the transcript's content hash (plus size/mtime as a fast
+    path) and the outcome for each normalised-quote hash matched against it.
+    """
+    if not CACHE_PATH.exists():
+        return {}
+    try:
+        payload = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return {}
+    return payload.get("participants") or {}
+
+
+def write_cache(participants: dict[str, dict]) -> None:
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_name(CACHE_PATH.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"version": CACHE_VERSION, "participants": participants}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, CACHE_PATH)
+
+
+# ── Participant validation ───────────────────────────────────────────────────────
+
+def validate_participant(
+    pid: str,
+    transcript_path: Path | None,
+    quotes: list[str],
+    question_refs: list[str],
+    cached: dict | None = None,
+) -> tuple[list[Outcome], dict | None, int]:
+    """
+    Validate one participant's quotes. Top-level so it can run in a worker process.
+
+    `question_refs` are the cited questions, parallel to `quotes`.
+    `cached` is this participant's previous cache entry (or None). Quotes whose
+    (transcript hash, question_ref + normalised quote hash) are already in it are reused; the
+    transcript is only loaded and scanned if at least one quote misses. It is
+    read from the transcript store when that holds the same content hash, and
+    normalised from the source file otherwise. Without a cache entry, a store
+    record whose size and mtime still match the source supplies the hash, so
+    the source file is not read at all.
+
+    Returns (outcomes, cache_entry, cache_hits).
+    """
+    if transcript_path is None:
+        outcome = ("FAIL", f"participant_id '{pid}' not in manifest", "", "", "", "", "", "")
+        return [outcome] * len(quotes), None, 0
+
+    stat = transcript_path.stat()
+    raw = None
+    stored = None
+    if cached and cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns:
+        transcript_hash = cached["transcript_hash"]
+    else:
+        # Without a cache hit, an up-to-date store record still saves reading
+        # and hashing the source file.
+        store = open_store()
+        stored = store.get(pid) if store else None
+        if stored is not None and stored.is_current(transcript_path):
+            transcript_hash = stored.source_hash
+        else:
+            raw = transcript_path.read_bytes()
+            transcript_hash = content_hash(raw)
+
+    known = cached["quotes"] if cached and cached.get("transcript_hash") == transcript_hash else {}
+
+    split = [split_quote(q) for q in quotes]
+    # The question_ref check depends on the cited question, so it is part of the key.
+    keys = [
+        content_hash(f"{ref}\0{norm_quote}".encode("utf-8"))
+        for ref, (norm_quote, _) in zip(question_refs, split)
+    ]
+    outcomes: list = [tuple(known[k]) if k in known else None for k in keys]
+    misses = [i for i, outcome in enumerate(outcomes) if outcome is None]
+
+    if misses:
+        if stored is None:
+            store = open_store()
+            stored = store.get(pid) if store else None
+        if stored is not None and stored.source_hash == transcript_hash:
+            norm_t, line_index, lower_t = stored.text, stored.line_index, stored.lower
+            segments = stored.segments
+        else:
+            if raw is None:
+                raw = transcript_path.read_bytes()
+            text = raw.decode("utf-8")
+            norm_t, line_index = normalise_transcript(text)
+            segments = segment_transcript(text)
+            lower_t = None
+        matched = match_split_quotes(
+            norm_t, line_index, [split[i] for i in misses], lower_t,
+            segments, [question_refs[i] for i in misses],
+        )
+        for i, outcome in zip(misses, matched):
+            outcomes[i] = outcome
+
+    entry = {
+        "transcript_hash": transcript_hash,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "quotes": {k: list(outcome) for k, outcome in zip(keys, outcomes)},
+    }
+    return outcomes, entry, len(quotes) - len(misses)
+
+
+# ── Streaming ────────────────────────────────────────────────────────────────────
+
+def participant_runs(rows: Iterable[dict]) -> Iterator[tuple[str, list[dict]]]:
+    """Yield (participant_id, rows) for each run of consecutive rows with the same participant."""
+    for pid, run in groupby(rows, key=lambda row: row["participant_id"]):
+        yield pid, list(run)
+
+
+def validate_runs(
+    runs: Iterable[tuple[str, list[dict]]],
+    manifest: Manifest,
+    cache: dict[str, dict],
+    workers: int,
+) -> Iterator[tuple[str, list[dict], tuple[list[Outcome], dict | None, int]]]:
+    """
+    Validate each run and yield (participant_id, rows, validate_participant result)
+    in input order.
+
+    With workers > 1, runs are submitted to a process pool with at most
+    IN_FLIGHT_PER_WORKER runs per worker outstanding, so reading ahead of the
+    report writer stays bounded.
+    """
+    def args_for(pid: str, rows: list[dict]) -> tuple:
+        ref = manifest.ref(pid)
+        return (
+            pid,
+            ROOT / ref.path if ref else None,
+            [row["quote"] for row in rows],
+            [row["question_ref"] for row in rows],
+            cache.get(pid),
+        )
+
+    if workers <= 1:
+        for pid, rows in runs:
+            yield pid, rows, validate_participant(*args_for(pid, rows))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for pid, rows in runs:
+            pending.append((pid, rows, pool.submit(validate_participant, *args_for(pid, rows))))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                pid, rows, future = pending.popleft()
+                yield pid, rows, future.result()
+        while pending:
+            pid, rows, future = pending.popleft()
+            yield pid, rows, future.result()
+
+
+def merge_cache_entry(new_cache: dict[str, dict], pid: str, entry: dict) -> None:
+    """Add a run's cache entry, combining quotes when a participant appears in several runs."""
+    previous = new_cache.get(pid)
+    if previous is not None and previous["transcript_hash"] == entry["transcript_hash"]:
+        previous["quotes"].update(entry["quotes"])
+    else:
+        new_cache[pid] = entry
 
 
 # ── Main ─────────────────────────────────────────────────────────────────────────
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Validate participants in N worker processes (1 = serial, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the validation cache",
+    )
+    parser.add_argument(
+        "--strict-question",
+        action="store_true",
+        help="FAIL quotes that match outside the participant turns of their cited question_ref",
+    )
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    if workers < 0:
+        parser.error("--workers must be 0 or a positive integer")
+
     # ── Check inputs ─────────────────────────────────────────────────────────────
 
     errors = []
@@ -157,90 +540,101 @@ def main() -> None:
 
     # ── Load manifest ─────────────────────────────────────────────────────────────
 
-    with open(MANIFEST_PATH, encoding="utf-8") as f:
-        manifest = json.load(f)
-
-    pid_to_path: dict[str, Path] = {
-        t["participant_id"]: ROOT / t["path"]
-        for t in manifest["transcripts"]
-    }
-
-    # ── Load quotes ───────────────────────────────────────────────────────────────
-
-    with open(QUOTES_PATH, newline="", encoding="utf-8") as f:
-        quotes = list(csv.DictReader(f))
+    # Paths are looked up per participant run (an index lookup for the jsonl
+    # layout), so the manifest is never parsed in full.
+    manifest = open_manifest(MANIFEST_PATH)
 
     # ── Validate each quote ───────────────────────────────────────────────────────
 
-    transcript_cache: dict[str, tuple[str, list[int]]] = {}
-    results: list[dict] = []
+    # quotes.csv is streamed: consecutive rows for the same participant form one
+    # run, each run's transcript is scanned once for all of its quotes, and result
+    # rows go straight to the report in input order. Memory therefore scales with
+    # the largest run (plus the cache), not with the total number of quotes.
+    cache = {} if args.no_cache else load_cache()
+    new_cache: dict[str, dict] = {}
+    failures: list[dict] = []
+    n_quotes = 0
     n_pass = 0
     n_fail = 0
-
-    for row in quotes:
-        pid = row["participant_id"]
-        base = {
-            "participant_id": pid,
-            "transcript_id": row["transcript_id"],
-            "question_ref": row["question_ref"],
-            "tag": row["tag"],
-            "quote": row["quote"],
-        }
-
-        if pid not in pid_to_path:
-            results.append({
-                **base,
-                "status": "FAIL",
-                "reason": f"participant_id '{pid}' not in manifest",
-                "transcript_match": "",
-                "transcript_lines": "",
-            })
-            n_fail += 1
-            continue
-
-        if pid not in transcript_cache:
-            transcript_cache[pid] = load_transcript(pid_to_path[pid])
-
-        norm_t, c2l = transcript_cache[pid]
-        status, reason, t_match, t_lines = match_quote(norm_t, c2l, row["quote"])
-
-        results.append({
-            **base,
-            "status": status,
-            "reason": reason,
-            "transcript_match": t_match,
-            "transcript_lines": t_lines,
-        })
-        if status == "PASS":
-            n_pass += 1
-        else:
-            n_fail += 1
-
-    # ── Write report ──────────────────────────────────────────────────────────────
+    n_cached = 0
+    n_question_mismatch = 0
 
     REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(REPORT_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+    tmp_report = REPORT_PATH.with_name(REPORT_PATH.name + ".tmp")
+    _, quote_rows = read_quotes(QUOTES_PATH)
+    with open(tmp_report, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=REPORT_COLUMNS)
         writer.writeheader()
-        writer.writerows(results)
+
+        runs = participant_runs(quote_rows)
+        for pid, rows, (outcomes, entry, hits) in validate_runs(runs, manifest, cache, workers):
+            n_cached += hits
+            if entry is not None:
+                merge_cache_entry(new_cache, pid, entry)
+            for row, outcome in zip(rows, outcomes):
+                status, reason, t_match, t_lines, q_check, near_match, near_similarity, near_lines = outcome
+                if status == "PASS" and q_check not in ("", "ok"):
+                    n_question_mismatch += 1
+                    if args.strict_question:
+                        status, reason = "FAIL", question_mismatch_reason(q_check, row["question_ref"])
+                result = {
+                    "participant_id": pid,
+                    "transcript_id": row["transcript_id"],
+                    "question_ref": row["question_ref"],
+                    "tag": row["tag"],
+                    "quote": row["quote"],
+                    "status": status,
+                    "reason": reason,
+                    "transcript_match": t_match,
+                    "transcript_lines": t_lines,
+                    "question_ref_check": q_check,
+                    "nearest_match": near_match,
+                    "nearest_similarity": near_similarity,
+                    "nearest_lines": near_lines,
+                }
+                writer.writerow(result)
+                n_quotes += 1
+                if status == "PASS":
+                    n_pass += 1
+                else:
+                    n_fail += 1
+                    if len(failures) < MAX_FAILURES_SHOWN:
+                        failures.append(result)
+    os.replace(tmp_report, REPORT_PATH)
+
+    if not args.no_cache:
+        write_cache(new_cache)
 
     # ── Print summary ─────────────────────────────────────────────────────────────
 
     print(f"\nPhase 1: Validate Quotes")
     print(f"{'─' * 50}")
-    print(f"  Quotes checked : {len(quotes)}")
+    print(f"  Quotes checked : {n_quotes}")
+    print(f"  Workers        : {workers}")
+    print(f"  Cached results : {'disabled' if args.no_cache else n_cached}")
     print(f"  PASS           : {n_pass}")
     print(f"  FAIL           : {n_fail}")
+    print(
+        f"  Question ref   : {n_question_mismatch} match(es) outside the cited question"
+        f"{' (FAIL under --strict-question)' if args.strict_question else ''}"
+    )
     print(f"  Report         : {REPORT_PATH.relative_to(ROOT)}")
 
     if n_fail:
         print(f"\nFailed quotes:")
-        for r in results:
-            if r["status"] == "FAIL":
-                q_preview = r["quote"][:80] + ("..." if len(r["quote"]) > 80 else "")
-                print(f"  FAIL  [{r['participant_id']}] {r['question_ref']} / {r['tag']}")
-                print(f"        Reason : {r['reason']}")
-                print(f"        Quote  : {q_preview}")
+        for r in failures:
+            q_preview = r["quote"][:80] + ("..." if len(r["quote"]) > 80 else "")
+            print(f"  FAIL  [{r['participant_id']}] {r['question_ref']} / {r['tag']}")
+            print(f"        Reason : {r['reason']}")
+            print(f"        Quote  : {q_preview}")
+            if r["nearest_match"]:
+                n_preview = r["nearest_match"][:80] + ("..." if len(r["nearest_match"]) > 80 else "")
+                print(
+                    f"        Nearest: {n_preview} "
+                    f"(similarity {r['nearest_similarity']}, lines {r['nearest_lines']})"
+                )
+        if n_fail > len(failures):
+            print(f"  ... and {n_fail - len(failures)} more (see report)")
 
     print(f"\nStatus: {'PASS' if not n_fail else 'FAIL'}")
     sys.exit(0 if n_fail == 0 else 1)
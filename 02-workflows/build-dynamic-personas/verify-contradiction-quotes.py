@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Phase 3: Verify Contradiction Quotes
+Checks that every quote_a / quote_b in contradictions.csv is one of that
+participant's quotes that passed Phase 2 validation, and that it carries the
+tag the quote was extracted under.
+
+Quotes are looked up in a per-participant hash index (see
+pipeline/contradictions.py) built once from quote-validation-report.csv (PASS
+rows) and quotes.csv, so each check is one dict probe. Lookups compare the
+normalised, lowercased text with ellipses made uniform, so "A... B" and
+"A … B" match "A ... B". If the validation report is missing, quotes are only
+checked against quotes.csv.
+
+Usage:
+    python3 02-workflows/build-dynamic-personas/verify-contradiction-quotes.py
+
+Writes:
+    04-process/build-dynamic-personas/p3-check-contradictions/contradiction-quote-check.csv
+    (one row per unmatched or mis-tagged contradiction quote)
+
+Exit codes:
+    0 — PASS (or PASS with warnings for tag mismatches)
+    1 — FAIL (missing inputs, or quotes not among the validated quotes)
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+# ── Paths ───────────────────────────────────────────────────────────────────────
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.contradictions import CONTRADICTION_COLUMNS, QuoteIndex  # noqa: E402
+from pipeline.quote_table import read_quote_columns  # noqa: E402
+
+PROCESS_DIR = ROOT / "04-process" / "build-dynamic-personas"
+QUOTES_PATH = PROCESS_DIR / "p1-quote-extraction" / "quotes.csv"
+VALIDATION_REPORT_PATH = PROCESS_DIR / "p2-validate-quotes" / "quote-validation-report.csv"
+CONTRADICTIONS_PATH = PROCESS_DIR / "p3-check-contradictions" / "contradictions.csv"
+CHECK_PATH = PROCESS_DIR / "p3-check-contradictions" / "contradiction-quote-check.csv"
+
+CHECK_COLUMNS = [
+    "participant_id",
+    "transcript_id",
+    "contradiction_type",
+    "side",
+    "tag",
+    "quote",
+    "status",
+    "detail",
+]
+
+MAX_SHOWN = 30
+
+
+def build_index(path: Path, pass_only: bool) -> QuoteIndex:
+    index = QuoteIndex()
+    if pass_only:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [
+                (row["participant_id"], row["tag"], row["quote"])
+                for row in csv.DictReader(f)
+                if row.get("status") == "PASS"
+            ]
+    else:
+        rows = read_quote_columns(path, ["participant_id", "tag", "quote"])
+    for participant_id, tag, quote in rows:
+        index.add(participant_id, quote, tag)
+    return index
+
+
+def main():
+    warnings = []
+    errors = []
+
+    # ── Load inputs ─────────────────────────────────────────────────────────────
+
+    for path, hint in [
+        (CONTRADICTIONS_PATH, "run merge-contradictions.py first"),
+        (QUOTES_PATH, "run merge-quotes.py first"),
+    ]:
+        if not path.exists():
+            print(f"FAIL  Not found: {path.relative_to(ROOT)} — {hint}")
+            print("\nStatus: FAIL")
+            sys.exit(1)
+
+    with open(CONTRADICTIONS_PATH, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if list(reader.fieldnames or []) != CONTRADICTION_COLUMNS:
+            print(
+                f"FAIL  {CONTRADICTIONS_PATH.name} columns were {reader.fieldnames}; "
+                f"expected {CONTRADICTION_COLUMNS}"
+            )
+            print("\nStatus: FAIL")
+            sys.exit(1)
+        contradictions = list(reader)
+
+    extracted = build_index(QUOTES_PATH, pass_only=False)
+    if VALIDATION_REPORT_PATH.exists():
+        validated = build_index(VALIDATION_REPORT_PATH, pass_only=True)
+        validated_source = f"{VALIDATION_REPORT_PATH.name} (PASS rows)"
+    else:
+        warnings.append(
+            f"{VALIDATION_REPORT_PATH.relative_to(ROOT)} not found; quotes checked against quotes.csv only"
+        )
+        validated = extracted
+        validated_source = f"{QUOTES_PATH.name} (validation report missing)"
+
+    # ── Check ───────────────────────────────────────────────────────────────────
+
+    checked = 0
+    findings = []
+    for row in contradictions:
+        pid = row["participant_id"]
+        for side in ("a", "b"):
+            quote = row[f"quote_{side}"]
+            if not quote.strip():
+                continue
+            checked += 1
+            tag = row[f"quote_{side}_tag"]
+            tags = validated.tags(pid, quote)
+            if tags is None:
+                if validated is not extracted and extracted.tags(pid, quote) is not None:
+                    status, detail = "NOT_VALIDATED", "in quotes.csv but did not PASS Phase 2"
+                else:
+                    status, detail = "NOT_FOUND", f"not among participant {pid}'s quotes"
+            elif tag not in tags:
+                status, detail = "TAG_MISMATCH", f"extracted as {', '.join(sorted(tags))}"
+            else:
+                continue
+            findings.append(
+                {
+                    "participant_id": pid,
+                    "transcript_id": row["transcript_id"],
+                    "contradiction_type": row["contradiction_type"],
+                    "side": side,
+                    "tag": tag,
+                    "quote": quote,
+                    "status": status,
+                    "detail": detail,
+                }
+            )
+
+    unmatched = [f for f in findings if f["status"] != "TAG_MISMATCH"]
+    mismatched = [f for f in findings if f["status"] == "TAG_MISMATCH"]
+    if unmatched:
+        errors.append(
+            f"{len(unmatched)} contradiction quote(s) are not validated quotes of their participant"
+        )
+    if mismatched:
+        warnings.append(f"{len(mismatched)} contradiction quote(s) cite a different tag than quotes.csv")
+
+    with open(CHECK_PATH, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CHECK_COLUMNS)
+        writer.writeheader()
+        writer.writerows(findings)
+
+    # ── Report ──────────────────────────────────────────────────────────────────
+
+    print("\nPhase 3: Verify Contradiction Quotes")
+    print(f"{'─' * 50}")
+    print(f"  Contradictions        : {len(contradictions)}")
+    print(f"  Quotes checked        : {checked}")
+    print(f"  Validated quotes      : {len(validated)} from {validated_source}")
+    print(f"  Unmatched             : {len(unmatched)}")
+    print(f"  Tag mismatches        : {len(mismatched)}")
+    for f in findings[:MAX_SHOWN]:
+        print(f"    {f['status']:<13} [{f['participant_id']} quote_{f['side']}] {f['quote'][:60]!r}")
+    if len(findings) > MAX_SHOWN:
+        print(f"    ... {len(findings) - MAX_SHOWN} more")
+    print(f"  Check file            : {CHECK_PATH.relative_to(ROOT)}")
+
+    if warnings:
+        print(f"\nWARNINGS ({len(warnings)}):")
+        for w in warnings:
+            print(f"  WARN  {w}")
+
+    if errors:
+        print(f"\nERRORS ({len(errors)}):")
+        for e in errors:
+            print(f"  FAIL  {e}")
+        print("\nStatus: FAIL")
+        sys.exit(1)
+
+    print(f"\nStatus: {'PASS' if not warnings else 'PASS (with warnings)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,17 @@ Exit codes:
     1 — FAIL (missing participants, unexpected participants, or file not found)
 """
 
-import csv
-import json
 import sys
 from pathlib import Path
 
 # ── Paths ───────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.manifest import open_manifest  # noqa: E402
+from pipeline.quote_table import read_quote_columns  # noqa: E402
+
 MANIFEST_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p0-prepare" / "manifest.json"
 PHASE1_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction"
 QUOTES_PATH = PHASE1_DIR / "quotes.csv"
@@ -36,11 +39,11 @@ def main():
         print(f"\nStatus: FAIL")
         sys.exit(1)
 
-    with open(MANIFEST_PATH, encoding="utf-8") as f:
-        manifest = json.load(f)
+    manifest = open_manifest(MANIFEST_PATH)
 
-    expected_participants = {t["participant_id"] for t in manifest["transcripts"]}
-    expected_transcript_ids = {t["id"] for t in manifest["transcripts"]}
+    refs = list(manifest.refs())
+    expected_participants = {ref.participant_id for ref in refs}
+    expected_transcript_ids = {ref.id for ref in refs}
 
     # ── Check quotes.csv ────────────────────────────────────────────────────────
 
@@ -54,11 +57,9 @@ def main():
 
     found_participants = set()
     found_transcript_ids = set()
-    with open(QUOTES_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            found_participants.add(row["participant_id"])
-            found_transcript_ids.add(row["transcript_id"])
+    for participant_id, transcript_id in read_quote_columns(QUOTES_PATH, ["participant_id", "transcript_id"]):
+        found_participants.add(participant_id)
+        found_transcript_ids.add(transcript_id)
 
     # ── Compare ─────────────────────────────────────────────────────────────────
 
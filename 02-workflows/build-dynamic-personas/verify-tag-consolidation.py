@@ -3,6 +3,10 @@
 Phase 4: Verify Tag Consolidation
 Validates consolidated quote outputs for completeness, integrity, and tag-count bounds.
 
+quotes.csv and consolidated-quotes.csv are read in lockstep, one row of each
+at a time, and only per-tag counters are kept, so memory stays flat however
+many quote rows the study has. The crosswalk is loaded into a dict.
+
 Usage:
     python3 02-workflows/build-dynamic-personas/verify-tag-consolidation.py
 
@@ -14,11 +18,25 @@ Exit codes:
 import csv
 import sys
 from collections import Counter
+from itertools import zip_longest
 from pathlib import Path
+from typing import Iterator
 
 # ── Paths ───────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "02-workflows" / "build-dynamic-personas"))
+
+from pipeline.quote_table import read_quotes  # noqa: E402
+from pipeline.tag_constraints import (  # noqa: E402
+    CATCH_ALL_MARKERS,
+    CONSOLIDATED_COUNT_MAX,
+    CONSOLIDATED_COUNT_MIN,
+    MAX_CATCH_ALL_ROW_RATIO,
+    MAX_DOMINANT_CONSOLIDATED_ROW_RATIO,
+    MAX_UNCHANGED_TAG_RATIO,
+)
+
 QUOTES_PATH = ROOT / "04-process" / "build-dynamic-personas" / "p1-quote-extraction" / "quotes.csv"
 PHASE4_DIR = ROOT / "04-process" / "build-dynamic-personas" / "p4-consolidate-tags"
 CONSOLIDATED_QUOTES_PATH = PHASE4_DIR / "consolidated-quotes.csv"
@@ -39,43 +57,84 @@ QUOTE_COLUMNS = [
 
 CONSOLIDATED_COLUMNS = [*QUOTE_COLUMNS, "consolidated_tag"]
 CROSSWALK_COLUMNS = ["original_tag", "consolidated_tag", "original_count", "notes"]
-CONSOLIDATED_COUNT_MIN = 35
-CONSOLIDATED_COUNT_MAX = 45
-MAX_UNCHANGED_TAG_RATIO = 0.35
-MAX_CATCH_ALL_ROW_RATIO = 0.15
-MAX_DOMINANT_CONSOLIDATED_ROW_RATIO = 0.20
-# Keep this conservative to avoid false positives on legitimate tags.
-CATCH_ALL_MARKERS = ("general", "misc", "miscellaneous", "various", "catch-all")
 
 
-def load_csv(path: Path, expected_columns: list[str]) -> tuple[list[dict], list[str]]:
-    rows = []
-    errors = []
+def open_quotes(path: Path, expected_columns: list[str]) -> tuple[Iterator[dict] | None, list[str]]:
+    """Header-checked row iterator for a quote CSV (or its sidecar); rows are read lazily."""
+    if not path.exists():
+        return None, [f"Missing file: {path.relative_to(ROOT)}"]
+    try:
+        fieldnames, rows = read_quotes(path)
+    except Exception as e:
+        return None, [f"Could not read {path.relative_to(ROOT)}: {e}"]
+    if fieldnames != expected_columns:
+        rows.close()
+        return None, [f"{path.name} columns were {fieldnames}; expected {expected_columns}"]
+
+    def checked() -> Iterator[dict]:
+        try:
+            yield from rows
+        except Exception as e:
+            raise ValueError(f"Could not read {path.relative_to(ROOT)}: {e}") from e
+
+    return checked(), []
+
+
+def load_crosswalk(path: Path) -> tuple[list[dict], list[str]]:
     if not path.exists():
-        errors.append(f"Missing file: {path.relative_to(ROOT)}")
-        return rows, errors
+        return [], [f"Missing file: {path.relative_to(ROOT)}"]
     try:
         with open(path, newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            if list(reader.fieldnames or []) != expected_columns:
-                errors.append(
-                    f"{path.name} columns were {reader.fieldnames}; expected {expected_columns}"
-                )
-                return rows, errors
-            rows = list(reader)
+            fieldnames = list(reader.fieldnames or [])
+            if fieldnames != CROSSWALK_COLUMNS:
+                return [], [f"{path.name} columns were {fieldnames}; expected {CROSSWALK_COLUMNS}"]
+            return list(reader), []
     except Exception as e:
-        errors.append(f"Could not read {path.relative_to(ROOT)}: {e}")
-    return rows, errors
+        return [], [f"Could not read {path.relative_to(ROOT)}: {e}"]
+
+
+def parse_crosswalk(
+    crosswalk_rows: list[dict],
+) -> tuple[dict[str, str], list[tuple[int, str]], list[tuple[int, str, int]]]:
+    """
+    Returns (crosswalk_map, errors, counts): errors are (line, message), and
+    counts are the (line, original_tag, original_count) entries to check once
+    the source tag counts are known.
+    """
+    crosswalk_map = {}
+    errors = []
+    counts = []
+    for idx, row in enumerate(crosswalk_rows, start=2):
+        original = (row["original_tag"] or "").strip()
+        consolidated = (row["consolidated_tag"] or "").strip()
+        count_text = (row["original_count"] or "").strip()
+        if not original:
+            errors.append((idx, f"tag-crosswalk.csv:{idx}: original_tag is empty"))
+            continue
+        if not consolidated:
+            errors.append((idx, f"tag-crosswalk.csv:{idx}: consolidated_tag is empty for '{original}'"))
+            continue
+        try:
+            counts.append((idx, original, int(count_text)))
+        except Exception:
+            errors.append((idx, f"tag-crosswalk.csv:{idx}: original_count '{count_text}' is not an integer"))
+        if original in crosswalk_map and crosswalk_map[original] != consolidated:
+            errors.append(
+                (idx, f"tag-crosswalk.csv:{idx}: conflicting consolidated_tag for '{original}'")
+            )
+        crosswalk_map[original] = consolidated
+    return crosswalk_map, errors, counts
 
 
 def semantic_quality_errors(
-    source_rows: list[dict], crosswalk_map: dict[str, str], consolidated_rows: list[dict]
+    source_tag_counts: Counter, crosswalk_map: dict[str, str], consolidated_counts: Counter, total_rows: int
 ) -> list[str]:
     errors = []
-    if not source_rows:
+    if not source_tag_counts:
         return errors
 
-    source_tags = {row["tag"] for row in source_rows}
+    source_tags = set(source_tag_counts)
     unchanged_count = sum(
         1 for tag in source_tags if crosswalk_map.get(tag, "").strip().lower() == tag.strip().lower()
     )
@@ -86,12 +145,6 @@ def semantic_quality_errors(
             f"above limit {MAX_UNCHANGED_TAG_RATIO:.0%}. Mapping is too pass-through."
         )
 
-    total_rows = len(consolidated_rows)
-    consolidated_counts = Counter(
-        row["consolidated_tag"].strip()
-        for row in consolidated_rows
-        if (row["consolidated_tag"] or "").strip()
-    )
     if consolidated_counts and total_rows:
         dominant_tag, dominant_count = consolidated_counts.most_common(1)[0]
         dominant_ratio = dominant_count / total_rows
@@ -120,51 +173,87 @@ def main():
     errors = []
     warnings = []
 
-    source_rows, source_errors = load_csv(QUOTES_PATH, QUOTE_COLUMNS)
-    consolidated_rows, consolidated_errors = load_csv(CONSOLIDATED_QUOTES_PATH, CONSOLIDATED_COLUMNS)
-    crosswalk_rows, crosswalk_errors = load_csv(CROSSWALK_PATH, CROSSWALK_COLUMNS)
+    source_iter, source_errors = open_quotes(QUOTES_PATH, QUOTE_COLUMNS)
+    consolidated_iter, consolidated_errors = open_quotes(CONSOLIDATED_QUOTES_PATH, CONSOLIDATED_COLUMNS)
+    crosswalk_rows, crosswalk_errors = load_crosswalk(CROSSWALK_PATH)
     errors.extend(source_errors + consolidated_errors + crosswalk_errors)
 
     report_exists = REPORT_PATH.exists()
     if not report_exists:
         warnings.append(f"Missing report file: {REPORT_PATH.relative_to(ROOT)}")
 
+    source_total = 0
+    consolidated_total = 0
+    if errors:
+        # Still report the row count of whichever quote file did open.
+        try:
+            source_total = sum(1 for _ in source_iter or ())
+            consolidated_total = sum(1 for _ in consolidated_iter or ())
+        except ValueError as e:
+            errors.append(str(e))
+    else:
+        crosswalk_map, crosswalk_line_errors, crosswalk_counts = parse_crosswalk(crosswalk_rows)
+
+        # Read both quote files in lockstep, keeping only per-tag counters.
+        source_tag_counts = Counter()
+        consolidated_counts = Counter()
+        row_errors = []
+        try:
+            for idx, (source, consolidated) in enumerate(
+                zip_longest(source_iter, consolidated_iter), start=2
+            ):
+                if source is not None:
+                    source_total += 1
+                    source_tag_counts[source["tag"]] += 1
+                if consolidated is None:
+                    continue
+                consolidated_total += 1
+                consolidated_tag = (consolidated["consolidated_tag"] or "").strip()
+                if consolidated_tag:
+                    consolidated_counts[consolidated_tag] += 1
+                if source is None:
+                    continue
+
+                for col in QUOTE_COLUMNS:
+                    if source[col] != consolidated[col]:
+                        row_errors.append(
+                            f"consolidated-quotes.csv:{idx}: source column '{col}' changed "
+                            f"(expected verbatim copy)"
+                        )
+                        break
+
+                if not consolidated_tag:
+                    row_errors.append(f"consolidated-quotes.csv:{idx}: consolidated_tag is empty")
+                    continue
+
+                expected_consolidated = crosswalk_map.get(source["tag"])
+                if expected_consolidated and consolidated_tag != expected_consolidated:
+                    row_errors.append(
+                        f"consolidated-quotes.csv:{idx}: consolidated_tag '{consolidated_tag}' does not "
+                        f"match crosswalk '{expected_consolidated}' for original tag '{source['tag']}'"
+                    )
+        except ValueError as e:
+            errors.append(str(e))
+
     if not errors:
-        if len(source_rows) != len(consolidated_rows):
+        if source_total != consolidated_total:
             errors.append(
-                f"Row count mismatch: source={len(source_rows)} consolidated={len(consolidated_rows)}"
+                f"Row count mismatch: source={source_total} consolidated={consolidated_total}"
             )
 
-        source_tag_counts = Counter(row["tag"] for row in source_rows)
-        source_tags = set(source_tag_counts)
-
-        crosswalk_map = {}
-        for idx, row in enumerate(crosswalk_rows, start=2):
-            original = (row["original_tag"] or "").strip()
-            consolidated = (row["consolidated_tag"] or "").strip()
-            count_text = (row["original_count"] or "").strip()
-            if not original:
-                errors.append(f"tag-crosswalk.csv:{idx}: original_tag is empty")
-                continue
-            if not consolidated:
-                errors.append(f"tag-crosswalk.csv:{idx}: consolidated_tag is empty for '{original}'")
-                continue
-            try:
-                parsed_count = int(count_text)
-            except Exception:
-                errors.append(f"tag-crosswalk.csv:{idx}: original_count '{count_text}' is not an integer")
-                parsed_count = None
-            if original in crosswalk_map and crosswalk_map[original] != consolidated:
-                errors.append(
-                    f"tag-crosswalk.csv:{idx}: conflicting consolidated_tag for '{original}'"
-                )
-            crosswalk_map[original] = consolidated
-            if parsed_count is not None and source_tag_counts.get(original) != parsed_count:
-                errors.append(
-                    f"tag-crosswalk.csv:{idx}: original_count for '{original}' was {parsed_count}, "
-                    f"expected {source_tag_counts.get(original, 0)}"
+        for idx, original, parsed_count in crosswalk_counts:
+            if source_tag_counts.get(original) != parsed_count:
+                crosswalk_line_errors.append(
+                    (
+                        idx,
+                        f"tag-crosswalk.csv:{idx}: original_count for '{original}' was {parsed_count}, "
+                        f"expected {source_tag_counts.get(original, 0)}",
+                    )
                 )
+        # Stable sort: a line's count error stays after its other errors.
+        errors.extend(message for _, message in sorted(crosswalk_line_errors, key=lambda e: e[0]))
 
+        source_tags = set(source_tag_counts)
         crosswalk_tags = set(crosswalk_map)
         missing_crosswalk = sorted(source_tags - crosswalk_tags)
         extra_crosswalk = sorted(crosswalk_tags - source_tags)
@@ -181,40 +270,15 @@ def main():
                 + ("..." if len(extra_crosswalk) > 20 else "")
             )
 
-        for idx, (source, consolidated) in enumerate(
-            zip(source_rows, consolidated_rows), start=2
-        ):
-            for col in QUOTE_COLUMNS:
-                if source[col] != consolidated[col]:
-                    errors.append(
-                        f"consolidated-quotes.csv:{idx}: source column '{col}' changed "
-                        f"(expected verbatim copy)"
-                    )
-                    break
-
-            consolidated_tag = (consolidated["consolidated_tag"] or "").strip()
-            if not consolidated_tag:
-                errors.append(f"consolidated-quotes.csv:{idx}: consolidated_tag is empty")
-                continue
-
-            expected_consolidated = crosswalk_map.get(source["tag"])
-            if expected_consolidated and consolidated_tag != expected_consolidated:
-                errors.append(
-                    f"consolidated-quotes.csv:{idx}: consolidated_tag '{consolidated_tag}' does not "
-                    f"match crosswalk '{expected_consolidated}' for original tag '{source['tag']}'"
-                )
+        errors.extend(row_errors)
 
-        semantic_errors = semantic_quality_errors(source_rows, crosswalk_map, consolidated_rows)
+        semantic_errors = semantic_quality_errors(
+            source_tag_counts, crosswalk_map, consolidated_counts, consolidated_total
+        )
         errors.extend(semantic_errors)
 
         # Per requirements, cardinality is enforced after semantic quality passes.
-        consolidated_unique = len(
-            {
-                row["consolidated_tag"].strip()
-                for row in consolidated_rows
-                if (row["consolidated_tag"] or "").strip()
-            }
-        )
+        consolidated_unique = len(consolidated_counts)
         if not semantic_errors and (
             consolidated_unique < CONSOLIDATED_COUNT_MIN
             or consolidated_unique > CONSOLIDATED_COUNT_MAX
@@ -231,8 +295,8 @@ def main():
     print(f"  Consolidated quotes  : {CONSOLIDATED_QUOTES_PATH.relative_to(ROOT)}")
     print(f"  Crosswalk            : {CROSSWALK_PATH.relative_to(ROOT)}")
     print(f"  Report               : {REPORT_PATH.relative_to(ROOT)}")
-    print(f"  Source rows          : {len(source_rows)}")
-    print(f"  Consolidated rows    : {len(consolidated_rows)}")
+    print(f"  Source rows          : {source_total}")
+    print(f"  Consolidated rows    : {consolidated_total}")
 
     if warnings:
         print(f"\nWARNINGS ({len(warnings)}):")